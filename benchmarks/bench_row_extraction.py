@@ -0,0 +1,87 @@
+"""
+Micro-benchmark for worksheet row extraction on the shipped benchmark workbooks.
+
+Compares the per-row config property lookups that _get_worksheet_row_attributes used to do
+with the precompiled WorksheetRowExtractor, on the same in-memory rows.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_row_extraction
+"""
+import timeit
+from cis_benchmarks_manager import CISBenchmarksLoadConfig
+from config_management.loaders import JSONConfigLoader
+from workbook_management.loaders import OpenPyXLReadOnlyWorkbookLoader
+from workbook_management.workbook_manager import WorksheetRowExtractor
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+REPEAT = 5
+NUMBER = 20
+
+
+def load_level_rows(workbook_path: str, benchmarks_config: CISBenchmarksLoadConfig):
+    workbook = OpenPyXLReadOnlyWorkbookLoader().load(workbook_path)
+    try:
+        for sheet_name in benchmarks_config.allowed_scope_levels.values():
+            rows = list(workbook[sheet_name].iter_rows(values_only=True))
+            column_indices = {title: index for index, title in enumerate(rows[0])}
+            yield sheet_name, column_indices, rows[1:]
+    finally:
+        workbook.close()
+
+
+def extract_with_config_lookups(rows, column_indices, config):
+    extracted = []
+    for row in rows:
+        recommend_id = row[column_indices[config.recommendation]]
+        title = row[column_indices[config.title]]
+        description = row[column_indices[config.description]]
+        rationale = row[column_indices[config.rationale]]
+        impact = row[column_indices[config.impact]]
+        safeguard_id = row[column_indices[config.safeguard]]
+        assessment_method = row[column_indices[config.assessment_status]]
+        if not assessment_method:
+            recommend_id = row[column_indices[config.section]]
+        extracted.append((recommend_id, title, description, rationale, impact, safeguard_id, assessment_method))
+    return extracted
+
+
+def extract_with_row_extractor(rows, column_indices, config):
+    row_extractor = WorksheetRowExtractor(column_indices, {'recommend_id': config.recommendation,
+                                                           'title': config.title,
+                                                           'description': config.description,
+                                                           'rationale': config.rationale,
+                                                           'impact': config.impact,
+                                                           'safeguard_id': config.safeguard,
+                                                           'assessment_method': config.assessment_status,
+                                                           'section': config.section})
+    extracted = []
+    for row in rows:
+        recommend_id, title, description, rationale, impact, safeguard_id, assessment_method, section = \
+            row_extractor.extract(row)
+        if not assessment_method:
+            recommend_id = section
+        extracted.append((recommend_id, title, description, rationale, impact, safeguard_id, assessment_method))
+    return extracted
+
+
+def measure_rows_per_second(extract, rows, column_indices, config) -> float:
+    best_time = min(timeit.repeat(lambda: extract(rows, column_indices, config), repeat=REPEAT, number=NUMBER))
+    return len(rows) * NUMBER / best_time
+
+
+def main():
+    benchmarks_config = CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=JSONConfigLoader())
+    print(f"{'Workbook sheet':<55} {'Rows':>6} {'Before rows/s':>15} {'After rows/s':>15} {'Speedup':>8}")
+    for os_version, workbook_path in benchmarks_config.workbooks_os_mapping.items():
+        for sheet_name, column_indices, rows in load_level_rows(workbook_path, benchmarks_config):
+            if extract_with_config_lookups(rows, column_indices, benchmarks_config) != \
+                    extract_with_row_extractor(rows, column_indices, benchmarks_config):
+                raise AssertionError(f'Row extraction mismatch for {os_version} "{sheet_name}".')
+            before = measure_rows_per_second(extract_with_config_lookups, rows, column_indices, benchmarks_config)
+            after = measure_rows_per_second(extract_with_row_extractor, rows, column_indices, benchmarks_config)
+            print(f"{f'{os_version} / {sheet_name}':<55} {len(rows):>6} {before:>15,.0f} {after:>15,.0f} "
+                  f"{after / before:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
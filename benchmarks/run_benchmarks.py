@@ -0,0 +1,256 @@
+"""
+Benchmark suite for the load, map, audit and report phases on the shipped workbooks.
+
+Every benchmark is timed with timeit on the same inputs, and the results are written as JSON together with the commit
+and interpreter they were measured on, so runs of two commits can be compared to spot regressions. Audit commands are
+answered by a recorded-output executor, so the audit benchmarks measure the runner and not the commands.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks --output before.json
+    python -m benchmarks.run_benchmarks --output after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, NamedTuple
+from cis_audit_manager import CISAuditLoadCommands, CISAuditLoadConfig, CISAuditRunner
+from cis_benchmarks_manager import CISBenchmarksLoadConfig, CISBenchmarksProcessWorkbook
+from cis_controls_manager import CISControlsLoadConfig, CISControlsProcessWorkbook
+from cis_report_manager import ReportManager
+from cache_management.compiled_cache import InMemoryCompiledCache
+from command_management.command_executors import RecordedOutputCommandExecutor, create_command_output
+from config_management.loaders import JSONConfigLoader
+from workbook_management.loaders import OpenPyXLReadOnlyWorkbookLoader
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+DEFAULT_OS_VERSION = 'MacOS Ventura'
+DEFAULT_REPEAT = 5
+DEFAULT_REGRESSION_THRESHOLD = 1.2
+CONCURRENT_AUDIT_WORKERS = 8
+# Recorded output of the commands judged by a matcher alone: a service listing without any of the audited services.
+MATCHER_ONLY_OUTPUT = '-\t0\tcom.apple.Finder'
+
+
+class Benchmark(NamedTuple):
+    name: str
+    function: Callable[[], object]
+
+
+class BenchmarkInputs:
+    def __init__(self, os_version: str = DEFAULT_OS_VERSION):
+        config_loader = JSONConfigLoader()
+        self.workbook_loader = OpenPyXLReadOnlyWorkbookLoader()
+        self.controls_config = CISControlsLoadConfig(config_path=CONFIG_PATH, config_loader=config_loader)
+        self.benchmarks_config = CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=config_loader)
+        audit_config = CISAuditLoadConfig(config_path=CONFIG_PATH, config_loader=config_loader)
+        if os_version not in self.benchmarks_config.workbooks_os_mapping:
+            raise KeyError(f'No workbook is configured for "{os_version}", configured OS versions: '
+                           f'{tuple(self.benchmarks_config.workbooks_os_mapping)}.')
+        self.os_version = os_version
+        self.workbook_path = self.benchmarks_config.workbooks_os_mapping[os_version]
+        self.commands_loader = CISAuditLoadCommands(commands_path=audit_config.audit_commands_path,
+                                                    commands_loader=config_loader)
+        # The cached construction benchmarks read compiled payloads from memory, so they measure rebuilding the
+        # objects rather than disk access.
+        self.compiled_cache = InMemoryCompiledCache()
+        self.controls_processor = self.create_controls_processor(self.compiled_cache)
+        self.cis_controls = self.controls_processor.get_all_controls()
+        self.domains_weight = self.controls_processor.get_all_control_domains_weight()
+        self.benchmark_processor = self.create_benchmark_processor(self.compiled_cache)
+        self.scope_levels = list(self.benchmarks_config.allowed_scope_levels)
+        self.recommendations = self.benchmark_processor.get_all_levels_recommendations()
+        self.audited_recommendations = [recommendation for recommendation in self.recommendations
+                                        if recommendation.audit_cmd]
+        self.command_executor = RecordedOutputCommandExecutor(
+            {recommendation.audit_cmd.command:
+                create_command_output(stdout=recommendation.audit_cmd.expected_output or MATCHER_ONLY_OUTPUT)
+             for recommendation in self.audited_recommendations})
+        # The report aggregates recommendations that went through an audit, as it does after a real run.
+        list(CISAuditRunner(command_executor=self.command_executor).evaluate_recommendations_compliance(
+            self.audited_recommendations))
+
+    def create_controls_processor(self, compiled_cache=None) -> CISControlsProcessWorkbook:
+        return CISControlsProcessWorkbook(workbook_loader=self.workbook_loader,
+                                          workbook_path=self.controls_config.controls_path,
+                                          controls_config=self.controls_config, compiled_cache=compiled_cache)
+
+    def create_benchmark_processor(self, compiled_cache=None) -> CISBenchmarksProcessWorkbook:
+        return CISBenchmarksProcessWorkbook(workbook_loader=self.workbook_loader, workbook_path=self.workbook_path,
+                                            benchmarks_config=self.benchmarks_config, cis_controls=self.cis_controls,
+                                            commands_loader=self.commands_loader, compiled_cache=compiled_cache)
+
+
+def lookup_recommendations_by_id(inputs: BenchmarkInputs):
+    for scope_level in inputs.scope_levels:
+        for recommendation in inputs.benchmark_processor.get_recommendations_by_level(scope_level=scope_level):
+            inputs.benchmark_processor.get_recommendation_by_id(scope_level=scope_level,
+                                                                recommendation_id=recommendation.recommend_id)
+
+
+def lookup_headers_by_id(inputs: BenchmarkInputs):
+    for scope_level in inputs.scope_levels:
+        for header in inputs.benchmark_processor.get_recommendation_headers_by_level(scope_level=scope_level):
+            inputs.benchmark_processor.get_recommendation_header_by_id(scope_level=scope_level,
+                                                                       header_id=header.recommend_id)
+
+
+def lookup_recommendations_by_level(inputs: BenchmarkInputs):
+    for scope_level in inputs.scope_levels:
+        inputs.benchmark_processor.get_recommendations_by_level(scope_level=scope_level)
+        list(inputs.benchmark_processor.get_recommendations_by_assessment_method(scope_level=scope_level,
+                                                                                 assessment_method='automated'))
+    inputs.benchmark_processor.get_all_levels_recommendations()
+
+
+def run_audit(inputs: BenchmarkInputs, max_workers: int):
+    runner = CISAuditRunner(max_workers=max_workers, command_executor=inputs.command_executor)
+    list(runner.evaluate_recommendations_compliance(inputs.audited_recommendations))
+
+
+def aggregate_report(inputs: BenchmarkInputs):
+    report_manager = ReportManager(inputs.audited_recommendations, inputs.domains_weight)
+    report_manager.get_chart_data()
+    report_manager.aggregator.get_rollup('domain')
+
+
+def create_benchmarks(inputs: BenchmarkInputs) -> List[Benchmark]:
+    return [
+        Benchmark('controls.construction', lambda: inputs.create_controls_processor()),
+        Benchmark('controls.construction_cached', lambda: inputs.create_controls_processor(inputs.compiled_cache)),
+        Benchmark('benchmarks.construction', lambda: inputs.create_benchmark_processor()),
+        Benchmark('benchmarks.construction_cached', lambda: inputs.create_benchmark_processor(inputs.compiled_cache)),
+        Benchmark('benchmarks.lookup_recommendations_by_id', lambda: lookup_recommendations_by_id(inputs)),
+        Benchmark('benchmarks.lookup_headers_by_id', lambda: lookup_headers_by_id(inputs)),
+        Benchmark('benchmarks.lookup_recommendations_by_level', lambda: lookup_recommendations_by_level(inputs)),
+        Benchmark('benchmarks.map_cis_controls', inputs.benchmark_processor._map_recommendations_and_cis_controls),
+        Benchmark('benchmarks.map_audit_commands', inputs.benchmark_processor._map_recommendations_and_audit_commands),
+        Benchmark('audit.runner_sequential', lambda: run_audit(inputs, 1)),
+        Benchmark('audit.runner_concurrent', lambda: run_audit(inputs, CONCURRENT_AUDIT_WORKERS)),
+        Benchmark('report.aggregation', lambda: aggregate_report(inputs)),
+    ]
+
+
+def measure(benchmark: Benchmark, *, repeat: int = DEFAULT_REPEAT, number: int = None) -> Dict:
+    """
+    Times one benchmark with timeit.
+
+    Parameters:
+        benchmark: The benchmark to time.
+        repeat: Number of timed rounds.
+        number: Calls per round, chosen by timeit so that a round takes at least 0.2 seconds when None.
+
+    Returns:
+        The per-call timings of the benchmark in seconds, with the best round as 'min'.
+    """
+    timer = timeit.Timer(benchmark.function)
+    if number is None:
+        number, _ = timer.autorange()
+    timings = [round_time / number for round_time in timer.repeat(repeat=repeat, number=number)]
+    return {'name': benchmark.name, 'number': number, 'repeat': repeat, 'min': min(timings),
+            'median': statistics.median(timings), 'mean': statistics.fmean(timings),
+            'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0}
+
+
+def get_git_commit() -> str | None:
+    try:
+        completed = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return completed.stdout.strip() or None
+
+
+def run_benchmarks(inputs: BenchmarkInputs, *, repeat: int = DEFAULT_REPEAT, number: int = None,
+                   selected: List[str] = None) -> Dict:
+    """
+    Runs the benchmark suite.
+
+    Parameters:
+        inputs: The loaded workbooks and recommendations shared by all benchmarks.
+        repeat: Number of timed rounds of every benchmark.
+        number: Calls per round, chosen per benchmark by timeit when None.
+        selected: Prefixes of the benchmark names to run, all benchmarks when None.
+
+    Returns:
+        The JSON document of the run: its environment and the timings of every benchmark.
+    """
+    benchmarks = [benchmark for benchmark in create_benchmarks(inputs)
+                  if not selected or any(benchmark.name.startswith(prefix) for prefix in selected)]
+    return {'commit': get_git_commit(), 'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': sys.version.split()[0], 'platform': platform.platform(), 'os_version': inputs.os_version,
+            'recommendations': len(inputs.recommendations),
+            'audited_recommendations': len(inputs.audited_recommendations),
+            'benchmarks': [measure(benchmark, repeat=repeat, number=number) for benchmark in benchmarks]}
+
+
+def compare_results(results: Dict, baseline: Dict, *,
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict]:
+    """
+    Compares the best timings of two runs of the suite.
+
+    Parameters:
+        results: The JSON document of the current run.
+        baseline: The JSON document of the run to compare with.
+        threshold: Ratio of the current to the baseline time above which a benchmark counts as a regression.
+
+    Returns:
+        One entry per benchmark of both runs with both times, their ratio and whether it regressed.
+    """
+    baseline_timings = {benchmark['name']: benchmark['min'] for benchmark in baseline['benchmarks']}
+    comparisons = []
+    for benchmark in results['benchmarks']:
+        if benchmark['name'] in baseline_timings:
+            ratio = benchmark['min'] / baseline_timings[benchmark['name']]
+            comparisons.append({'name': benchmark['name'], 'baseline': baseline_timings[benchmark['name']],
+                                'current': benchmark['min'], 'ratio': ratio, 'regressed': ratio > threshold})
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the load, map, audit and report phases on the shipped '
+                                                 'workbooks and write the timings as JSON.')
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='JSON file the results are written to (default: benchmark_results.json).')
+    parser.add_argument('--os-version', default=DEFAULT_OS_VERSION,
+                        help=f'OS version of the benchmark workbook (default: {DEFAULT_OS_VERSION}).')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Timed rounds of every benchmark (default: {DEFAULT_REPEAT}).')
+    parser.add_argument('--number', type=int, default=None,
+                        help='Calls per round (default: enough for a round of at least 0.2 seconds).')
+    parser.add_argument('--select', action='append', default=None, metavar='PREFIX',
+                        help='Run only the benchmarks whose name starts with PREFIX; may be given more than once.')
+    parser.add_argument('--compare', metavar='PATH', help='JSON results of an earlier run to compare with.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help='Slowdown ratio reported as a regression; the exit status is 1 if any benchmark '
+                             f'regressed (default: {DEFAULT_REGRESSION_THRESHOLD}).')
+    args = parser.parse_args()
+
+    results = run_benchmarks(BenchmarkInputs(args.os_version), repeat=args.repeat, number=args.number,
+                             selected=args.select)
+    with open(args.output, 'w', encoding='UTF-8') as output_file:
+        json.dump(results, output_file, indent=2)
+
+    print(f"{'Benchmark':<45} {'Min ms':>10} {'Median ms':>10} {'Calls':>7}")
+    for benchmark in results['benchmarks']:
+        print(f"{benchmark['name']:<45} {benchmark['min'] * 1000:>10.3f} {benchmark['median'] * 1000:>10.3f} "
+              f"{benchmark['number'] * benchmark['repeat']:>7}")
+    print(f"Results written to {args.output}.")
+
+    if args.compare:
+        with open(args.compare, encoding='UTF-8') as baseline_file:
+            comparisons = compare_results(results, json.load(baseline_file), threshold=args.threshold)
+        print(f"\n{'Benchmark':<45} {'Before ms':>10} {'After ms':>10} {'Ratio':>7}")
+        for comparison in comparisons:
+            marker = '  REGRESSION' if comparison['regressed'] else ''
+            print(f"{comparison['name']:<45} {comparison['baseline'] * 1000:>10.3f} "
+                  f"{comparison['current'] * 1000:>10.3f} {comparison['ratio']:>6.2f}x{marker}")
+        if any(comparison['regressed'] for comparison in comparisons):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from typing import Dict
+from cache_management.interfaces import ICompiledCache
+
+CACHE_FORMAT_VERSION = 2
+
+
+class PickleCompiledCache(ICompiledCache):
+    def __init__(self, cache_dir: str):
+        if not isinstance(cache_dir, str) or not cache_dir:
+            raise TypeError(f'cache_dir must be a non-empty string, got {type(cache_dir).__name__}')
+        self._cache_dir = cache_dir
+
+    @staticmethod
+    def _get_source_fingerprint(source_path: str, config_digest: str) -> Dict:
+        source_stat = os.stat(source_path)
+        with open(source_path, 'rb') as source_file:
+            source_digest = hashlib.sha256(source_file.read()).hexdigest()
+        return {'format_version': CACHE_FORMAT_VERSION,
+                'source_path': os.path.abspath(source_path),
+                'mtime_ns': source_stat.st_mtime_ns,
+                'size': source_stat.st_size,
+                'source_digest': source_digest,
+                'config_digest': config_digest}
+
+    def _get_cache_file_path(self, source_path: str) -> str:
+        path_digest = hashlib.sha256(os.path.abspath(source_path).encode('UTF-8')).hexdigest()[:16]
+        file_name = f'{os.path.splitext(os.path.basename(source_path))[0]}-{path_digest}.pickle'
+        return os.path.join(self._cache_dir, file_name)
+
+    def load(self, source_path: str, config_digest: str):
+        cache_file_path = self._get_cache_file_path(source_path)
+        try:
+            with open(cache_file_path, 'rb') as cache_file:
+                compiled = pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError, ImportError):
+            return None
+        if not isinstance(compiled, dict):
+            return None
+        if compiled.get('fingerprint') != self._get_source_fingerprint(source_path, config_digest):
+            return None
+        return compiled.get('payload')
+
+    def store(self, source_path: str, config_digest: str, payload) -> None:
+        compiled = {'fingerprint': self._get_source_fingerprint(source_path, config_digest), 'payload': payload}
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+        except OSError as error:
+            print(f"Error occurred while writing the compiled cache: '{error}'.", file=sys.stderr)
+            return
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                pickle.dump(compiled, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._get_cache_file_path(source_path))
+        except OSError as error:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            print(f"Error occurred while writing the compiled cache: '{error}'.", file=sys.stderr)
+
+    def __repr__(self):
+        return f'PickleCompiledCache(cache_dir="{self._cache_dir}")'
+
+
+class InMemoryCompiledCache(ICompiledCache):
+    # Payloads are kept pickled, so every load returns new objects, as a load from the persistent cache does.
+    # Processors built from the same payload therefore never share the recommendations they map audit commands and
+    # CIS controls onto, and a payload changed after it was stored does not change the cached one.
+    def __init__(self, fallback: ICompiledCache = None):
+        if fallback is not None and not isinstance(fallback, ICompiledCache):
+            raise TypeError(f'Expected object of type {ICompiledCache.__name__}, got {type(fallback).__name__}.')
+        self._fallback = fallback
+        self._payloads = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(source_path: str, config_digest: str):
+        return os.path.abspath(source_path), config_digest
+
+    def load(self, source_path: str, config_digest: str):
+        key = self._get_key(source_path, config_digest)
+        with self._lock:
+            pickled_payload = self._payloads.get(key)
+        if pickled_payload is not None:
+            return pickle.loads(pickled_payload)
+        if self._fallback is None:
+            return None
+        payload = self._fallback.load(source_path, config_digest)
+        if payload is not None:
+            pickled_payload = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._payloads[key] = pickled_payload
+        return payload
+
+    def store(self, source_path: str, config_digest: str, payload) -> None:
+        pickled_payload = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._payloads[self._get_key(source_path, config_digest)] = pickled_payload
+        if self._fallback is not None:
+            self._fallback.store(source_path, config_digest, payload)
+
+    def __repr__(self):
+        return f'InMemoryCompiledCache(fallback={self._fallback}, payloads={len(self._payloads)})'
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from data_models.data_models import AuditResult
+
+
+class ICompiledCache(ABC):
+    @abstractmethod
+    def load(self, source_path: str, config_digest: str):
+        pass
+
+    @abstractmethod
+    def store(self, source_path: str, config_digest: str, payload) -> None:
+        pass
+
+
+class IAuditResultStore(ABC):
+    @abstractmethod
+    def load(self, recommend_id: str, command: str) -> AuditResult | None:
+        pass
+
+    @abstractmethod
+    def store(self, recommend_id: str, command: str, result: AuditResult) -> None:
+        pass
+
+    @abstractmethod
+    def flush(self) -> None:
+        pass
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from typing import Dict
+from cache_management.interfaces import IAuditResultStore
+from data_models.data_models import AuditResult
+
+RESULT_STORE_FORMAT_VERSION = 1
+
+
+class JSONAuditResultStore(IAuditResultStore):
+    def __init__(self, *, store_dir: str, host: str, os_version: str):
+        for name, value in (('store_dir', store_dir), ('host', host), ('os_version', os_version)):
+            if not isinstance(value, str) or not value:
+                raise TypeError(f'{name} must be a non-empty string, got {type(value).__name__}')
+        self._store_dir = store_dir
+        self._host = host
+        self._os_version = os_version
+        self._store_path = os.path.join(store_dir, re.sub(r'[^\w.-]', '_', host) + '.json')
+        self._results = self._load_results()
+        self._dirty = False
+
+    @property
+    def store_path(self) -> str:
+        return self._store_path
+
+    @staticmethod
+    def _get_command_hash(command: str) -> str:
+        return hashlib.sha256(command.strip().encode('UTF-8')).hexdigest()
+
+    def _load_results(self) -> Dict:
+        try:
+            with open(self._store_path, 'r') as store_file:
+                stored = json.load(store_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(stored, dict) or stored.get('format_version') != RESULT_STORE_FORMAT_VERSION:
+            return {}
+        if stored.get('host') != self._host or not isinstance(stored.get('results'), dict):
+            return {}
+        return stored['results']
+
+    def load(self, recommend_id: str, command: str) -> AuditResult | None:
+        stored_result = self._results.get(self._os_version, {}).get(recommend_id)
+        if not stored_result or stored_result.get('command_hash') != self._get_command_hash(command):
+            return None
+        try:
+            return AuditResult(compliant=stored_result['compliant'], audited_at=float(stored_result['audited_at']))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def store(self, recommend_id: str, command: str, result: AuditResult) -> None:
+        os_results = self._results.setdefault(self._os_version, {})
+        os_results[recommend_id] = {'command_hash': self._get_command_hash(command),
+                                    'compliant': result.compliant,
+                                    'audited_at': result.audited_at}
+        self._dirty = True
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        stored = {'format_version': RESULT_STORE_FORMAT_VERSION, 'host': self._host, 'results': self._results}
+        try:
+            os.makedirs(self._store_dir, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self._store_dir, suffix='.tmp')
+        except OSError as error:
+            print(f"Error occurred while writing the audit result store: '{error}'.", file=sys.stderr)
+            return
+        try:
+            with os.fdopen(file_descriptor, 'w') as temp_file:
+                json.dump(stored, temp_file)
+            os.replace(temp_path, self._store_path)
+            self._dirty = False
+        except OSError as error:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            print(f"Error occurred while writing the audit result store: '{error}'.", file=sys.stderr)
+
+    def __repr__(self):
+        return (f'JSONAuditResultStore(store_dir="{self._store_dir}", host="{self._host}", '
+                f'os_version="{self._os_version}")')
@@ -1,12 +1,26 @@
-from typing import List, Dict, Tuple, NamedTuple
-from data_models.data_models import Recommendation
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import List, Dict, Tuple, NamedTuple, Iterable, Generator, Mapping
+import json
+import time
+from data_models.data_models import AuditCmd, AuditCommandCoverage, AuditResult, CommandOutput, Recommendation
 from config_management.interfaces import IConfigLoader
 from exceptions.custom_exceptions import MissingAttributeError
 from utils.validation_utils import validate_and_return_file_path
 from config_management.config_manager import AuditAttrs, OpenCommands, ValidateConfigProperties
+from config_management.config_snapshots import CISAuditConfigSnapshot, get_config_digest
 from enum import Enum
-import subprocess
 from workbook_management.workbook_manager import AuditValidator
+from command_management.interfaces import ICommandExecutor
+from command_management.command_executors import SubprocessCommandExecutor
+from cache_management.interfaces import IAuditResultStore
+from result_management.interfaces import IResultSink
+from matcher_management.interfaces import IOutputMatcher
+from matcher_management.matchers import compile_matcher, get_output_text
+from instrumentation_management.instrumentation import is_enabled, timed
+
+DEFAULT_COMMAND_TIMEOUT = 60
+REQUIRED_AUDIT_CMD_FIELDS = ('recommend_id', 'level', 'title', 'command')
 
 
 class CISAuditConst(Enum):
@@ -31,16 +45,16 @@ class CISAuditLoadConfig(AuditAttrs):
         self._validator = CISAuditPropsValidator()
         super().__init__(config_loader)
 
-    def _load_config(self) -> Dict:
+    def _load_config(self) -> CISAuditConfigSnapshot:
         config = self._config_loader.load(self._config_path).get(self._config_title)
-        if self._validator.validate_property(config, self._config_title, Dict):
-            return config
+        self._validator.validate_property(config, self._config_title, Dict)
+        audit_commands_path = config.get(CISAuditConst.COMMANDS_KEY.value)
+        self._validator.validate_property(audit_commands_path, CISAuditConst.COMMANDS_KEY.value, str)
+        return CISAuditConfigSnapshot(audit_commands_path=audit_commands_path, config_digest=get_config_digest(config))
 
     @property
     def audit_commands_path(self) -> str:
-        audit_commands_path = self._config.get(CISAuditConst.COMMANDS_KEY.value)
-        if self._validator.validate_property(audit_commands_path, CISAuditConst.COMMANDS_KEY.value, str):
-            return audit_commands_path
+        return self._config.audit_commands_path
 
     def __repr__(self):
         return f'CISAuditLoadConfig(config_path="{self._config_path}", config_loader="{self._config_loader}")'
@@ -50,12 +64,65 @@ class CISAuditLoadCommands(OpenCommands):
     def __init__(self, *, commands_path: str, commands_loader: IConfigLoader):
         self._commands_path = validate_and_return_file_path(commands_path, 'json')
         super().__init__(commands_loader)
+        self._audit_command_indexes = MappingProxyType({
+            os_version: self._index_audit_commands(os_version, os_commands)
+            for os_version, os_commands in self._all_commands.items()})
 
     def _load_commands(self) -> Dict:
         all_commands = self._commands_loader.load(self._commands_path)
         if not all_commands:
             raise KeyError('No commands found.')
-        return all_commands
+        return {os_version: [self._compile_command(command) for command in os_commands]
+                for os_version, os_commands in all_commands.items()}
+
+    @staticmethod
+    def _compile_command(command: Dict) -> Dict:
+        # Matchers are compiled once here, so every audit evaluates its output in-process without re-parsing them.
+        if 'matcher' not in command:
+            return command
+        try:
+            matcher = compile_matcher(command['matcher'])
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"Invalid matcher for recommend id '{command.get('recommend_id')}': {error}") from error
+        return {**command, 'matcher': matcher}
+
+    @staticmethod
+    def _create_audit_cmd(command: Dict) -> AuditCmd:
+        if not isinstance(command, dict):
+            raise TypeError(f'Expected an object, got {type(command).__name__}')
+        unknown_fields = command.keys() - AuditCmd._fields
+        if unknown_fields:
+            raise ValueError(f"Unknown fields: '{', '.join(sorted(unknown_fields))}'.")
+        for field in REQUIRED_AUDIT_CMD_FIELDS:
+            if not isinstance(command.get(field), str) or not command[field]:
+                raise ValueError(f"'{field}' must be a non-empty string.")
+        # A matcher judges the output on its own, so the expected output is only required without one.
+        expected_output = command.get('expected_output')
+        if (expected_output is not None or command.get('matcher') is None) and \
+                (not isinstance(expected_output, str) or not expected_output):
+            raise ValueError("'expected_output' must be a non-empty string.")
+        for field in ('timeout', 'ttl'):
+            CISAuditValidator.validate_and_return_timeout(command.get(field), field)
+        return AuditCmd(**command)
+
+    def _index_audit_commands(self, os_version: str, os_commands: List[Dict]) -> Mapping[str, AuditCmd]:
+        # The typed commands are validated and indexed once per OS version and then shared, read-only, by every
+        # benchmark processor of that version.
+        audit_commands = {}
+        for position, command in enumerate(os_commands):
+            try:
+                audit_cmd = self._create_audit_cmd(command)
+            except (TypeError, ValueError) as error:
+                raise ValueError(f"Invalid audit command #{position + 1} of '{os_version}': {error}") from error
+            if audit_cmd.recommend_id in audit_commands:
+                raise ValueError(f"Duplicate audit command for recommend id '{audit_cmd.recommend_id}' of "
+                                 f"'{os_version}'.")
+            audit_commands[audit_cmd.recommend_id] = audit_cmd
+        return MappingProxyType(audit_commands)
+
+    @property
+    def commands_path(self) -> str:
+        return self._commands_path
 
     @property
     def all_audit_commands(self) -> List:
@@ -63,61 +130,289 @@ class CISAuditLoadCommands(OpenCommands):
 
     def get_os_specific_commands(self, os_version: str):
         os_specific_commands = self._all_commands.get(os_version)
-        if not os_specific_commands:
+        if os_specific_commands is None:
             raise ValueError(f'Audit commands for OS version {os_version} not found.')
         return os_specific_commands
 
+    def get_os_audit_commands(self, os_version: str) -> Mapping[str, AuditCmd]:
+        audit_commands = self._audit_command_indexes.get(os_version)
+        if audit_commands is None:
+            raise ValueError(f'Audit commands for OS version {os_version} not found.')
+        return audit_commands
+
+    def get_audit_command_coverage(self, os_version: str, recommend_ids: Iterable[str]) -> AuditCommandCoverage:
+        command_ids = self.get_os_audit_commands(os_version).keys()
+        recommend_ids = set(recommend_ids)
+        return AuditCommandCoverage(unmatched_command_ids=frozenset(command_ids - recommend_ids),
+                                    uncovered_recommend_ids=frozenset(recommend_ids - command_ids))
+
 
 class CISAuditValidator(AuditValidator):
     @staticmethod
-    def validate_and_return_audit_cmd_attrs(audit_cmd: NamedTuple) -> Tuple[str, str | bool]:
+    def validate_and_return_audit_cmd_attrs(audit_cmd: NamedTuple) -> Tuple[str, str | None]:
         if not audit_cmd:
             raise ValueError('Invalid audit command provided.')
         command = audit_cmd.command
         if not command:
             raise ValueError(f"Audit command for recommend id '{audit_cmd.recommend_id}' does not exist.")
         expected_output = audit_cmd.expected_output
-        if not expected_output:
+        if not expected_output and getattr(audit_cmd, 'matcher', None) is None:
             raise ValueError(f"Expected output for recommend id '{audit_cmd.recommend_id}' does not exist.")
         return command, expected_output
 
+    @staticmethod
+    def validate_and_return_timeout(timeout, name: str = 'timeout') -> float | None:
+        if timeout is None:
+            return None
+        if not isinstance(timeout, (int, float)) or isinstance(timeout, bool):
+            raise TypeError(f'{name} must be a number, got {type(timeout).__name__}')
+        if timeout <= 0:
+            raise ValueError(f'{name} must be greater than 0, got {timeout}.')
+        return timeout
+
+
+class CISAuditPlan:
+    def __init__(self, recommendations: Iterable[Recommendation]):
+        self._validator = CISAuditValidator()
+        self._recommendations = []
+        self._commands = {}
+        for recommendation in recommendations:
+            if recommendation.audit_cmd:
+                command = self.get_command(recommendation)
+                self._recommendations.append(recommendation)
+                self._commands.setdefault(command, []).append(recommendation)
+
+    def get_command(self, recommendation: Recommendation) -> str:
+        command, _ = self._validator.validate_and_return_audit_cmd_attrs(recommendation.audit_cmd)
+        return command.strip()
+
+    def get_command_timeout(self, command: str) -> float | None:
+        timeouts = [self._validator.validate_and_return_timeout(getattr(recommendation.audit_cmd, 'timeout', None))
+                    for recommendation in self.get_recommendations_by_command(command)]
+        timeouts = [timeout for timeout in timeouts if timeout is not None]
+        return max(timeouts) if timeouts else None
+
+    @property
+    def recommendations(self) -> List[Recommendation]:
+        return self._recommendations
+
+    @property
+    def commands(self) -> List[str]:
+        return list(self._commands)
+
+    def get_recommendations_by_command(self, command: str) -> List[Recommendation]:
+        if command not in self._commands:
+            raise KeyError(f'Command "{command}" is not part of the audit plan.')
+        return self._commands[command]
+
+    @property
+    def saved_executions(self) -> int:
+        return len(self._recommendations) - len(self._commands)
+
+    def get_executed_commands(self) -> List[str]:
+        # A command is only run when at least one of its recommendations has no reusable stored result.
+        return [command for command, recommendations in self._commands.items()
+                if not all(recommendation.result_reused for recommendation in recommendations)]
+
+    def __repr__(self):
+        return (f'CISAuditPlan(recommendations={len(self._recommendations)}, commands={len(self._commands)}, '
+                f'saved_executions={self.saved_executions})')
+
 
 class CISAuditRunner:
-    def __init__(self):
+    def __init__(self, *, max_workers: int = 1, command_timeout: float = DEFAULT_COMMAND_TIMEOUT,
+                 run_timeout: float = None, command_executor: ICommandExecutor = None,
+                 result_store: IAuditResultStore = None, result_sink: IResultSink = None):
+        if not isinstance(max_workers, int) or isinstance(max_workers, bool):
+            raise TypeError(f'max_workers must be an integer, got {type(max_workers).__name__}')
+        if max_workers < 1:
+            raise ValueError(f'max_workers must be greater than 0, got {max_workers}.')
+        if command_executor is not None and not isinstance(command_executor, ICommandExecutor):
+            raise TypeError(f'Expected object of type {ICommandExecutor.__name__}, '
+                            f'got {type(command_executor).__name__}.')
+        if result_store is not None and not isinstance(result_store, IAuditResultStore):
+            raise TypeError(f'Expected object of type {IAuditResultStore.__name__}, got {type(result_store).__name__}.')
+        if result_sink is not None and not isinstance(result_sink, IResultSink):
+            raise TypeError(f'Expected object of type {IResultSink.__name__}, got {type(result_sink).__name__}.')
         self._validator = CISAuditValidator()
+        self._max_workers = max_workers
+        self._command_timeout = self._validator.validate_and_return_timeout(command_timeout, 'command_timeout')
+        self._run_timeout = self._validator.validate_and_return_timeout(run_timeout, 'run_timeout')
+        self._command_executor = SubprocessCommandExecutor() if command_executor is None else command_executor
+        self._result_store = result_store
+        self._result_sink = result_sink
+        self._last_audit_plan = None
 
-    @staticmethod
-    def _shell_exec(command: str) -> Tuple[List[str], List[str], int]:
-        audit_cmd = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
-        stdout = audit_cmd.stdout.decode('UTF-8').split('\n')
-        stderr = audit_cmd.stderr.decode('UTF-8').split('\n')
-        return_code = audit_cmd.returncode
-        return stdout, stderr, return_code
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def command_timeout(self) -> float | None:
+        return self._command_timeout
+
+    @property
+    def run_timeout(self) -> float | None:
+        return self._run_timeout
+
+    @property
+    def last_audit_plan(self) -> CISAuditPlan | None:
+        return self._last_audit_plan
+
+    @property
+    def command_executor(self) -> ICommandExecutor:
+        return self._command_executor
+
+    @property
+    def result_store(self) -> IAuditResultStore | None:
+        return self._result_store
+
+    @property
+    def result_sink(self) -> IResultSink | None:
+        return self._result_sink
+
+    def _get_command_timeout(self, audit_plan: CISAuditPlan, command: str) -> float | None:
+        command_timeout = audit_plan.get_command_timeout(command)
+        return self._command_timeout if command_timeout is None else command_timeout
+
+    def _execute_command(self, audit_plan: CISAuditPlan, command: str, deadline: float | None) -> CommandOutput:
+        timeout = self._get_command_timeout(audit_plan, command)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return CommandOutput([''], [''], None, True)
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        label = None
+        if is_enabled():
+            label = ','.join(recommendation.recommend_id
+                             for recommendation in audit_plan.get_recommendations_by_command(command))
+        with timed('audit.command', label):
+            return self._command_executor.execute(command, timeout)
 
     def _get_command_attrs(self, audit_cmd: NamedTuple) -> Tuple:
         command, expected_output = self._validator.validate_and_return_audit_cmd_attrs(audit_cmd)
         return command, expected_output
 
-    def run_command(self, audit_cmd: NamedTuple) -> str | bool:
-        command, expected_output = self._get_command_attrs(audit_cmd)
-        stdout, stderr, return_code = self._shell_exec(command)
-        stdout = [output.strip() for output in stdout if output]
-        if return_code != 0 and stderr[0]:
-            return stderr[0]
+    @staticmethod
+    def evaluate_command_output(expected_output: str, command_output: CommandOutput,
+                                matcher: IOutputMatcher = None) -> str | bool:
+        if command_output.timed_out:
+            return 'Audit command timed out.'
+        if command_output.return_code != 0 and command_output.stderr[0]:
+            return command_output.stderr[0]
+        if matcher is not None:
+            # A failed command or one without output proves nothing, even to a matcher that passes on absent text.
+            if command_output.return_code != 0 or not get_output_text(command_output.stdout):
+                return False
+            return matcher.matches(command_output.stdout)
+        stdout = [output.strip() for output in command_output.stdout if output]
         return expected_output in stdout
 
-    def evaluate_recommendations_compliance(self, recommendations: List) -> List[Recommendation]:
-        for recommendation in recommendations:
-            audit_cmd = recommendation.audit_cmd
-            if audit_cmd:
-                audit_result = self.run_command(audit_cmd)
-                recommendation.compliant = audit_result
-                yield recommendation
-
+    @staticmethod
+    def _get_result_key(audit_cmd: NamedTuple, command: str) -> str:
+        # A stored result is only reused while the command and everything judging its output are unchanged.
+        key_parts = [command.strip(), json.dumps(audit_cmd.expected_output)]
+        matcher = getattr(audit_cmd, 'matcher', None)
+        if matcher is not None:
+            key_parts.append(getattr(matcher, 'spec_key', repr(matcher)))
+        return '\n'.join(key_parts)
 
+    def run_command(self, audit_cmd: NamedTuple) -> str | bool:
+        command, expected_output = self._get_command_attrs(audit_cmd)
+        timeout = self._validator.validate_and_return_timeout(getattr(audit_cmd, 'timeout', None))
+        command_output = self._command_executor.execute(command, self._command_timeout if timeout is None else timeout)
+        return self.evaluate_command_output(expected_output, command_output, getattr(audit_cmd, 'matcher', None))
 
+    def _get_reusable_results(self, audit_plan: CISAuditPlan) -> Dict[int, AuditResult]:
+        if self._result_store is None:
+            return {}
+        reusable_results = {}
+        now = time.time()
+        for recommendation in audit_plan.recommendations:
+            ttl = self._validator.validate_and_return_timeout(getattr(recommendation.audit_cmd, 'ttl', None), 'ttl')
+            if ttl is None:
+                continue
+            result = self._result_store.load(recommendation.recommend_id,
+                                             self._get_result_key(recommendation.audit_cmd,
+                                                                  audit_plan.get_command(recommendation)))
+            if result is not None and 0 <= now - result.audited_at < ttl:
+                reusable_results[id(recommendation)] = result
+        return reusable_results
 
+    def _apply_reused_result(self, recommendation: Recommendation, result: AuditResult) -> Recommendation:
+        recommendation.compliant = result.compliant
+        recommendation.timed_out = False
+        recommendation.result_reused = True
+        if self._result_sink is not None:
+            self._result_sink.write(recommendation, None)
+        return recommendation
 
+    def _apply_command_output(self, recommendation: Recommendation, command_output: CommandOutput) -> Recommendation:
+        command, expected_output = self._get_command_attrs(recommendation.audit_cmd)
+        recommendation.compliant = self.evaluate_command_output(expected_output, command_output,
+                                                                getattr(recommendation.audit_cmd, 'matcher', None))
+        recommendation.timed_out = command_output.timed_out
+        recommendation.result_reused = False
+        # Failed and timed out commands are not stored, so their errors are retried instead of replayed.
+        if self._result_store is not None and command_output.return_code == 0:
+            self._result_store.store(recommendation.recommend_id,
+                                     self._get_result_key(recommendation.audit_cmd, command),
+                                     AuditResult(compliant=recommendation.compliant, audited_at=time.time()))
+        if self._result_sink is not None:
+            self._result_sink.write(recommendation, command_output)
+        return recommendation
 
+    def _evaluate_sequentially(self, audit_plan: CISAuditPlan, deadline: float | None,
+                               reusable_results: Dict[int, AuditResult]) -> Generator[Recommendation, None, None]:
+        command_outputs = {}
+        for recommendation in audit_plan.recommendations:
+            if id(recommendation) in reusable_results:
+                yield self._apply_reused_result(recommendation, reusable_results[id(recommendation)])
+                continue
+            command = audit_plan.get_command(recommendation)
+            if command not in command_outputs:
+                command_outputs[command] = self._execute_command(audit_plan, command, deadline)
+            yield self._apply_command_output(recommendation, command_outputs[command])
 
+    def _evaluate_concurrently(self, audit_plan: CISAuditPlan, deadline: float | None,
+                               reusable_results: Dict[int, AuditResult],
+                               completion_order: bool) -> Generator[Recommendation, None, None]:
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            futures = {command: executor.submit(self._execute_command, audit_plan, command, deadline)
+                       for command in audit_plan.commands
+                       if any(id(recommendation) not in reusable_results
+                              for recommendation in audit_plan.get_recommendations_by_command(command))}
+            if completion_order:
+                for recommendation in audit_plan.recommendations:
+                    if id(recommendation) in reusable_results:
+                        yield self._apply_reused_result(recommendation, reusable_results[id(recommendation)])
+                commands_by_future = {future: command for command, future in futures.items()}
+                for future in as_completed(commands_by_future):
+                    for recommendation in audit_plan.get_recommendations_by_command(commands_by_future[future]):
+                        if id(recommendation) not in reusable_results:
+                            yield self._apply_command_output(recommendation, future.result())
+            else:
+                for recommendation in audit_plan.recommendations:
+                    if id(recommendation) in reusable_results:
+                        yield self._apply_reused_result(recommendation, reusable_results[id(recommendation)])
+                    else:
+                        future = futures[audit_plan.get_command(recommendation)]
+                        yield self._apply_command_output(recommendation, future.result())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
+    def evaluate_recommendations_compliance(self, recommendations: Iterable[Recommendation], *,
+                                            completion_order: bool = False) -> Generator[Recommendation, None, None]:
+        audit_plan = CISAuditPlan(recommendations)
+        self._last_audit_plan = audit_plan
+        reusable_results = self._get_reusable_results(audit_plan)
+        deadline = None if self._run_timeout is None else time.monotonic() + self._run_timeout
+        try:
+            if self._max_workers == 1:
+                yield from self._evaluate_sequentially(audit_plan, deadline, reusable_results)
+            else:
+                yield from self._evaluate_concurrently(audit_plan, deadline, reusable_results, completion_order)
+        finally:
+            if self._result_store is not None:
+                self._result_store.flush()
@@ -1,18 +1,22 @@
-import re
-import subprocess
-from collections import namedtuple
+import sys
 from enum import Enum
 from openpyxl import Workbook
 from cis_audit_manager import CISAuditLoadCommands
-from data_models.data_models import Recommendation, RecommendHeader
+from data_models.data_models import AuditCommandCoverage, Recommendation, RecommendHeader
 from config_management.interfaces import IConfigLoader
-from workbook_management.workbook_manager import ExcelOpenWorkbook, ExcelValidator
+from workbook_management.workbook_manager import ExcelOpenWorkbook, ExcelValidator, WorksheetRowExtractor
 from openpyxl.worksheet.worksheet import Worksheet
-from typing import Dict, Tuple, Set, List, Iterator, Generator
+from types import MappingProxyType
+from typing import Dict, Tuple, Set, FrozenSet, List, Iterator, Iterable, Generator, Mapping, Pattern
 from utils.validation_utils import validate_and_return_file_path
 from workbook_management.interfaces import IWorkbookLoader
 from config_management.config_manager import BenchmarksConfigAttrs, ValidateConfigProperties
-from exceptions.custom_exceptions import MissingAttributeError
+from config_management.config_snapshots import CISBenchmarksConfigSnapshot, compile_config_pattern, get_config_digest
+from exceptions.custom_exceptions import MissingAttributeError, HostFactsError
+from host_management.interfaces import IHostFactsProvider
+from host_management.host_facts import SwVersHostFactsProvider
+from cache_management.interfaces import ICompiledCache
+from instrumentation_management.instrumentation import instrumented
 
 
 class CISBenchmarksConst(Enum):
@@ -39,113 +43,131 @@ class CISBenchmarksLoadConfig(BenchmarksConfigAttrs):
         self._validator = CISBenchmarksPropsValidator()
         super().__init__(config_loader)
 
-    def _load_config(self) -> Dict:
+    def _get_validated_property(self, config: Dict, key: str, expected_type: type):
+        attribute = config.get(key)
+        if self._validator.validate_property(attribute, key, expected_type):
+            return attribute
+
+    def _load_config(self) -> CISBenchmarksConfigSnapshot:
         config = self._config_loader.load(self._config_path).get(self._config_title)
-        if self._validator.validate_property(config, self._config_title, Dict):
-            return config
+        self._validator.validate_property(config, self._config_title, Dict)
+        allowed_scope_levels = self._get_validated_property(config, 'ALLOWED_SCOPE_LEVELS', Dict)
+        required_column_titles = self._get_validated_property(config, 'REQUIRED_COLUMN_TITLES', List)
+        os_versions_mapping = self._get_validated_property(config, 'OS_VERSIONS_MAPPING', Dict)
+        benchmark_profiles_rex = self._get_validated_property(config, 'BENCHMARK_PROFILES_REX', str)
+        os_version_rex = self._get_validated_property(config, 'OS_VERSION_REX', str)
+        custom_os_version_rex = self._get_validated_property(config, 'CUSTOM_OS_VERSION_REX', str)
+        return CISBenchmarksConfigSnapshot(
+            allowed_scope_levels=MappingProxyType({int(level): title for level, title in allowed_scope_levels.items()}),
+            allowed_assessment_methods=tuple(self._get_validated_property(config, 'ALLOWED_ASSESSMENT_METHODS', List)),
+            benchmark_profiles_rex=benchmark_profiles_rex,
+            benchmark_profiles_pattern=compile_config_pattern(benchmark_profiles_rex, 'BENCHMARK_PROFILES_REX'),
+            section=self._get_validated_property(config, 'SECTION', str),
+            recommendation=self._get_validated_property(config, 'RECOMMENDATION', str),
+            title=self._get_validated_property(config, 'TITLE', str),
+            assessment_status=self._get_validated_property(config, 'ASSESSMENT_STATUS', str),
+            description=self._get_validated_property(config, 'DESCRIPTION', str),
+            rationale=self._get_validated_property(config, 'RATIONALE', str),
+            impact=self._get_validated_property(config, 'IMPACT', str),
+            safeguard=self._get_validated_property(config, 'SAFEGUARD', str),
+            overview_sheet=self._get_validated_property(config, 'OVERVIEW_SHEET', str),
+            required_columns=frozenset(required_column_titles),
+            workbooks_os_mapping=MappingProxyType(dict(self._get_validated_property(config, 'WORKBOOKS_OS_MAPPING', Dict))),
+            os_version_rex=os_version_rex,
+            os_version_pattern=compile_config_pattern(os_version_rex, 'OS_VERSION_REX'),
+            custom_os_version_rex=custom_os_version_rex,
+            custom_os_version_pattern=compile_config_pattern(custom_os_version_rex, 'CUSTOM_OS_VERSION_REX'),
+            os_versions_mapping=MappingProxyType(dict(os_versions_mapping)),
+            allowed_os_versions=frozenset(os_versions_mapping.values()),
+            config_digest=get_config_digest(config))
+
+    @property
+    def config_path(self) -> str:
+        return self._config_path
 
     @property
-    def allowed_scope_levels(self) -> Dict:
-        attribute = self._config.get('ALLOWED_SCOPE_LEVELS')
-        if self._validator.validate_property(attribute, 'ALLOWED_SCOPE_LEVELS', Dict):
-            scope_levels = {int(level): title for level, title in attribute.items()}
-            return scope_levels
+    def allowed_scope_levels(self) -> Mapping[int, str]:
+        return self._config.allowed_scope_levels
 
     @property
-    def allowed_assessment_methods(self) -> List:
-        allowed_assessment_methods = self._config.get('ALLOWED_ASSESSMENT_METHODS')
-        if self._validator.validate_property(allowed_assessment_methods, 'ALLOWED_ASSESSMENT_METHODS', List):
-            return allowed_assessment_methods
+    def allowed_assessment_methods(self) -> Tuple[str, ...]:
+        return self._config.allowed_assessment_methods
 
     @property
     def benchmark_profiles_rex(self) -> str:
-        benchmark_profiles_rex = self._config.get('BENCHMARK_PROFILES_REX')
-        if self._validator.validate_property(benchmark_profiles_rex, 'BENCHMARK_PROFILES_REX', str):
-            return benchmark_profiles_rex
+        return self._config.benchmark_profiles_rex
+
+    @property
+    def benchmark_profiles_pattern(self) -> Pattern:
+        return self._config.benchmark_profiles_pattern
 
     @property
     def section(self) -> str:
-        section = self._config.get('SECTION')
-        if self._validator.validate_property(section, 'SECTION', str):
-            return section
+        return self._config.section
 
     @property
     def recommendation(self) -> str:
-        recommendation = self._config.get('RECOMMENDATION')
-        if self._validator.validate_property(recommendation, 'RECOMMENDATION', str):
-            return recommendation
+        return self._config.recommendation
 
     @property
     def title(self) -> str:
-        title = self._config.get('TITLE')
-        if self._validator.validate_property(title, 'TITLE', str):
-            return title
+        return self._config.title
 
     @property
     def assessment_status(self) -> str:
-        assessment_status = self._config.get('ASSESSMENT_STATUS')
-        if self._validator.validate_property(assessment_status, 'ASSESSMENT_STATUS', str):
-            return assessment_status
+        return self._config.assessment_status
 
     @property
     def description(self) -> str:
-        description = self._config.get('DESCRIPTION')
-        if self._validator.validate_property(description, 'DESCRIPTION', str):
-            return description
+        return self._config.description
 
     @property
     def rationale(self) -> str:
-        rationale = self._config.get('RATIONALE')
-        if self._validator.validate_property(rationale, 'RATIONALE', str):
-            return rationale
+        return self._config.rationale
 
     @property
     def impact(self) -> str:
-        impact = self._config.get('IMPACT')
-        if self._validator.validate_property(impact, 'IMPACT', str):
-            return impact
+        return self._config.impact
 
     @property
     def safeguard(self) -> str:
-        safeguard = self._config.get('SAFEGUARD')
-        if self._validator.validate_property(safeguard, 'SAFEGUARD', str):
-            return safeguard
+        return self._config.safeguard
 
     @property
     def overview_sheet(self) -> str:
-        overview_sheet = self._config.get('OVERVIEW_SHEET')
-        if self._validator.validate_property(overview_sheet, 'OVERVIEW_SHEET', str):
-            return overview_sheet
+        return self._config.overview_sheet
 
     @property
-    def required_columns(self) -> Set:
-        required_column_titles = set(self._config.get('REQUIRED_COLUMN_TITLES'))
-        if self._validator.validate_property(required_column_titles, 'REQUIRED_COLUMN_TITLES', Set):
-            return required_column_titles
+    def required_columns(self) -> FrozenSet:
+        return self._config.required_columns
 
     @property
-    def workbooks_os_mapping(self) -> Dict:
-        workbooks_os_mapping = self._config.get('WORKBOOKS_OS_MAPPING')
-        if self._validator.validate_property(workbooks_os_mapping, 'WORKBOOKS_OS_MAPPING', Dict):
-            return workbooks_os_mapping
+    def workbooks_os_mapping(self) -> Mapping[str, str]:
+        return self._config.workbooks_os_mapping
 
     @property
     def os_version_rex(self) -> str:
-        os_version_rex = self._config.get('OS_VERSION_REX')
-        if self._validator.validate_property(os_version_rex, 'OS_VERSION_REX', str):
-            return os_version_rex
+        return self._config.os_version_rex
+
+    @property
+    def os_version_pattern(self) -> Pattern:
+        return self._config.os_version_pattern
 
     @property
     def custom_os_version_rex(self) -> str:
-        custom_os_version_rex = self._config.get('CUSTOM_OS_VERSION_REX')
-        if self._validator.validate_property(custom_os_version_rex, 'CUSTOM_OS_VERSION_REX', str):
-            return custom_os_version_rex
+        return self._config.custom_os_version_rex
+
+    @property
+    def custom_os_version_pattern(self) -> Pattern:
+        return self._config.custom_os_version_pattern
+
+    @property
+    def os_versions_mapping(self) -> Mapping[str, str]:
+        return self._config.os_versions_mapping
 
     @property
-    def os_versions_mapping(self) -> Dict:
-        os_versions_mapping = self._config.get('OS_VERSIONS_MAPPING')
-        if self._validator.validate_property(os_versions_mapping, 'OS_VERSIONS_MAPPING', Dict):
-            return os_versions_mapping
+    def allowed_os_versions(self) -> FrozenSet:
+        return self._config.allowed_os_versions
 
     def __repr__(self):
         return f'CISBenchmarksLoadConfig(config_path="{self._config_path}", config_loader="{self._config_loader}")'
@@ -161,8 +183,8 @@ class CISBenchmarksLoadWorkbook(ExcelOpenWorkbook):
 
 
 class CISBenchmarksWorkbookValidator(ExcelValidator):
-    def __init__(self, workbook: Workbook):
-        if not isinstance(workbook, Workbook):
+    def __init__(self, workbook: Workbook = None):
+        if workbook is not None and not isinstance(workbook, Workbook):
             raise TypeError(f'Expected object of type {Workbook.__name__}, got {type(workbook).__name__}.')
         super().__init__(workbook)
 
@@ -176,6 +198,8 @@ class CISBenchmarksWorkbookValidator(ExcelValidator):
         return True
 
     def validate_and_return_sheet_name(self, sheet_name: str) -> str:
+        if self._workbook is None:
+            raise ValueError(f'Cannot validate "{sheet_name}" sheet name without a loaded workbook.')
         sheetnames_list = self._workbook.sheetnames
         if sheet_name not in sheetnames_list:
             raise ValueError(f'"{sheet_name}" is not in the sheet names. Possible sheet names: {sheetnames_list}.')
@@ -211,45 +235,53 @@ class CISBenchmarksWorkbookValidator(ExcelValidator):
 
 
 class CISBenchmarksProcessWorkbook(CISBenchmarksLoadWorkbook):
-    def __init__(self, *, workbook_loader: IWorkbookLoader, workbook_path: str = None, benchmarks_config: CISBenchmarksLoadConfig, cis_controls: List, commands_loader: CISAuditLoadCommands):
+    def __init__(self, *, workbook_loader: IWorkbookLoader, workbook_path: str = None, benchmarks_config: CISBenchmarksLoadConfig, cis_controls: List, commands_loader: CISAuditLoadCommands,
+                 compiled_cache: ICompiledCache = None, host_facts_provider: IHostFactsProvider = None):
         if not isinstance(benchmarks_config, CISBenchmarksLoadConfig):
             raise TypeError(f'Expected object of type {CISBenchmarksLoadConfig.__name__}, got {type(benchmarks_config).__name__}.')
         self._config = benchmarks_config
         if not isinstance(commands_loader, CISAuditLoadCommands):
             raise TypeError(f'Expected object of type {CISAuditLoadCommands.__name__}, got {type(commands_loader).__name__}.')
+        if host_facts_provider is None:
+            host_facts_provider = SwVersHostFactsProvider()
+        if not isinstance(host_facts_provider, IHostFactsProvider):
+            raise TypeError(f'Expected object of type {IHostFactsProvider.__name__}, got {type(host_facts_provider).__name__}.')
+        self._host_facts_provider = host_facts_provider
         if workbook_path is None:
-            workbook_path = self._get_os_version_workbook_path()
-            self._audit_commands = commands_loader.get_os_specific_commands(self._get_current_os_version())
+            self._os_version = self._get_current_os_version()
+            workbook_path = self._get_os_version_workbook_path(self._os_version)
         else:
-            self._audit_commands = commands_loader.get_os_specific_commands(self._get_custom_os_version(workbook_path))
+            self._os_version = self._get_custom_os_version(workbook_path)
+        self._commands_loader = commands_loader
+        self._audit_commands = commands_loader.get_os_audit_commands(self._os_version)
+        self._audit_command_coverage = None
+        if compiled_cache is not None and not isinstance(compiled_cache, ICompiledCache):
+            raise TypeError(f'Expected object of type {ICompiledCache.__name__}, got {type(compiled_cache).__name__}.')
         super().__init__(workbook_loader=workbook_loader, workbook_path=workbook_path)
-        self._validator = CISBenchmarksWorkbookValidator(self._workbook)
+        self._compiled_cache = compiled_cache
+        self._validator = CISBenchmarksWorkbookValidator()
         self._cis_controls = cis_controls
-        self._scope_levels_os_mapping = self._get_scope_levels_os_mapping()
-        self._allowed_scope_levels = set(map(int, self._config.allowed_scope_levels.keys()))
+        self._scope_levels_os_mapping = {}
+        self._allowed_scope_levels = set(self._config.allowed_scope_levels)
         self._recommendations_cache = {}
         self._headers_cache = {}
+        self._recommendations_index = {}
+        self._headers_index = {}
         self._populate_benchmark_cache_and_headers()
         self._map_recommendations_and_audit_commands()
         self._map_recommendations_and_cis_controls()
 
     def _get_current_os_version(self) -> str:
-        os_version_rex = self._config.os_version_rex
+        os_version_pattern = self._config.os_version_pattern
         os_versions_mapping = self._config.os_versions_mapping
-        allowed_os_versions = set(os_versions_mapping.values())
+        allowed_os_versions = self._config.allowed_os_versions
 
         try:
-            os_cmd = subprocess.run('sw_vers', stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
-            stdout = os_cmd.stdout.decode('UTF-8').split('\n')
-            stderr = os_cmd.stderr.decode('UTF-8').split('\n')
-            return_code = os_cmd.returncode
-
-            if return_code != 0:
-                return stderr[0]
+            host_facts = self._host_facts_provider.get_host_facts()
 
-            match = re.findall(os_version_rex, stdout[1])
+            match = os_version_pattern.findall(host_facts.sw_vers_output)
             if not match:
-                raise ValueError(f"OS version regex match failed. Regex pattern: '{os_version_rex}'")
+                raise ValueError(f"OS version regex match failed. Regex pattern: '{os_version_pattern.pattern}'")
 
             rex_os = match[0]
             os_version = os_versions_mapping.get(rex_os)
@@ -262,20 +294,21 @@ class CISBenchmarksProcessWorkbook(CISBenchmarksLoadWorkbook):
 
             return os_version
 
-        except (RuntimeError, ValueError, IndexError, KeyError) as error:
-            print(f"Error occurred: '{error}'.")
+        except (HostFactsError, RuntimeError, ValueError, IndexError, KeyError) as error:
+            print(f"Error occurred: '{error}'.", file=sys.stderr)
 
-    def _get_os_version_workbook_path(self) -> str:
-        os_version = self._get_current_os_version()
+    def _get_os_version_workbook_path(self, os_version: str) -> str:
         workbooks_os_mapping = self._config.workbooks_os_mapping
         os_version_workbook_path = workbooks_os_mapping.get(os_version)
         if not os_version_workbook_path:
-            raise ValueError(f'OS version path for {os_version_workbook_path} does not exist.')
+            raise ValueError(f'OS version path for {os_version} does not exist.')
         return os_version_workbook_path
 
     def _get_custom_os_version(self, workbook_path: str) -> str:
-        custom_os_version_rex = self._config.custom_os_version_rex
-        regex_result = re.search(custom_os_version_rex, workbook_path).group(1)
+        match = self._config.custom_os_version_pattern.search(workbook_path)
+        if not match:
+            raise ValueError(f"OS version cannot be found in workbook path '{workbook_path}'.")
+        regex_result = match.group(1)
         custom_os_version = self._config.os_versions_mapping.get(regex_result)
         if not custom_os_version:
             raise ValueError('OS version cannot be found.')
@@ -290,17 +323,21 @@ class CISBenchmarksProcessWorkbook(CISBenchmarksLoadWorkbook):
 
     def _get_scope_levels_os_mapping(self) -> Dict:
         overview_worksheet = self._get_overview_worksheet()
-        regex_pattern = self._config.benchmark_profiles_rex
+        profiles_pattern = self._config.benchmark_profiles_pattern
         scope_levels_os_mapping = {}
         for row in overview_worksheet.iter_rows(values_only=True):
             for cell in row:
-                match = re.search(regex_pattern, str(cell))
+                if cell is None:
+                    continue
+                match = profiles_pattern.search(str(cell))
                 if match:
                     try:
                         os_system, level = match.groups()
                         scope_levels_os_mapping[int(level)] = os_system
                     except (IndexError, ValueError) as e:
                         raise ValueError(f'Invalid data format in cell: {cell}. Error: {e}')
+                    if self._allowed_scope_levels.issubset(scope_levels_os_mapping):
+                        return scope_levels_os_mapping
         return scope_levels_os_mapping
 
     def _get_worksheet_scope_headers(self, scope_level: int) -> Tuple[Worksheet, Dict[str, int]]:
@@ -312,22 +349,28 @@ class CISBenchmarksProcessWorkbook(CISBenchmarksLoadWorkbook):
         column_indices = {title: index for index, title in enumerate(header_row)}
         return worksheet, column_indices
 
+    def _get_worksheet_row_extractor(self, column_indices: Dict[str, int]) -> WorksheetRowExtractor:
+        return WorksheetRowExtractor(column_indices, {'recommend_id': self._config.recommendation,
+                                                      'title': self._config.title,
+                                                      'description': self._config.description,
+                                                      'rationale': self._config.rationale,
+                                                      'impact': self._config.impact,
+                                                      'safeguard_id': self._config.safeguard,
+                                                      'assessment_method': self._config.assessment_status,
+                                                      'section': self._config.section})
+
     def _get_worksheet_row_attributes(self, worksheet: Worksheet, column_indices: Dict[str, int]) -> Iterator[
         Tuple[str, str, str, bool]]:
         if self._validator.validate_column_titles(column_indices, self._config.required_columns):
+            row_extractor = self._get_worksheet_row_extractor(column_indices)
             for row in worksheet.iter_rows(min_row=2, values_only=True):
-                recommend_id = row[column_indices[self._config.recommendation]]
-                title = row[column_indices[self._config.title]]
-                description = row[column_indices[self._config.description]]
-                rationale = row[column_indices[self._config.rationale]]
-                impact = row[column_indices[self._config.impact]]
-                safeguard_id = row[column_indices[self._config.safeguard]]
-                assessment_method = row[column_indices[self._config.assessment_status]]
+                recommend_id, title, description, rationale, impact, safeguard_id, assessment_method, section = \
+                    row_extractor.extract(row)
                 is_header = False
 
                 if not assessment_method:
                     is_header = True
-                    recommend_id = row[column_indices[self._config.section]]
+                    recommend_id = section
 
                 yield recommend_id, title, description, rationale, impact, safeguard_id, assessment_method, is_header
 
@@ -344,7 +387,25 @@ class CISBenchmarksProcessWorkbook(CISBenchmarksLoadWorkbook):
             cache_mapping[profile], headers_mapping[profile] = [], []
         return cache_mapping, headers_mapping
 
-    def _populate_benchmark_cache_and_headers(self):
+    def _load_compiled_benchmark(self) -> bool:
+        if self._compiled_cache is None:
+            return False
+        compiled_benchmark = self._compiled_cache.load(self._workbook_path, self._config.config_digest)
+        if not compiled_benchmark:
+            return False
+        self._scope_levels_os_mapping, self._recommendations_cache, self._headers_cache = compiled_benchmark
+        return True
+
+    def _store_compiled_benchmark(self):
+        if self._compiled_cache is not None:
+            # The recommendations are mapped to audit commands and CIS controls only after they are stored, and the
+            # compiled caches serialise the payload when it is stored, so it holds the parsed workbook alone.
+            compiled_benchmark = (self._scope_levels_os_mapping, self._recommendations_cache, self._headers_cache)
+            self._compiled_cache.store(self._workbook_path, self._config.config_digest, compiled_benchmark)
+
+    def _parse_benchmark_workbook(self):
+        self._validator = CISBenchmarksWorkbookValidator(self._workbook)
+        self._scope_levels_os_mapping = self._get_scope_levels_os_mapping()
         self._recommendations_cache, self._headers_cache = self._initialize_cache_and_headers_keys()
         all_scopes_attributes = self._get_worksheet_all_scopes_row_attributes()
         for level, profile, worksheet_row_attrs in all_scopes_attributes:
@@ -359,49 +420,84 @@ class CISBenchmarksProcessWorkbook(CISBenchmarksLoadWorkbook):
                                                     impact=impact, safeguard_id=safeguard_id,
                                                     assessment_method=assessment_method)
                     self._recommendations_cache[profile].append(recommendation)
+        self._validator = CISBenchmarksWorkbookValidator()
+        self._release_workbook()
+        self._store_compiled_benchmark()
+
+    @staticmethod
+    def _build_items_index(cache: Dict[str, List]) -> Dict[Tuple[str, str], Recommendation | RecommendHeader]:
+        items_index = {}
+        for scope_profile, scope_items in cache.items():
+            for item in scope_items:
+                items_index.setdefault((scope_profile, item.recommend_id), item)
+        return items_index
+
+    @instrumented('benchmarks.populate')
+    def _populate_benchmark_cache_and_headers(self):
+        if not self._load_compiled_benchmark():
+            self._parse_benchmark_workbook()
+        self._recommendations_index = self._build_items_index(self._recommendations_cache)
+        self._headers_index = self._build_items_index(self._headers_cache)
 
-    def _get_item_by_id(self, item_id: str, cache: Dict, scope_profile: str) -> Recommendation | RecommendHeader:
+    def _get_item_by_id(self, item_id: str, cache: Dict, index: Dict, scope_profile: str) -> Recommendation | RecommendHeader:
         item_id = self._validator.validate_and_return_item_id(item_id)
-        scope_items = cache.get(scope_profile)
 
-        if scope_items is None:
+        if scope_profile not in cache:
             raise KeyError(f'Scope items for level "{scope_profile}" cannot be found.')
 
-        for item in scope_items:
-            if item_id == item.recommend_id:
-                return item
-        raise KeyError(f'Item with ID "{item_id}" is not in level "{scope_profile}".')
+        item = index.get((scope_profile, item_id))
+        if item is None:
+            raise KeyError(f'Item with ID "{item_id}" is not in level "{scope_profile}".')
+        return item
 
+    @instrumented('benchmarks.map_audit_commands')
     def _map_recommendations_and_audit_commands(self):
-        AuditCmd = namedtuple('AuditCmd', ['recommend_id', 'level', 'title', 'command', 'expected_output'])
         audit_commands = self._audit_commands
-        commands_map = {cmd['recommend_id']: AuditCmd(**cmd) for cmd in audit_commands}
+        recommend_ids = set()
         for level in self._allowed_scope_levels:
             recommendations = self.get_recommendations_by_level(scope_level=level)
             for recommendation in recommendations:
-                if recommendation.recommend_id in commands_map:
-                    recommendation.audit_cmd = commands_map[recommendation.recommend_id]
+                recommend_ids.add(recommendation.recommend_id)
+                # Assigned even when missing, so a command removed from the audit commands file is not kept.
+                recommendation.audit_cmd = audit_commands.get(recommendation.recommend_id)
+        self._audit_command_coverage = self._commands_loader.get_audit_command_coverage(self._os_version,
+                                                                                        recommend_ids)
 
+    @instrumented('benchmarks.map_cis_controls')
     def _map_recommendations_and_cis_controls(self):
         all_cis_controls = {control.safeguard_id: control for control in self._cis_controls}
         for level in self._allowed_scope_levels:
             recommendations = self.get_recommendations_by_level(scope_level=level)
             for recommendation in recommendations:
-                control = all_cis_controls.get(recommendation.safeguard_id)
-                if control:
-                    recommendation.cis_control = control
+                recommendation.cis_control = all_cis_controls.get(recommendation.safeguard_id)
+
+    @property
+    def os_version(self) -> str:
+        return self._os_version
+
+    @property
+    def audit_command_coverage(self) -> AuditCommandCoverage:
+        return self._audit_command_coverage
 
     def get_recommendation_by_id(self, *, scope_level: int = 1, recommendation_id: str) -> Recommendation:
         scope_profile = self._validator.validate_and_return_benchmark_scope_profile(scope_level,
                                                                                     self._scope_levels_os_mapping,
                                                                                     self._allowed_scope_levels)
-        return self._get_item_by_id(recommendation_id, self._recommendations_cache, scope_profile)
+        return self._get_item_by_id(recommendation_id, self._recommendations_cache, self._recommendations_index,
+                                    scope_profile)
+
+    def get_recommendations_by_ids(self, *, scope_level: int = 1, recommendation_ids: Iterable[str]) -> List[Recommendation]:
+        scope_profile = self._validator.validate_and_return_benchmark_scope_profile(scope_level,
+                                                                                    self._scope_levels_os_mapping,
+                                                                                    self._allowed_scope_levels)
+        return [self._get_item_by_id(recommendation_id, self._recommendations_cache, self._recommendations_index,
+                                     scope_profile) for recommendation_id in recommendation_ids]
 
     def get_recommendation_header_by_id(self, *, scope_level: int = 1, header_id: str) -> RecommendHeader:
         scope_profile = self._validator.validate_and_return_benchmark_scope_profile(scope_level,
                                                                                     self._scope_levels_os_mapping,
                                                                                     self._allowed_scope_levels)
-        return self._get_item_by_id(header_id, self._headers_cache, scope_profile)
+        return self._get_item_by_id(header_id, self._headers_cache, self._headers_index, scope_profile)
 
     def get_all_levels_recommendations(self) -> List[Recommendation]:
         all_levels_recommendations = []
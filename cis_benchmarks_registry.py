@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple
+from cis_audit_manager import CISAuditLoadCommands, CISAuditLoadConfig
+from cis_benchmarks_manager import CISBenchmarksLoadConfig, CISBenchmarksProcessWorkbook
+from cache_management.compiled_cache import InMemoryCompiledCache
+from cache_management.interfaces import ICompiledCache
+from cis_controls_manager import CISControlsLoadConfig, CISControlsProcessWorkbook
+from config_management.loaders import JSONConfigLoader
+from data_models.data_models import CISControl, Recommendation, RecommendHeader
+from workbook_management.interfaces import IWorkbookLoader
+from workbook_management.loaders import OpenPyXLReadOnlyWorkbookLoader
+
+
+def _parse_benchmark_payload(config_path: str, commands_path: str, workbook_loader: IWorkbookLoader,
+                             workbook_path: str) -> Tuple[str, object]:
+    # Runs in a worker process. Parsed workbooks and processors cannot be pickled, so the worker returns the
+    # compiled benchmark payload the processor would store in its compiled cache.
+    config_loader = JSONConfigLoader()
+    benchmarks_config = CISBenchmarksLoadConfig(config_path=config_path, config_loader=config_loader)
+    commands_loader = CISAuditLoadCommands(commands_path=commands_path, commands_loader=config_loader)
+    captured_payloads = InMemoryCompiledCache()
+    CISBenchmarksProcessWorkbook(workbook_loader=workbook_loader, workbook_path=workbook_path,
+                                 benchmarks_config=benchmarks_config, cis_controls=[], commands_loader=commands_loader,
+                                 compiled_cache=captured_payloads)
+    return workbook_path, captured_payloads.load(workbook_path, benchmarks_config.config_digest)
+
+
+class BenchmarkRegistry:
+    def __init__(self, *, workbook_loader: IWorkbookLoader, benchmarks_config: CISBenchmarksLoadConfig,
+                 cis_controls: List[CISControl], commands_loader: CISAuditLoadCommands,
+                 compiled_cache: ICompiledCache = None, max_workers: int = None):
+        if not isinstance(benchmarks_config, CISBenchmarksLoadConfig):
+            raise TypeError(f'Expected object of type {CISBenchmarksLoadConfig.__name__}, got {type(benchmarks_config).__name__}.')
+        if not isinstance(commands_loader, CISAuditLoadCommands):
+            raise TypeError(f'Expected object of type {CISAuditLoadCommands.__name__}, got {type(commands_loader).__name__}.')
+        if max_workers is not None and (not isinstance(max_workers, int) or max_workers < 1):
+            raise ValueError(f'max_workers must be a positive integer, got {max_workers}.')
+        self._workbook_loader = workbook_loader
+        self._config = benchmarks_config
+        self._cis_controls = cis_controls
+        self._commands_loader = commands_loader
+        self._max_workers = max_workers
+        self._compiled_benchmarks = InMemoryCompiledCache(fallback=compiled_cache)
+        self._benchmarks = {}
+        self._load_benchmarks()
+
+    def _parse_pending_workbooks(self, pending_workbook_paths: List[str]):
+        parse_arguments = (self._config.config_path, self._commands_loader.commands_path, self._workbook_loader)
+        if len(pending_workbook_paths) == 1 or self._max_workers == 1:
+            payloads = [_parse_benchmark_payload(*parse_arguments, workbook_path)
+                        for workbook_path in pending_workbook_paths]
+        else:
+            max_workers = min(len(pending_workbook_paths), self._max_workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_parse_benchmark_payload, *parse_arguments, workbook_path)
+                           for workbook_path in pending_workbook_paths]
+                payloads = [future.result() for future in futures]
+        for workbook_path, payload in payloads:
+            self._compiled_benchmarks.store(workbook_path, self._config.config_digest, payload)
+
+    def _load_benchmarks(self):
+        workbooks_os_mapping = self._config.workbooks_os_mapping
+        pending_workbook_paths = [workbook_path for workbook_path in workbooks_os_mapping.values()
+                                  if self._compiled_benchmarks.load(workbook_path, self._config.config_digest) is None]
+        if pending_workbook_paths:
+            self._parse_pending_workbooks(pending_workbook_paths)
+        for os_version, workbook_path in workbooks_os_mapping.items():
+            self._benchmarks[os_version] = CISBenchmarksProcessWorkbook(
+                workbook_loader=self._workbook_loader, workbook_path=workbook_path, benchmarks_config=self._config,
+                cis_controls=self._cis_controls, commands_loader=self._commands_loader,
+                compiled_cache=self._compiled_benchmarks)
+
+    @property
+    def os_versions(self) -> List[str]:
+        return list(self._benchmarks)
+
+    @property
+    def cis_controls(self) -> List[CISControl]:
+        return self._cis_controls
+
+    def get_benchmark(self, os_version: str) -> CISBenchmarksProcessWorkbook:
+        if os_version not in self._benchmarks:
+            raise KeyError(f'Benchmark for OS version "{os_version}" is not registered. '
+                           f'Registered OS versions: {", ".join(self._benchmarks)}')
+        return self._benchmarks[os_version]
+
+    def get_recommendations_by_level(self, os_version: str, *, scope_level: int = 1) -> List[Recommendation]:
+        return self.get_benchmark(os_version).get_recommendations_by_level(scope_level=scope_level)
+
+    def get_recommendation_headers_by_level(self, os_version: str, *, scope_level: int = 1) -> List[RecommendHeader]:
+        return self.get_benchmark(os_version).get_recommendation_headers_by_level(scope_level=scope_level)
+
+    def get_recommendation_by_id(self, os_version: str, *, scope_level: int = 1,
+                                 recommendation_id: str) -> Recommendation:
+        return self.get_benchmark(os_version).get_recommendation_by_id(scope_level=scope_level,
+                                                                       recommendation_id=recommendation_id)
+
+    def get_recommendations_by_ids(self, os_version: str, *, scope_level: int = 1,
+                                   recommendation_ids: Iterable[str]) -> List[Recommendation]:
+        return self.get_benchmark(os_version).get_recommendations_by_ids(scope_level=scope_level,
+                                                                         recommendation_ids=recommendation_ids)
+
+    def get_all_levels_recommendations(self, os_version: str) -> List[Recommendation]:
+        return self.get_benchmark(os_version).get_all_levels_recommendations()
+
+    def get_all_benchmarks(self) -> Dict[str, CISBenchmarksProcessWorkbook]:
+        return dict(self._benchmarks)
+
+    def __repr__(self):
+        return f'BenchmarkRegistry(os_versions={self.os_versions}, max_workers={self._max_workers})'
+
+
+def create_benchmark_registry_factory(config_path: str, *, compiled_cache: ICompiledCache = None,
+                                      max_workers: int = None) -> Callable[[], BenchmarkRegistry]:
+    openpyxl_workbook_loader = OpenPyXLReadOnlyWorkbookLoader()
+
+    # Configs and audit commands are read again on every reload, the workbooks only when they or the config changed.
+    def load_benchmark_registry() -> BenchmarkRegistry:
+        json_config_loader = JSONConfigLoader()
+        cis_audit_config = CISAuditLoadConfig(config_path=config_path, config_loader=json_config_loader)
+        cis_controls_config = CISControlsLoadConfig(config_path=config_path, config_loader=json_config_loader)
+        cis_benchmarks_config = CISBenchmarksLoadConfig(config_path=config_path, config_loader=json_config_loader)
+        cis_controls_processor = CISControlsProcessWorkbook(workbook_loader=openpyxl_workbook_loader,
+                                                            workbook_path=cis_controls_config.controls_path,
+                                                            controls_config=cis_controls_config,
+                                                            compiled_cache=compiled_cache)
+        audit_commands_loader = CISAuditLoadCommands(commands_path=cis_audit_config.audit_commands_path,
+                                                     commands_loader=json_config_loader)
+        return BenchmarkRegistry(workbook_loader=openpyxl_workbook_loader, benchmarks_config=cis_benchmarks_config,
+                                 cis_controls=cis_controls_processor.get_all_controls(),
+                                 commands_loader=audit_commands_loader, compiled_cache=compiled_cache,
+                                 max_workers=max_workers)
+
+    return load_benchmark_registry
@@ -2,14 +2,17 @@ from typing import Tuple, Dict, NamedTuple, List
 from openpyxl.worksheet.worksheet import Worksheet
 from workbook_management.workbook_manager import ExcelOpenWorkbook
 from config_management.config_manager import ControlsConfigAttrs
+from config_management.config_snapshots import CISControlsConfigSnapshot, get_config_digest
 from data_models.data_models import CISControl, CISControlFamily
 from collections import namedtuple
 from collections import Counter
 from workbook_management.interfaces import IWorkbookLoader
-from workbook_management.workbook_manager import ExcelValidator
+from workbook_management.workbook_manager import ExcelValidator, WorksheetRowExtractor
 from config_management.interfaces import IConfigLoader
 from utils.validation_utils import validate_and_return_file_path
+from cache_management.interfaces import ICompiledCache
 from enum import Enum
+from instrumentation_management.instrumentation import instrumented
 
 
 class CISControlsConst(Enum):
@@ -22,74 +25,64 @@ class CISControlsLoadConfig(ControlsConfigAttrs):
         self._config_title = CISControlsConst.CIS_CONTROLS_CONFIG.value
         super().__init__(config_loader)
 
-    def _load_config(self) -> dict:
+    @staticmethod
+    def _get_required_property(config: Dict, key: str):
+        attribute = config.get(key)
+        if not attribute:
+            raise KeyError('The key does not exist within the configuration file.')
+        return attribute
+
+    def _load_config(self) -> CISControlsConfigSnapshot:
         config = self._config_loader.load(self._config_path).get(self._config_title)
         if not config:
             raise KeyError('This configuration does not exist within the configuration file.')
-        return config
+        return CISControlsConfigSnapshot(
+            controls_path=self._get_required_property(config, 'CONTROLS_PATH'),
+            worksheet_name=self._get_required_property(config, 'WORKSHEET_NAME'),
+            cis_safeguard=self._get_required_property(config, 'SAFEGUARD'),
+            control_family_id=self._get_required_property(config, 'CONTROL_FAMILY_ID'),
+            asset_type=self._get_required_property(config, 'ASSET_TYPE'),
+            domain=self._get_required_property(config, 'DOMAIN'),
+            title=self._get_required_property(config, 'TITLE'),
+            description=self._get_required_property(config, 'DESCRIPTION'),
+            required_columns=frozenset(self._get_required_property(config, 'REQUIRED_COLUMN_TITLES')),
+            config_digest=get_config_digest(config))
 
     @property
     def controls_path(self) -> str:
-        controls_path = self._config.get('CONTROLS_PATH')
-        if not controls_path:
-            raise KeyError('The key does not exist within the configuration file.')
-        return controls_path
+        return self._config.controls_path
 
     @property
     def worksheet_name(self) -> str:
-        ws_name = self._config.get('WORKSHEET_NAME')
-        if not ws_name:
-            raise KeyError('The key does not exist within the configuration file.')
-        return ws_name
+        return self._config.worksheet_name
 
     @property
     def cis_safeguard(self) -> str:
-        cis_safeguard = self._config.get('SAFEGUARD')
-        if not cis_safeguard:
-            raise KeyError('The key does not exist within the configuration file.')
-        return cis_safeguard
+        return self._config.cis_safeguard
 
     @property
     def control_family_id(self) -> str:
-        control_family_id = self._config.get('CONTROL_FAMILY_ID')
-        if not control_family_id:
-            raise KeyError('The key does not exist within the configuration file.')
-        return control_family_id
+        return self._config.control_family_id
 
     @property
     def asset_type(self) -> str:
-        asset_type = self._config.get('ASSET_TYPE')
-        if not asset_type:
-            raise KeyError('The key does not exist within the configuration file.')
-        return asset_type
+        return self._config.asset_type
 
     @property
     def domain(self) -> str:
-        domain = self._config.get('DOMAIN')
-        if not domain:
-            raise KeyError('The key does not exist within the configuration file.')
-        return domain
+        return self._config.domain
 
     @property
     def title(self) -> str:
-        title = self._config.get('TITLE')
-        if not title:
-            raise KeyError('The key does not exist within the configuration file.')
-        return title
+        return self._config.title
 
     @property
     def description(self) -> str:
-        description = self._config.get('DESCRIPTION')
-        if not description:
-            raise KeyError('The key does not exist within the configuration file.')
-        return description
+        return self._config.description
 
     @property
-    def required_columns(self) -> set:
-        required_columns = set(self._config.get('REQUIRED_COLUMN_TITLES'))
-        if not required_columns:
-            raise KeyError('The key does not exist within the configuration file.')
-        return required_columns
+    def required_columns(self) -> frozenset:
+        return self._config.required_columns
 
     def __repr__(self):
         return f'CISControlsLoadConfig(config_path="{self._config_path}", config_loader="{self._config_loader}")'
@@ -125,10 +118,14 @@ class CISControlsWorkbookValidator(ExcelValidator):
 
 
 class CISControlsProcessWorkbook(CISControlsLoadWorkbook):
-    def __init__(self, *, workbook_loader: IWorkbookLoader, workbook_path: str, controls_config: CISControlsLoadConfig):
+    def __init__(self, *, workbook_loader: IWorkbookLoader, workbook_path: str, controls_config: CISControlsLoadConfig,
+                 compiled_cache: ICompiledCache = None):
         super().__init__(workbook_loader=workbook_loader, workbook_path=workbook_path)
+        if compiled_cache is not None and not isinstance(compiled_cache, ICompiledCache):
+            raise TypeError(f'Expected object of type {ICompiledCache.__name__}, got {type(compiled_cache).__name__}.')
         self._config = controls_config
-        self._excel_validator = CISControlsWorkbookValidator(self._workbook)
+        self._compiled_cache = compiled_cache
+        self._excel_validator = None
         self._cache = {'All Controls': []}
         self._control_families = {}
         self._populate_controls_cache()
@@ -142,30 +139,55 @@ class CISControlsProcessWorkbook(CISControlsLoadWorkbook):
             return worksheet, column_indices
         raise KeyError(f'"{worksheet}" worksheet cannot be found.')
 
+    def _get_worksheet_row_extractor(self, column_indices: Dict[str, int]) -> WorksheetRowExtractor:
+        return WorksheetRowExtractor(column_indices, {'safeguard_id': self._config.cis_safeguard,
+                                                      'asset_type': self._config.asset_type,
+                                                      'domain': self._config.domain,
+                                                      'title': self._config.title,
+                                                      'description': self._config.description,
+                                                      'control_family_id': self._config.control_family_id})
+
     def _get_worksheet_row_attributes(self, worksheet: Worksheet, column_indices: Dict[str, int]) -> NamedTuple:
         RowData = namedtuple('RowData', ['safeguard_id', 'asset_type', 'domain', 'title', 'description', 'control_family_id', 'is_family'])
         required_columns = self._config.required_columns
         if self._excel_validator.validate_column_titles(column_indices, required_columns):
+            row_extractor = self._get_worksheet_row_extractor(column_indices)
             safeguard_ids = set()
             for row in worksheet.iter_rows(min_row=2, values_only=True):
-                safeguard_id = str(row[column_indices[self._config.cis_safeguard]])
+                safeguard_id, asset_type, domain, title, description, control_family_id = row_extractor.extract(row)
+                safeguard_id = str(safeguard_id)
                 if safeguard_id in safeguard_ids:
                     safeguard_id += '0'
                 safeguard_ids.add(safeguard_id)
-                asset_type = row[column_indices[self._config.asset_type]]
-                domain = row[column_indices[self._config.domain]]
-                title = row[column_indices[self._config.title]]
-                description = row[column_indices[self._config.description]]
-                control_family_id = None
                 is_family = False
 
-                if not asset_type:
+                if asset_type:
+                    control_family_id = None
+                else:
                     is_family = True
-                    control_family_id = str(row[column_indices[self._config.control_family_id]])
+                    control_family_id = str(control_family_id)
 
                 yield RowData(safeguard_id, asset_type, domain, title, description, control_family_id, is_family)
 
+    def _load_compiled_controls(self) -> bool:
+        if self._compiled_cache is None:
+            return False
+        compiled_controls = self._compiled_cache.load(self._workbook_path, self._config.config_digest)
+        if not compiled_controls:
+            return False
+        self._cache['All Controls'], self._control_families = compiled_controls
+        return True
+
+    def _store_compiled_controls(self):
+        if self._compiled_cache is not None:
+            compiled_controls = (self._cache['All Controls'], self._control_families)
+            self._compiled_cache.store(self._workbook_path, self._config.config_digest, compiled_controls)
+
+    @instrumented('controls.populate')
     def _populate_controls_cache(self):
+        if self._load_compiled_controls():
+            return
+        self._excel_validator = CISControlsWorkbookValidator(self._workbook)
         worksheet, column_indices = self._get_worksheet_scope_headers()
         worksheet_row_attrs = self._get_worksheet_row_attributes(worksheet, column_indices)
         for row_data in worksheet_row_attrs:
@@ -177,6 +199,9 @@ class CISControlsProcessWorkbook(CISControlsLoadWorkbook):
                 self._cache['All Controls'].append(
                     CISControl(safeguard_id=row_data.safeguard_id, asset_type=row_data.asset_type,
                                domain=row_data.domain, title=row_data.title, description=row_data.description))
+        self._excel_validator = None
+        self._release_workbook()
+        self._store_compiled_controls()
 
     def get_all_controls(self) -> List[CISControl]:
         return self._cache['All Controls']
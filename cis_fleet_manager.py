@@ -0,0 +1,163 @@
+import copy
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generator, Iterable, List, NamedTuple
+from cis_audit_manager import CISAuditRunner, CISAuditValidator, DEFAULT_COMMAND_TIMEOUT
+from command_management.command_executors import BoundedCommandExecutor
+from command_management.interfaces import ICommandTransport
+from data_models.data_models import HostAuditResult, Recommendation
+from result_management.columnar_store import ColumnarResultStore
+from result_management.interfaces import IResultSink
+
+CONNECTION_FAILED_MESSAGE = 'Connection to host failed'
+
+
+class _HostAuditFinished(NamedTuple):
+    host: str
+    error: BaseException | None
+
+
+def _validate_positive_int(name: str, value) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f'{name} must be an integer, got {type(value).__name__}')
+    if value < 1:
+        raise ValueError(f'{name} must be greater than 0, got {value}.')
+    return value
+
+
+class FleetAuditRunner:
+    def __init__(self, *, transport: ICommandTransport, max_hosts: int = 8, max_commands: int = 32,
+                 max_commands_per_host: int = 1, command_timeout: float = DEFAULT_COMMAND_TIMEOUT,
+                 host_timeout: float = None, result_store: ColumnarResultStore = None,
+                 result_sink_factory: Callable[[str], IResultSink] = None):
+        if not isinstance(transport, ICommandTransport):
+            raise TypeError(f'Expected object of type {ICommandTransport.__name__}, got {type(transport).__name__}.')
+        if result_store is not None and not isinstance(result_store, ColumnarResultStore):
+            raise TypeError(f'Expected object of type {ColumnarResultStore.__name__}, '
+                            f'got {type(result_store).__name__}.')
+        self._transport = transport
+        self._max_hosts = _validate_positive_int('max_hosts', max_hosts)
+        self._max_commands = _validate_positive_int('max_commands', max_commands)
+        self._max_commands_per_host = _validate_positive_int('max_commands_per_host', max_commands_per_host)
+        validator = CISAuditValidator()
+        self._command_timeout = validator.validate_and_return_timeout(command_timeout, 'command_timeout')
+        self._host_timeout = validator.validate_and_return_timeout(host_timeout, 'host_timeout')
+        self._result_store = result_store
+        self._result_sink_factory = result_sink_factory
+
+    @property
+    def transport(self) -> ICommandTransport:
+        return self._transport
+
+    @property
+    def max_hosts(self) -> int:
+        return self._max_hosts
+
+    @property
+    def max_commands(self) -> int:
+        return self._max_commands
+
+    @property
+    def max_commands_per_host(self) -> int:
+        return self._max_commands_per_host
+
+    @property
+    def result_store(self) -> ColumnarResultStore | None:
+        return self._result_store
+
+    @staticmethod
+    def _create_connection_failed_results(host: str, recommendations: List[Recommendation],
+                                          error: Exception) -> List[HostAuditResult]:
+        failed_results = []
+        for recommendation in recommendations:
+            if recommendation.audit_cmd:
+                recommendation.compliant = f'{CONNECTION_FAILED_MESSAGE}: {error}'
+                recommendation.timed_out = False
+                recommendation.result_reused = False
+                failed_results.append(HostAuditResult(host, recommendation))
+        return failed_results
+
+    def _audit_host(self, host: str, recommendations: List[Recommendation], command_slots: threading.Semaphore,
+                    results: queue.Queue, stop: threading.Event):
+        error = None
+        try:
+            if stop.is_set():
+                return
+            # Every host audits its own copies, so the shared recommendations keep no host's compliance status.
+            host_recommendations = [copy.copy(recommendation) for recommendation in recommendations]
+            try:
+                command_executor = self._transport.connect(host)
+            except (OSError, ValueError) as connect_error:
+                for host_result in self._create_connection_failed_results(host, host_recommendations, connect_error):
+                    results.put(host_result)
+                return
+            result_sink = None if self._result_sink_factory is None else self._result_sink_factory(host)
+            try:
+                runner = CISAuditRunner(max_workers=self._max_commands_per_host,
+                                        command_timeout=self._command_timeout, run_timeout=self._host_timeout,
+                                        command_executor=BoundedCommandExecutor(command_executor, command_slots),
+                                        result_sink=result_sink)
+                audited_recommendations = runner.evaluate_recommendations_compliance(host_recommendations)
+                try:
+                    for recommendation in audited_recommendations:
+                        results.put(HostAuditResult(host, recommendation))
+                        if stop.is_set():
+                            break
+                finally:
+                    audited_recommendations.close()
+            finally:
+                command_executor.close()
+                if result_sink is not None:
+                    result_sink.close()
+        except Exception as host_error:
+            error = host_error
+        finally:
+            results.put(_HostAuditFinished(host, error))
+
+    def audit_hosts(self, hosts: Iterable[str],
+                    recommendations: Iterable[Recommendation]) -> Generator[HostAuditResult, None, None]:
+        hosts = list(dict.fromkeys(hosts))
+        recommendations = list(recommendations)
+        if self._result_store is not None:
+            # Hosts are added up front so the store keeps the order of the host list, not the completion order.
+            for host in hosts:
+                self._result_store.add_host(host)
+        if not hosts:
+            return
+        results = queue.Queue()
+        stop = threading.Event()
+        command_slots = threading.BoundedSemaphore(self._max_commands)
+        executor = ThreadPoolExecutor(max_workers=min(self._max_hosts, len(hosts)))
+        try:
+            for host in hosts:
+                executor.submit(self._audit_host, host, recommendations, command_slots, results, stop)
+            pending_hosts = len(hosts)
+            while pending_hosts:
+                host_result = results.get()
+                if isinstance(host_result, _HostAuditFinished):
+                    pending_hosts -= 1
+                    if host_result.error is not None:
+                        raise host_result.error
+                    continue
+                if self._result_store is not None:
+                    self._result_store.record_result(host_result.host, host_result.recommendation,
+                                                     host_result.recommendation.compliant,
+                                                     host_result.recommendation.timed_out)
+                yield host_result
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def audit_into_store(self, hosts: Iterable[str], recommendations: Iterable[Recommendation]) -> ColumnarResultStore:
+        recommendations = list(recommendations)
+        if self._result_store is None:
+            self._result_store = ColumnarResultStore(
+                [recommendation for recommendation in recommendations if recommendation.audit_cmd])
+        for _ in self.audit_hosts(hosts, recommendations):
+            pass
+        return self._result_store
+
+    def __repr__(self):
+        return (f'FleetAuditRunner(transport={self._transport!r}, max_hosts={self._max_hosts}, '
+                f'max_commands={self._max_commands}, max_commands_per_host={self._max_commands_per_host})')
@@ -0,0 +1,82 @@
+import copy
+from typing import Iterable, List, Mapping, Tuple
+import numpy as np
+from cis_audit_manager import CISAuditRunner, CISAuditValidator
+from data_models.data_models import CommandOutput, HostOutputs, Recommendation
+from result_management.columnar_store import ColumnarResultStore, ResultStatus
+
+
+class CISOfflineEvaluator:
+    def __init__(self, recommendations: Iterable[Recommendation]):
+        self._validator = CISAuditValidator()
+        self._recommendations = []
+        self._expected_outputs = []
+        self._matchers = []
+        for recommendation in recommendations:
+            if not isinstance(recommendation, Recommendation):
+                raise TypeError(f'Expected object of type {Recommendation.__name__}, '
+                                f'got {type(recommendation).__name__}.')
+            if recommendation.audit_cmd:
+                _, expected_output = self._validator.validate_and_return_audit_cmd_attrs(recommendation.audit_cmd)
+                self._recommendations.append(recommendation)
+                self._expected_outputs.append(expected_output)
+                self._matchers.append(getattr(recommendation.audit_cmd, 'matcher', None))
+        self._store_ordinals = {}
+
+    @property
+    def recommendations(self) -> List[Recommendation]:
+        return self._recommendations
+
+    def create_result_store(self, *, initial_host_capacity: int = 16) -> ColumnarResultStore:
+        return ColumnarResultStore(self._recommendations, initial_host_capacity=initial_host_capacity)
+
+    def _get_store_ordinals(self, result_store: ColumnarResultStore) -> List[int]:
+        # The ordinals of the recommendations in a store never change, so they are resolved once per store.
+        if id(result_store) not in self._store_ordinals:
+            self._store_ordinals[id(result_store)] = (result_store, [result_store.get_recommendation_ordinal(
+                recommendation) for recommendation in self._recommendations])
+        return self._store_ordinals[id(result_store)][1]
+
+    def _evaluate(self, command_outputs: Mapping[str, CommandOutput]) -> Iterable[Tuple[int, str | bool, bool]]:
+        for index, recommendation in enumerate(self._recommendations):
+            command_output = command_outputs.get(recommendation.recommend_id)
+            if command_output is not None:
+                yield (index, CISAuditRunner.evaluate_command_output(self._expected_outputs[index], command_output,
+                                                                     self._matchers[index]),
+                       command_output.timed_out)
+
+    def evaluate_host(self, command_outputs: Mapping[str, CommandOutput]) -> List[Recommendation]:
+        evaluated_recommendations = []
+        for index, compliant, timed_out in self._evaluate(command_outputs):
+            recommendation = copy.copy(self._recommendations[index])
+            recommendation.compliant = compliant
+            recommendation.timed_out = timed_out
+            recommendation.result_reused = False
+            evaluated_recommendations.append(recommendation)
+        return evaluated_recommendations
+
+    def evaluate_host_statuses(self, command_outputs: Mapping[str, CommandOutput],
+                               result_store: ColumnarResultStore) -> np.ndarray:
+        ordinals = self._get_store_ordinals(result_store)
+        statuses = np.full(result_store.recommendation_count, ResultStatus.NOT_AUDITED, dtype=np.int8)
+        for index, compliant, timed_out in self._evaluate(command_outputs):
+            statuses[ordinals[index]] = result_store.get_result_status(compliant, timed_out)
+        return statuses
+
+    def evaluate_into_store(self, hosts_outputs: Iterable[HostOutputs],
+                            result_store: ColumnarResultStore = None) -> ColumnarResultStore:
+        if result_store is None:
+            result_store = self.create_result_store()
+        if not isinstance(result_store, ColumnarResultStore):
+            raise TypeError(f'Expected object of type {ColumnarResultStore.__name__}, '
+                            f'got {type(result_store).__name__}.')
+        for host, command_outputs in hosts_outputs:
+            result_store.record_host_statuses(host, self.evaluate_host_statuses(command_outputs, result_store))
+        return result_store
+
+    def get_unmatched_recommend_ids(self, command_outputs: Mapping[str, CommandOutput]) -> List[str]:
+        recommend_ids = {recommendation.recommend_id for recommendation in self._recommendations}
+        return sorted(recommend_id for recommend_id in command_outputs if recommend_id not in recommend_ids)
+
+    def __repr__(self):
+        return f'CISOfflineEvaluator(recommendations={len(self._recommendations)})'
@@ -1,68 +1,146 @@
-from collections import Counter
-import numpy as np
-import matplotlib.pyplot as plt
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple
+
+DEFAULT_REPORT_DIR = 'report_images'
+DOMAINS_WEIGHT_CHART = 'control_domains_weight_chart.png'
+COMPLIANCE_BAR_CHART = 'compliance_bar_chart.png'
+
+
+class ReportChartData(NamedTuple):
+    output_dir: str
+    domains_weight: Dict[str, float]
+    audited_counts: Dict[str, int]
+    compliant_counts: Dict[str, int]
+
+
+def _create_figure(figsize=None):
+    # matplotlib is imported on first use so importing the report module stays cheap. Figures are created through the
+    # object-oriented API on an Agg canvas instead of pyplot, so they are not kept alive by pyplot's global figure
+    # registry and need no display.
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _save_figure(figure, path: str, **savefig_kwargs):
+    try:
+        figure.savefig(path, **savefig_kwargs)
+    finally:
+        figure.clear()
+
+
+def draw_domains_weight_pie_chart(domains_weight: Dict[str, float], path: str) -> str:
+    labels = list(domains_weight.keys())
+    sizes = list(domains_weight.values())
+
+    figure = _create_figure(figsize=(8, 8))
+    ax = figure.add_subplot()
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=140)
+    ax.axis('equal')
+    ax.set_title('All Control Domains Weight')
+
+    _save_figure(figure, path)
+    return path
+
+
+def draw_compliance_bar_chart(audited_counts: Dict[str, int], compliant_counts: Dict[str, int], path: str) -> str:
+    import numpy as np
+
+    domains = list(audited_counts.keys())
+    total_values = [audited_counts[domain] for domain in domains]
+    compliant_values = [compliant_counts.get(domain, 0) for domain in domains]
+    max_total = max(total_values, default=0)
+
+    # Setting up the bar positions
+    bar_width = 0.3  # Width of the bars
+    index = np.arange(len(domains))
+
+    # Creating the bar chart
+    figure = _create_figure()
+    ax = figure.add_subplot()
+    ax.bar(index, total_values, bar_width, color='cornflowerblue', label='Total Count')
+    ax.bar(index + bar_width, compliant_values, bar_width, color='lightcoral', label='Compliant Count')
+
+    # Adding labels for the counts centered over the bars
+    for i in range(len(domains)):
+        # Position for the total counts
+        ax.text(i, total_values[i] + max_total * 0.03, str(total_values[i]), ha='center', va='bottom', fontsize=9)
+
+        # Position for the compliant counts
+        ax.text(i + bar_width, compliant_values[i] + max_total * 0.03, str(compliant_values[i]), ha='center',
+                va='bottom', fontsize=9)
+
+    # Adjusting the y-axis limit to ensure labels don't go outside the grid
+    ax.set_ylim(0, max_total + max_total * 0.1 or 1)
+
+    # Adding labels, title, and legend
+    ax.set_xlabel('Domain')
+    ax.set_ylabel('Counts')
+    ax.set_title('Comparison of Total and Compliant Recommendations by Domain')
+    ax.set_xticks(index + bar_width / 2)
+    ax.set_xticklabels(domains)
+    ax.legend()
+
+    _save_figure(figure, path, bbox_inches='tight')
+    return path
+
+
+def render_report_charts(chart_data: ReportChartData) -> List[str]:
+    os.makedirs(chart_data.output_dir, exist_ok=True)
+    return [draw_domains_weight_pie_chart(chart_data.domains_weight,
+                                          os.path.join(chart_data.output_dir, DOMAINS_WEIGHT_CHART)),
+            draw_compliance_bar_chart(chart_data.audited_counts, chart_data.compliant_counts,
+                                      os.path.join(chart_data.output_dir, COMPLIANCE_BAR_CHART))]
 
 
 class ReportManager:
-    def __init__(self, evaluated_recommendations, all_domains_weight):
+    def __init__(self, evaluated_recommendations, all_domains_weight, *, output_dir: str = DEFAULT_REPORT_DIR):
+        from result_management.aggregation import ComplianceAggregator
         self._evaluated_recommendations = list(evaluated_recommendations)
         self._all_domains_weight = all_domains_weight
+        self._output_dir = output_dir
+        self._aggregator = ComplianceAggregator(self._evaluated_recommendations)
+
+    @property
+    def aggregator(self):
+        return self._aggregator
+
+    @property
+    def output_dir(self) -> str:
+        return self._output_dir
 
     def _get_audited_recommendations_details(self):
-        audited_recommendations = []
-        compliant_recommendations = []
-        for recommendation in self._evaluated_recommendations:
-            if recommendation.compliant:
-                compliant_recommendations.append(recommendation.cis_control.domain)
-            audited_recommendations.append(recommendation.cis_control.domain)
-        return Counter(audited_recommendations), Counter(compliant_recommendations)
-
-    def _create_domains_weight_pie_chart(self):
-        percentages = self._all_domains_weight
-
-        labels = percentages.keys()
-        sizes = percentages.values()
-
-        plt.figure(figsize=(8, 8))
-        plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=140)
-        plt.axis('equal')
-        plt.title('All Control Domains Weight')
-
-        plt.savefig('report_images/control_domains_weight_chart.png')
-
-    def _create_compliant_recommendations_bar_chart(self):
-        audited_recommendations_count, compliant_recommendations_count = self._get_audited_recommendations_details()
-
-        domains = list(audited_recommendations_count.keys())
-        total_values = [audited_recommendations_count[domain] for domain in domains]
-        compliant_values = [compliant_recommendations_count[domain] for domain in domains]
-
-        # Setting up the bar positions
-        bar_width = 0.3  # Width of the bars
-        index = np.arange(len(domains))
-
-        # Creating the bar chart
-        fig, ax = plt.subplots()
-        bar1 = ax.bar(index, total_values, bar_width, color='cornflowerblue', label='Total Count')
-        bar2 = ax.bar(index + bar_width, compliant_values, bar_width, color='lightcoral', label='Compliant Count')
-
-        # Adding labels for the counts centered over the bars
-        for i in range(len(domains)):
-            # Position for the total counts
-            ax.text(i, total_values[i] + max(total_values) * 0.03, str(total_values[i]), ha='center', va='bottom', fontsize=9)
-
-            # Position for the compliant counts
-            ax.text(i + bar_width, compliant_values[i] + max(total_values) * 0.03, str(compliant_values[i]), ha='center', va='bottom', fontsize=9)
-
-        # Adjusting the y-axis limit to ensure labels don't go outside the grid
-        ax.set_ylim(0, max(total_values) + max(total_values) * 0.1)
-
-        # Adding labels, title, and legend
-        ax.set_xlabel('Domain')
-        ax.set_ylabel('Counts')
-        ax.set_title('Comparison of Total and Compliant Recommendations by Domain')
-        ax.set_xticks(index + bar_width / 2)
-        ax.set_xticklabels(domains)
-        ax.legend()
-
-        plt.savefig('report_images/compliance_bar_chart.png', bbox_inches='tight')
\ No newline at end of file
+        domains, audited_counts, compliant_counts = self._aggregator.get_counts('domain')
+        return dict(zip(domains, audited_counts.tolist())), dict(zip(domains, compliant_counts.tolist()))
+
+    def get_chart_data(self) -> ReportChartData:
+        audited_counts, compliant_counts = self._get_audited_recommendations_details()
+        return ReportChartData(output_dir=self._output_dir, domains_weight=dict(self._all_domains_weight),
+                               audited_counts=audited_counts, compliant_counts=compliant_counts)
+
+    def create_charts(self) -> List[str]:
+        return render_report_charts(self.get_chart_data())
+
+
+def _get_host_chart_data(host: str, report_manager: ReportManager) -> ReportChartData:
+    if not isinstance(host, str) or host in ('', os.curdir, os.pardir) or os.sep in host or \
+            (os.altsep and os.altsep in host):
+        raise ValueError(f'Invalid host "{host}", expected a name usable as a directory.')
+    chart_data = report_manager.get_chart_data()
+    return chart_data._replace(output_dir=os.path.join(chart_data.output_dir, host))
+
+
+def render_reports_batch(report_managers: Dict[str, ReportManager], *, max_workers: int = None) -> Dict[str, List[str]]:
+    # Every host renders into its own directory below the output directory of its report manager, so hosts sharing
+    # an output directory do not overwrite each other's charts. Only the aggregated chart data is sent to the worker
+    # processes, not the recommendations.
+    chart_data_by_host = {host: _get_host_chart_data(host, report_manager)
+                          for host, report_manager in report_managers.items()}
+    if not chart_data_by_host:
+        return {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        rendered_charts = executor.map(render_report_charts, chart_data_by_host.values())
+        return dict(zip(chart_data_by_host, rendered_charts))
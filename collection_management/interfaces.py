@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+from typing import Iterator
+from data_models.data_models import HostOutputs
+
+
+class ICollectedOutputReader(ABC):
+    @abstractmethod
+    def read(self) -> Iterator[HostOutputs]:
+        pass
@@ -0,0 +1,116 @@
+import json
+import os
+import tarfile
+from typing import Dict, Iterator
+from collection_management.interfaces import ICollectedOutputReader
+from command_management.command_executors import create_command_output
+from data_models.data_models import CommandOutput, HostOutputs
+
+COLLECTED_OUTPUT_SUFFIX = '.json'
+
+
+def parse_command_output(output) -> CommandOutput:
+    """
+    Parses the collected output of one audit command.
+
+    Parameters:
+        output: Either the standard output of the command or an object with 'stdout', 'stderr' and 'return_code'.
+
+    Returns:
+        The command output in the form produced by the command executors.
+
+    Raises:
+        ValueError: If the output is neither a string nor an object.
+        TypeError: If a field of the output has the wrong type.
+    """
+    if isinstance(output, str):
+        return create_command_output(stdout=output)
+    if isinstance(output, dict):
+        return create_command_output(stdout=output.get('stdout', ''), stderr=output.get('stderr', ''),
+                                     return_code=output.get('return_code', 0))
+    raise ValueError(f'Collected output must be a string or an object, got {type(output).__name__}.')
+
+
+def parse_command_outputs(outputs) -> Dict[str, CommandOutput]:
+    """
+    Parses the collected outputs of the audit commands of one host.
+
+    Parameters:
+        outputs: An object mapping recommend ids to collected outputs.
+
+    Returns:
+        The command outputs keyed by recommend id.
+
+    Raises:
+        ValueError: If the outputs are not an object or one of them cannot be parsed.
+    """
+    if not isinstance(outputs, dict):
+        raise ValueError('Collected outputs must be an object mapping recommend ids to audit command outputs.')
+    command_outputs = {}
+    for recommend_id, output in outputs.items():
+        try:
+            command_outputs[recommend_id] = parse_command_output(output)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f'Invalid output of recommend id "{recommend_id}": {error}') from error
+    return command_outputs
+
+
+class JSONLinesCollectedOutputReader(ICollectedOutputReader):
+    def __init__(self, path: str):
+        if not isinstance(path, str) or not path:
+            raise TypeError(f'path must be a non-empty string, got {type(path).__name__}')
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def read(self) -> Iterator[HostOutputs]:
+        # Records of a host may be interleaved with those of other hosts, so all of them are grouped before the
+        # first host is handed out.
+        outputs_by_host = {}
+        with open(self._path, 'r', encoding='UTF-8') as collected_file:
+            for line_number, line in enumerate(collected_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    host, recommend_id = record['host'], record['recommend_id']
+                    command_output = parse_command_output(record)
+                except (KeyError, TypeError, ValueError) as error:
+                    raise ValueError(f'Invalid collected output on line {line_number} of "{self._path}": '
+                                     f'{error!r}') from error
+                outputs_by_host.setdefault(host, {})[recommend_id] = command_output
+        for host, command_outputs in outputs_by_host.items():
+            yield HostOutputs(host, command_outputs)
+
+    def __repr__(self):
+        return f'JSONLinesCollectedOutputReader(path="{self._path}")'
+
+
+class TarCollectedOutputReader(ICollectedOutputReader):
+    def __init__(self, path: str):
+        if not isinstance(path, str) or not path:
+            raise TypeError(f'path must be a non-empty string, got {type(path).__name__}')
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def read(self) -> Iterator[HostOutputs]:
+        # Every '<host>.json' member holds the outputs of one host, so the archive is streamed a host at a time.
+        with tarfile.open(self._path, 'r|*') as archive:
+            for member in archive:
+                if not member.isfile() or not member.name.endswith(COLLECTED_OUTPUT_SUFFIX):
+                    continue
+                host = os.path.basename(member.name)[:-len(COLLECTED_OUTPUT_SUFFIX)]
+                try:
+                    command_outputs = parse_command_outputs(json.load(archive.extractfile(member)))
+                except ValueError as error:
+                    raise ValueError(f'Invalid collected outputs in "{member.name}" of "{self._path}": '
+                                     f'{error}') from error
+                yield HostOutputs(host, command_outputs)
+
+    def __repr__(self):
+        return f'TarCollectedOutputReader(path="{self._path}")'
@@ -0,0 +1,347 @@
+import os
+import re
+import select
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Tuple
+from command_management.interfaces import ICommandExecutor
+from data_models.data_models import CommandOutput
+
+KILL_GRACE_SECONDS = 1
+MISSING_OUTPUT_MESSAGE = 'No output was recorded for the audit command.'
+READ_CHUNK_SIZE = 65536
+SUDO_COMMAND_PATTERN = re.compile(r'(?:^|[\s;&|(])(?:/usr/bin/)?sudo\s')
+# Audit commands run in their own process group, so a timeout can kill everything they started, but stay in the
+# session of the audit so sudo keeps the controlling terminal and its per-terminal credential cache. Popen gained
+# process_group in Python 3.11; older interpreters set the group in the child before exec.
+PROCESS_GROUP_KWARGS = {'process_group': 0} if sys.version_info >= (3, 11) else {'preexec_fn': os.setpgrp}
+
+
+def kill_process_group(process: subprocess.Popen):
+    """
+    Kills the process group led by the given process, falling back to killing the process alone.
+
+    Parameters:
+        process: A process started as the leader of its own process group.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        process.kill()
+
+
+def split_output(output: bytes) -> List[str]:
+    """
+    Decodes raw command output and splits it into lines.
+
+    Parameters:
+        output: The raw bytes written by the command.
+
+    Returns:
+        The decoded output lines.
+    """
+    return output.decode('UTF-8', errors='replace').split('\n')
+
+
+def create_command_output(stdout: str = '', stderr: str = '', return_code: int | None = 0) -> CommandOutput:
+    """
+    Creates the output of an audit command that was executed elsewhere, e.g. collected on a remote host.
+
+    Parameters:
+        stdout: The text the command wrote to standard output.
+        stderr: The text the command wrote to standard error.
+        return_code: The exit status of the command.
+
+    Returns:
+        The command output in the form produced by the command executors.
+
+    Raises:
+        TypeError: If the output is not text or the return code is not an integer.
+    """
+    for name, value in (('stdout', stdout), ('stderr', stderr)):
+        if not isinstance(value, str):
+            raise TypeError(f'{name} must be a string, got {type(value).__name__}')
+    if return_code is not None and (not isinstance(return_code, int) or isinstance(return_code, bool)):
+        raise TypeError(f'return_code must be an integer, got {type(return_code).__name__}')
+    return CommandOutput(stdout.split('\n'), stderr.split('\n'), return_code)
+
+
+def run_process(args: str | List[str], timeout: float = None, *, shell: bool = False) -> CommandOutput:
+    """
+    Runs a process in its own process group and collects its output, killing the whole group on timeout.
+
+    Parameters:
+        args: The command line, a string if shell is True and an argument list otherwise.
+        timeout: Seconds the process may run (no limit if None).
+        shell: Whether to run the command line through the shell.
+
+    Returns:
+        The output of the process.
+    """
+    started = time.monotonic()
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=shell,
+                               **PROCESS_GROUP_KWARGS)
+    timed_out = False
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        kill_process_group(process)
+        try:
+            stdout, stderr = process.communicate(timeout=KILL_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            # A descendant outside the process group still holds the pipes open.
+            process.stdout.close()
+            process.stderr.close()
+            process.wait()
+            stdout, stderr = b'', b''
+    return CommandOutput(split_output(stdout), split_output(stderr), None if timed_out else process.returncode,
+                         timed_out, time.monotonic() - started)
+
+
+def uses_sudo(command: str) -> bool:
+    """
+    Tells whether an audit command runs sudo.
+
+    Parameters:
+        command: The shell command line of the audit.
+
+    Returns:
+        True if the command line invokes sudo.
+    """
+    return SUDO_COMMAND_PATTERN.search(command) is not None
+
+
+def authenticate_sudo(commands: Iterable[str]) -> bool:
+    """
+    Validates the sudo credentials in the foreground before any audit command runs, so that the commands reuse the
+    cached credentials instead of each prompting for a password behind the concurrent workers.
+
+    Parameters:
+        commands: The audit commands that are about to run.
+
+    Returns:
+        True if sudo was authenticated, False if no command needs sudo or the audit already runs as root.
+
+    Raises:
+        PermissionError: If sudo cannot be authenticated.
+    """
+    if os.geteuid() == 0 or not any(uses_sudo(command) for command in commands):
+        return False
+    try:
+        completed = subprocess.run(['sudo', '-v'])
+    except OSError as error:
+        raise PermissionError(f'Audit commands require sudo, which could not be started: {error}') from error
+    if completed.returncode != 0:
+        raise PermissionError('Audit commands require sudo, but it could not be authenticated. Run the audit as root '
+                              'or from a terminal where sudo can prompt for the password.')
+    return True
+
+
+class SubprocessCommandExecutor(ICommandExecutor):
+    def execute(self, command: str, timeout: float = None) -> CommandOutput:
+        return run_process(command, timeout, shell=True)
+
+    def close(self) -> None:
+        pass
+
+    def __repr__(self):
+        return 'SubprocessCommandExecutor()'
+
+
+class ShellSession:
+    def __init__(self, shell_path: str):
+        self._sentinel = uuid.uuid4().hex
+        self._sentinel_marker = f'\n{self._sentinel} '.encode('UTF-8')
+        self._stderr_dir = tempfile.mkdtemp(prefix='cis_audit_')
+        self._stderr_path = os.path.join(self._stderr_dir, 'stderr')
+        self._process = subprocess.Popen([shell_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL, **PROCESS_GROUP_KWARGS)
+        self._buffer = b''
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _wrap_command(self, command: str) -> bytes:
+        # The subshell keeps 'cd', 'exit' or variable assignments of one audit from leaking into the next one, at the
+        # cost of one fork of the session shell per audit (a '{ ...; }' group would let 'exit' end the session). The
+        # saving over a shell per command is the exec and start-up of a new shell, not the fork, and the processes
+        # the audit itself starts, such as sudo and osascript, are unchanged. The newlines keep heredoc terminators
+        # on their own line.
+        script = (f'(\n{command}\n) </dev/null 2>{shlex.quote(self._stderr_path)}\n'
+                  f'printf \'\\n%s %s\\n\' {self._sentinel} "$?"\n')
+        return script.encode('UTF-8')
+
+    def _read_stderr(self) -> List[str]:
+        try:
+            with open(self._stderr_path, 'rb') as stderr_file:
+                return split_output(stderr_file.read())
+        except OSError:
+            return ['']
+
+    def _find_sentinel(self) -> Tuple[int, int] | None:
+        marker_index = self._buffer.find(self._sentinel_marker)
+        if marker_index == -1:
+            return None
+        line_end = self._buffer.find(b'\n', marker_index + len(self._sentinel_marker))
+        if line_end == -1:
+            return None
+        return marker_index, line_end
+
+    def execute(self, command: str, timeout: float = None) -> CommandOutput:
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        try:
+            self._process.stdin.write(self._wrap_command(command))
+            self._process.stdin.flush()
+        except OSError:
+            self.close()
+            return CommandOutput([''], ['Audit shell exited unexpectedly.', ''], -1, False, time.monotonic() - started)
+
+        stdout_fd = self._process.stdout.fileno()
+        sentinel = self._find_sentinel()
+        while sentinel is None:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                output = self._buffer
+                self.close()
+                return CommandOutput(split_output(output), [''], None, True, time.monotonic() - started)
+            readable, _, _ = select.select([stdout_fd], [], [], remaining)
+            if not readable:
+                continue
+            chunk = os.read(stdout_fd, READ_CHUNK_SIZE)
+            if not chunk:
+                output = self._buffer
+                self.close()
+                return CommandOutput(split_output(output), ['Audit shell exited unexpectedly.', ''], -1, False,
+                                     time.monotonic() - started)
+            self._buffer += chunk
+            sentinel = self._find_sentinel()
+
+        marker_index, line_end = sentinel
+        output = self._buffer[:marker_index]
+        return_code = int(self._buffer[marker_index + len(self._sentinel_marker):line_end])
+        self._buffer = self._buffer[line_end + 1:]
+        return CommandOutput(split_output(output), self._read_stderr(), return_code, False, time.monotonic() - started)
+
+    def close(self):
+        if self._process is not None:
+            if self._process.poll() is None:
+                kill_process_group(self._process)
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
+        shutil.rmtree(self._stderr_dir, ignore_errors=True)
+
+    def __repr__(self):
+        return f'ShellSession(alive={self.is_alive})'
+
+
+class BatchedShellCommandExecutor(ICommandExecutor):
+    def __init__(self, *, shell_path: str = '/bin/sh'):
+        if not isinstance(shell_path, str) or not shell_path:
+            raise TypeError(f'shell_path must be a non-empty string, got {type(shell_path).__name__}')
+        self._shell_path = shell_path
+        self._idle_sessions = []
+        self._started_sessions = 0
+        self._executed_commands = 0
+        self._lock = threading.Lock()
+
+    @property
+    def started_sessions(self) -> int:
+        return self._started_sessions
+
+    @property
+    def executed_commands(self) -> int:
+        return self._executed_commands
+
+    def _acquire_session(self) -> ShellSession:
+        with self._lock:
+            self._executed_commands += 1
+            if self._idle_sessions:
+                return self._idle_sessions.pop()
+            self._started_sessions += 1
+        return ShellSession(self._shell_path)
+
+    def _release_session(self, session: ShellSession):
+        if not session.is_alive:
+            session.close()
+            return
+        with self._lock:
+            self._idle_sessions.append(session)
+
+    def execute(self, command: str, timeout: float = None) -> CommandOutput:
+        session = self._acquire_session()
+        try:
+            return session.execute(command, timeout)
+        finally:
+            self._release_session(session)
+
+    def close(self) -> None:
+        with self._lock:
+            idle_sessions, self._idle_sessions = self._idle_sessions, []
+        for session in idle_sessions:
+            session.close()
+
+    def __repr__(self):
+        return (f'BatchedShellCommandExecutor(shell_path="{self._shell_path}", '
+                f'started_sessions={self._started_sessions}, executed_commands={self._executed_commands})')
+
+
+class RecordedOutputCommandExecutor(ICommandExecutor):
+    def __init__(self, recorded_outputs: Dict[str, CommandOutput]):
+        self._recorded_outputs = {command.strip(): command_output
+                                  for command, command_output in recorded_outputs.items()}
+
+    @property
+    def recorded_commands(self) -> List[str]:
+        return list(self._recorded_outputs)
+
+    def execute(self, command: str, timeout: float = None) -> CommandOutput:
+        command_output = self._recorded_outputs.get(command.strip())
+        if command_output is None:
+            return CommandOutput([''], [MISSING_OUTPUT_MESSAGE, ''], None)
+        return command_output
+
+    def close(self) -> None:
+        pass
+
+    def __repr__(self):
+        return f'RecordedOutputCommandExecutor(recorded_commands={len(self._recorded_outputs)})'
+
+
+class BoundedCommandExecutor(ICommandExecutor):
+    def __init__(self, command_executor: ICommandExecutor, command_slots: threading.Semaphore):
+        if not isinstance(command_executor, ICommandExecutor):
+            raise TypeError(f'Expected object of type {ICommandExecutor.__name__}, '
+                            f'got {type(command_executor).__name__}.')
+        self._command_executor = command_executor
+        self._command_slots = command_slots
+
+    @property
+    def command_executor(self) -> ICommandExecutor:
+        return self._command_executor
+
+    def execute(self, command: str, timeout: float = None) -> CommandOutput:
+        # The slots are shared by every host of a fleet audit, so they bound the commands running at once overall
+        # while the per-host runners only bound their own commands.
+        with self._command_slots:
+            return self._command_executor.execute(command, timeout)
+
+    def close(self) -> None:
+        self._command_executor.close()
+
+    def __repr__(self):
+        return f'BoundedCommandExecutor(command_executor={self._command_executor!r})'
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from data_models.data_models import CommandOutput
+
+
+class ICommandExecutor(ABC):
+    @abstractmethod
+    def execute(self, command: str, timeout: float = None) -> CommandOutput:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class ICommandTransport(ABC):
+    @abstractmethod
+    def connect(self, host: str) -> ICommandExecutor:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
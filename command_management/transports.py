@@ -0,0 +1,117 @@
+import shlex
+import shutil
+import subprocess
+import tempfile
+from typing import List, Sequence
+from command_management.command_executors import (BatchedShellCommandExecutor, KILL_GRACE_SECONDS,
+                                                  SubprocessCommandExecutor, run_process)
+from command_management.interfaces import ICommandExecutor, ICommandTransport
+from data_models.data_models import CommandOutput
+
+DEFAULT_SSH_CONNECT_TIMEOUT = 10
+DEFAULT_SSH_CONTROL_PERSIST = 60
+
+
+class SSHCommandExecutor(ICommandExecutor):
+    def __init__(self, host: str, ssh_args: Sequence[str], *, remote_shell: str = '/bin/sh'):
+        self._host = host
+        self._ssh_args = list(ssh_args)
+        self._remote_shell = remote_shell
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    def _get_remote_command(self, command: str) -> str:
+        # The remote login shell only unwraps the quoting, so the audit runs under the same shell as locally.
+        return f'{self._remote_shell} -c {shlex.quote(command)}'
+
+    def execute(self, command: str, timeout: float = None) -> CommandOutput:
+        return run_process([*self._ssh_args, '--', self._host, self._get_remote_command(command)], timeout)
+
+    def close(self) -> None:
+        # Stops the multiplexing master connection of the host, if one is still running.
+        try:
+            subprocess.run([*self._ssh_args, '-O', 'exit', '--', self._host], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=KILL_GRACE_SECONDS)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def __repr__(self):
+        return f'SSHCommandExecutor(host="{self._host}")'
+
+
+class SSHCommandTransport(ICommandTransport):
+    def __init__(self, *, ssh_path: str = 'ssh', user: str = None, port: int = None, identity_file: str = None,
+                 connect_timeout: int = DEFAULT_SSH_CONNECT_TIMEOUT,
+                 control_persist: int = DEFAULT_SSH_CONTROL_PERSIST, ssh_options: Sequence[str] = (),
+                 remote_shell: str = '/bin/sh'):
+        for name, value in (('connect_timeout', connect_timeout), ('control_persist', control_persist)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise ValueError(f'{name} must be a positive integer, got {value}.')
+        if port is not None and (not isinstance(port, int) or isinstance(port, bool) or not 0 < port < 65536):
+            raise ValueError(f'port must be an integer between 1 and 65535, got {port}.')
+        self._connect_timeout = connect_timeout
+        self._control_dir = tempfile.mkdtemp(prefix='cis_ssh_')
+        self._remote_shell = remote_shell
+        # Every command of a host reuses one authenticated master connection through ControlMaster, so only the
+        # first command per host pays for the SSH handshake.
+        self._ssh_args = [ssh_path, '-o', 'BatchMode=yes', '-o', f'ConnectTimeout={connect_timeout}',
+                          '-o', 'ControlMaster=auto', '-o', f'ControlPath={self._control_dir}/%C',
+                          '-o', f'ControlPersist={control_persist}']
+        if user is not None:
+            self._ssh_args += ['-l', user]
+        if port is not None:
+            self._ssh_args += ['-p', str(port)]
+        if identity_file is not None:
+            self._ssh_args += ['-i', identity_file]
+        for option in ssh_options:
+            self._ssh_args += ['-o', option]
+
+    @property
+    def ssh_args(self) -> List[str]:
+        return list(self._ssh_args)
+
+    def _open_master_connection(self, host: str):
+        # A no-op command opens the master connection of the host, which ControlPersist keeps for the audit commands,
+        # so an unreachable host fails here once instead of once per command. stderr goes to a file because the
+        # persisted master may keep inherited pipes open.
+        with tempfile.TemporaryFile() as stderr_file:
+            try:
+                completed = subprocess.run([*self._ssh_args, '--', host, 'true'], stdin=subprocess.DEVNULL,
+                                           stdout=subprocess.DEVNULL, stderr=stderr_file,
+                                           timeout=self._connect_timeout * 2)
+            except subprocess.TimeoutExpired as error:
+                raise OSError(f'Connecting to "{host}" timed out.') from error
+            if completed.returncode != 0:
+                stderr_file.seek(0)
+                stderr_lines = stderr_file.read().decode('UTF-8', errors='replace').strip().splitlines()
+                reason = stderr_lines[-1] if stderr_lines else f'ssh exited with status {completed.returncode}'
+                raise OSError(f'Cannot connect to "{host}": {reason}')
+
+    def connect(self, host: str) -> ICommandExecutor:
+        if not isinstance(host, str) or not host or host.startswith('-'):
+            raise ValueError(f'Invalid host "{host}".')
+        self._open_master_connection(host)
+        return SSHCommandExecutor(host, self._ssh_args, remote_shell=self._remote_shell)
+
+    def close(self) -> None:
+        shutil.rmtree(self._control_dir, ignore_errors=True)
+
+    def __repr__(self):
+        return f'SSHCommandTransport(ssh_args={self._ssh_args})'
+
+
+class LocalCommandTransport(ICommandTransport):
+    def __init__(self, *, batched: bool = False):
+        self._batched = batched
+
+    def connect(self, host: str) -> ICommandExecutor:
+        # Every host runs on the local machine, which stands in for a fleet in tests and dry runs.
+        return BatchedShellCommandExecutor() if self._batched else SubprocessCommandExecutor()
+
+    def close(self) -> None:
+        pass
+
+    def __repr__(self):
+        return f'LocalCommandTransport(batched={self._batched})'
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Pattern
 from config_management.interfaces import IConfigLoader
 
 
@@ -20,6 +21,10 @@ class OpenConfig(ABC):
     def _load_config(self):
         pass
 
+    @property
+    def config_digest(self) -> str:
+        return self._config.config_digest
+
 
 class OpenCommands(ABC):
     def __init__(self, commands_loader: IConfigLoader):
@@ -96,6 +101,11 @@ class BenchmarksConfigAttrs(OpenConfig):
     def benchmark_profiles_rex(self) -> str:
         pass
 
+    @property
+    @abstractmethod
+    def benchmark_profiles_pattern(self) -> Pattern:
+        pass
+
     @property
     @abstractmethod
     def section(self) -> str:
@@ -156,16 +166,31 @@ class BenchmarksConfigAttrs(OpenConfig):
     def os_version_rex(self) -> str:
         pass
 
+    @property
+    @abstractmethod
+    def os_version_pattern(self) -> Pattern:
+        pass
+
     @property
     @abstractmethod
     def custom_os_version_rex(self) -> str:
         pass
 
+    @property
+    @abstractmethod
+    def custom_os_version_pattern(self) -> Pattern:
+        pass
+
     @property
     @abstractmethod
     def os_versions_mapping(self) -> dict:
         pass
 
+    @property
+    @abstractmethod
+    def allowed_os_versions(self) -> frozenset:
+        pass
+
 
 class AuditAttrs(OpenConfig):
     @property
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Mapping, Pattern, Tuple
+
+
+def get_config_digest(config: Dict) -> str:
+    """
+    Returns a stable SHA-256 digest of a configuration section.
+
+    Parameters:
+        config: The raw configuration section as loaded from the configuration file.
+
+    Returns:
+        The hexadecimal digest of the sorted JSON serialization of the section.
+    """
+    serialized_config = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(serialized_config.encode('UTF-8')).hexdigest()
+
+
+def compile_config_pattern(pattern: str, key: str) -> Pattern:
+    """
+    Compiles a regex pattern from the configuration file.
+
+    Parameters:
+        pattern: The regex pattern to compile.
+        key: The configuration key holding the pattern, used in the error message.
+
+    Returns:
+        The compiled regex pattern.
+
+    Raises:
+        ValueError: If the pattern is not a valid regex.
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regex pattern for '{key}': {e}")
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class CISBenchmarksConfigSnapshot:
+    """
+    Represents the validated 'CISBenchmarksConfig' section with its derived values precomputed. The collections are
+    read-only copies, so no consumer can change the configuration the config loader shares with the others.
+
+    Attributes:
+        allowed_scope_levels: Scope level titles keyed by integer scope level.
+        allowed_assessment_methods: Allowed assessment methods.
+        benchmark_profiles_rex: Regex matching benchmark profiles in the overview sheet.
+        benchmark_profiles_pattern: Compiled benchmark_profiles_rex.
+        section: Title of the section column.
+        recommendation: Title of the recommendation column.
+        title: Title of the title column.
+        assessment_status: Title of the assessment status column.
+        description: Title of the description column.
+        rationale: Title of the rationale column.
+        impact: Title of the impact column.
+        safeguard: Title of the CIS safeguard column.
+        overview_sheet: Name of the overview sheet.
+        required_columns: Column titles every scope level sheet must have.
+        workbooks_os_mapping: Benchmark workbook paths keyed by OS version.
+        os_version_rex: Regex extracting the major OS version from the sw_vers output.
+        os_version_pattern: Compiled os_version_rex.
+        custom_os_version_rex: Regex extracting the major OS version from a workbook path.
+        custom_os_version_pattern: Compiled custom_os_version_rex.
+        os_versions_mapping: OS versions keyed by major OS version.
+        allowed_os_versions: All OS versions from the OS versions mapping.
+        config_digest: Digest of the raw configuration section.
+    """
+    allowed_scope_levels: Mapping[int, str]
+    allowed_assessment_methods: Tuple[str, ...]
+    benchmark_profiles_rex: str
+    benchmark_profiles_pattern: Pattern
+    section: str
+    recommendation: str
+    title: str
+    assessment_status: str
+    description: str
+    rationale: str
+    impact: str
+    safeguard: str
+    overview_sheet: str
+    required_columns: FrozenSet[str]
+    workbooks_os_mapping: Mapping[str, str]
+    os_version_rex: str
+    os_version_pattern: Pattern
+    custom_os_version_rex: str
+    custom_os_version_pattern: Pattern
+    os_versions_mapping: Mapping[str, str]
+    allowed_os_versions: FrozenSet[str]
+    config_digest: str
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class CISControlsConfigSnapshot:
+    """
+    Represents the validated 'CISControlsConfig' section with its derived values precomputed.
+
+    Attributes:
+        controls_path: Path to the CIS Controls workbook.
+        worksheet_name: Name of the controls worksheet.
+        cis_safeguard: Title of the CIS safeguard column.
+        control_family_id: Title of the CIS control family column.
+        asset_type: Title of the asset type column.
+        domain: Title of the security function column.
+        title: Title of the title column.
+        description: Title of the description column.
+        required_columns: Column titles the controls worksheet must have.
+        config_digest: Digest of the raw configuration section.
+    """
+    controls_path: str
+    worksheet_name: str
+    cis_safeguard: str
+    control_family_id: str
+    asset_type: str
+    domain: str
+    title: str
+    description: str
+    required_columns: FrozenSet[str]
+    config_digest: str
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class CISAuditConfigSnapshot:
+    """
+    Represents the validated 'CISAuditConfig' section.
+
+    Attributes:
+        audit_commands_path: Path to the audit commands file.
+        config_digest: Digest of the raw configuration section.
+    """
+    audit_commands_path: str
+    config_digest: str
@@ -1,12 +1,34 @@
-from typing import Dict
+import os
+import threading
+from typing import Dict, Tuple
 from config_management.interfaces import IConfigLoader
 import json
+from instrumentation_management.instrumentation import instrumented
 
 
 class JSONConfigLoader(IConfigLoader):
+    def __init__(self):
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _get_file_identity(path: str) -> Tuple[str, int, int, int, int]:
+        file_stat = os.stat(path)
+        return os.path.realpath(path), file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size
+
+    @instrumented('config.load')
     def load(self, path: str) -> Dict:
+        file_identity = self._get_file_identity(path)
+        real_path = file_identity[0]
+        with self._cache_lock:
+            cached_identity, cached_config = self._cache.get(real_path, (None, None))
+        if cached_identity == file_identity:
+            return cached_config
         try:
             with open(path, 'r') as config_file:
-                return json.load(config_file)
+                config = json.load(config_file)
         except json.JSONDecodeError as e:
-            raise ValueError(f'Error parsing JSON file at {path}: {e}')
\ No newline at end of file
+            raise ValueError(f'Error parsing JSON file at {path}: {e}')
+        with self._cache_lock:
+            self._cache[real_path] = (file_identity, config)
+        return config
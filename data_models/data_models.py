@@ -1,9 +1,73 @@
-from dataclasses import dataclass
+from dataclasses import MISSING, dataclass, fields
+from typing import Callable, Dict, FrozenSet, List, NamedTuple
+from matcher_management.interfaces import IOutputMatcher
 from utils.validation_utils import data_type_validator
 
+_TRUSTED_FACTORIES: Dict[type, Callable] = {}
 
-@dataclass(kw_only=True, frozen=True)
-class CISControl:
+
+def _create_trusted_factory(data_model: type) -> Callable:
+    """
+    Generates a keyword-only factory for a data model that assigns the fields without calling __post_init__.
+
+    Parameters:
+        data_model: The dataclass to generate the factory for.
+
+    Returns:
+        The generated factory.
+    """
+    factory_globals = {'__data_model': data_model, '__object_new': object.__new__,
+                       '__object_setattr': object.__setattr__}
+    frozen = data_model.__dataclass_params__.frozen
+    parameters = []
+    assignments = []
+    for field in fields(data_model):
+        if field.default is MISSING:
+            parameters.append(field.name)
+        else:
+            factory_globals[f'__default_{field.name}'] = field.default
+            parameters.append(f'{field.name}=__default_{field.name}')
+        if frozen:
+            assignments.append(f"    __object_setattr(instance, '{field.name}', {field.name})")
+        else:
+            assignments.append(f"    instance.{field.name} = {field.name}")
+    factory_source = (f"def from_trusted(*, {', '.join(parameters)}):\n"
+                      f"    instance = __object_new(__data_model)\n"
+                      + '\n'.join(assignments) +
+                      "\n    return instance\n")
+    exec(factory_source, factory_globals)
+    return factory_globals['from_trusted']
+
+
+class TrustedDataModel:
+    """
+    Base of the data models that adds a construction path skipping the per-field validation of __post_init__.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_trusted(cls, **attributes):
+        """
+        Creates an instance from attributes that have already been validated, e.g. when rebuilding parsed objects.
+
+        Parameters:
+            attributes: The attributes of the instance; omitted attributes take their default value.
+
+        Returns:
+            The created instance.
+
+        Raises:
+            TypeError: If a required attribute is missing or an unknown attribute is provided.
+        """
+        # The factories are cached per class and never bound to the class, so a subclass gets its own factory.
+        factory = _TRUSTED_FACTORIES.get(cls)
+        if factory is None:
+            factory = _TRUSTED_FACTORIES[cls] = _create_trusted_factory(cls)
+        return factory(**attributes)
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class CISControl(TrustedDataModel):
     """
     Represents a CIS control with its attributes.
 
@@ -29,8 +93,87 @@ class CISControl:
             data_type_validator(attr_name, attr_value, attr_type)
 
 
-@dataclass(kw_only=True)
-class Recommendation:
+class AuditCmd(NamedTuple):
+    """
+    Represents an audit command of a recommendation as defined in the audit commands file.
+
+    Attributes:
+        recommend_id: Identifier of the audited recommendation.
+        level: Level of the audited recommendation.
+        title: Title of the audited recommendation.
+        command: Shell command performing the audit.
+        expected_output: Output line the command prints on a compliant host (optional if a matcher is given).
+        timeout: Seconds the command may run before it is killed (optional, runner default if omitted).
+        ttl: Seconds a stored result of the command may be reused by a re-audit (optional, never reused if omitted).
+        matcher: Compiled matcher deciding whether the output is compliant (optional, the output must contain
+            expected_output as a line if omitted).
+    """
+    recommend_id: str
+    level: str
+    title: str
+    command: str
+    expected_output: str = None
+    timeout: float = None
+    ttl: float = None
+    matcher: IOutputMatcher = None
+
+
+class CommandOutput(NamedTuple):
+    """
+    Represents the outcome of an executed audit command.
+
+    Attributes:
+        stdout: Lines the command wrote to standard output.
+        stderr: Lines the command wrote to standard error.
+        return_code: Exit status of the command (None if it timed out).
+        timed_out: Whether the command was killed before it finished.
+        duration: Wall time of the command in seconds.
+    """
+    stdout: List[str]
+    stderr: List[str]
+    return_code: int | None
+    timed_out: bool = False
+    duration: float = 0.0
+
+
+class AuditResult(NamedTuple):
+    """
+    Represents a stored audit result of a recommendation.
+
+    Attributes:
+        compliant: Compliance status the audit command produced.
+        audited_at: Unix timestamp of the audit.
+    """
+    compliant: str | bool
+    audited_at: float
+
+
+class AuditCommandCoverage(NamedTuple):
+    """
+    Represents how the audit commands of an OS version line up with the recommendations of its benchmark.
+
+    Attributes:
+        unmatched_command_ids: Recommend ids of audit commands that match no recommendation.
+        uncovered_recommend_ids: Recommend ids of recommendations that have no audit command.
+    """
+    unmatched_command_ids: FrozenSet[str]
+    uncovered_recommend_ids: FrozenSet[str]
+
+
+class HostOutputs(NamedTuple):
+    """
+    Represents the audit command outputs collected on one host.
+
+    Attributes:
+        host: Name of the host the outputs were collected on.
+        command_outputs: Output of every collected audit command, keyed by recommend id.
+    """
+    host: str
+    command_outputs: Dict[str, CommandOutput]
+
+
+@dataclass(kw_only=True, slots=True)
+class Recommendation(TrustedDataModel):
     """
     Represents a recommendation with its details and associated CIS control and audit command.
 
@@ -45,6 +188,8 @@ class Recommendation:
         cis_control: Associated CIS Control object (optional).
         audit_cmd: Associated AuditCmd object (optional).
         compliant: Compliance status (optional).
+        timed_out: Whether the audit command was killed before it finished.
+        result_reused: Whether the compliance status was reused from a previous audit instead of being re-evaluated.
     """
     recommend_id: str
     level: int
@@ -56,6 +201,8 @@ class Recommendation:
     cis_control: CISControl = None
     audit_cmd: str = None
     compliant: str = None
+    timed_out: bool = False
+    result_reused: bool = False
 
     def __post_init__(self):
         """
@@ -66,8 +213,8 @@ class Recommendation:
             data_type_validator(attr_name, attr_value, attr_type)
 
 
-@dataclass(kw_only=True, frozen=True)
-class RecommendHeader:
+@dataclass(kw_only=True, frozen=True, slots=True)
+class RecommendHeader(TrustedDataModel):
     """
     Represents the header information for a recommendation.
 
@@ -91,8 +238,8 @@ class RecommendHeader:
             data_type_validator(attr_name, attr_value, attr_type)
 
 
-@dataclass(kw_only=True, frozen=True)
-class CISControlFamily:
+@dataclass(kw_only=True, frozen=True, slots=True)
+class CISControlFamily(TrustedDataModel):
     """
     Represents a CIS control family with its title and description.
 
@@ -112,4 +259,42 @@ class CISControlFamily:
             data_type_validator(attr_name, attr_value, attr_type)
 
 
+@dataclass(kw_only=True, frozen=True, slots=True)
+class HostFacts(TrustedDataModel):
+    """
+    Represents facts about the audited host that are collected once per process.
 
+    Attributes:
+        hostname: Network name of the host.
+        architecture: Machine architecture of the host.
+        product_name: Operating system product name reported by sw_vers.
+        product_version: Operating system version reported by sw_vers.
+        build_version: Operating system build reported by sw_vers.
+        sw_vers_output: Raw sw_vers output the facts were parsed from.
+    """
+    hostname: str
+    architecture: str
+    product_name: str
+    product_version: str
+    build_version: str
+    sw_vers_output: str
+
+    def __post_init__(self):
+        """
+        Validates the data types of the attributes on instantiation.
+        """
+        for attr_name, attr_type in self.__annotations__.items():
+            attr_value = getattr(self, attr_name)
+            data_type_validator(attr_name, attr_value, attr_type)
+
+
+class HostAuditResult(NamedTuple):
+    """
+    Represents an audited recommendation of one host of a fleet.
+
+    Attributes:
+        host: Name of the audited host.
+        recommendation: The recommendation of the host with its compliance status.
+    """
+    host: str
+    recommendation: Recommendation
@@ -9,3 +9,5 @@ class WorkbookLoadingError(Exception):
     pass
 
 
+class HostFactsError(Exception):
+    pass
@@ -0,0 +1,82 @@
+import argparse
+import time
+from cis_benchmarks_registry import create_benchmark_registry_factory
+from cis_fleet_manager import FleetAuditRunner
+from cache_management.compiled_cache import PickleCompiledCache
+from command_management.transports import LocalCommandTransport, SSHCommandTransport
+from result_management.columnar_store import ColumnarResultStore
+from result_management.sinks import JSONLinesResultSink
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+COMPILED_CACHE_DIR = '.cis_cache'
+
+
+def read_hosts(path: str):
+    with open(path, encoding='UTF-8') as hosts_file:
+        return [line.strip() for line in hosts_file if line.strip() and not line.lstrip().startswith('#')]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Audit many hosts against a CIS benchmark concurrently and aggregate '
+                                                 'their results. SSH runs in batch mode without a terminal, so audit '
+                                                 'commands using sudo require passwordless sudo (NOPASSWD) for the '
+                                                 'remote user, or logging in as root.')
+    parser.add_argument('hosts_file', help='File with one host per line; blank lines and # comments are ignored.')
+    parser.add_argument('--os-version', required=True, help='OS version of the benchmark, e.g. "MacOS Ventura".')
+    parser.add_argument('--level', type=int, default=None,
+                        help='Audit only the recommendations of this scope level (default: all levels).')
+    parser.add_argument('--transport', choices=('ssh', 'local'), default='ssh',
+                        help='Run the audit commands over SSH, or locally for a dry run (default: ssh).')
+    parser.add_argument('--ssh-user', default=None, help='Remote user of the SSH connections.')
+    parser.add_argument('--ssh-port', type=int, default=None, help='Port of the SSH connections.')
+    parser.add_argument('--ssh-identity', default=None, help='Identity file of the SSH connections.')
+    parser.add_argument('--max-hosts', type=int, default=8, help='Hosts audited at once (default: 8).')
+    parser.add_argument('--max-commands', type=int, default=32,
+                        help='Audit commands running at once across all hosts (default: 32).')
+    parser.add_argument('--per-host-workers', type=int, default=1,
+                        help='Audit commands running at once on one host (default: 1).')
+    parser.add_argument('--host-timeout', type=float, default=None, help='Time budget of every host in seconds.')
+    parser.add_argument('--group-by', default='domain',
+                        help='Grouping of the pass rates: level, domain, asset_type, control_family or safeguard '
+                             '(default: domain).')
+    parser.add_argument('--jsonl', default=None, help='Append every audited recommendation to this JSON Lines file.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse the workbooks from scratch instead of using the compiled benchmark cache.')
+    args = parser.parse_args()
+
+    compiled_cache = None if args.no_cache else PickleCompiledCache(COMPILED_CACHE_DIR)
+    benchmark_registry = create_benchmark_registry_factory(CONFIG_PATH, compiled_cache=compiled_cache)()
+    if args.level is None:
+        recommendations = benchmark_registry.get_all_levels_recommendations(args.os_version)
+    else:
+        recommendations = benchmark_registry.get_recommendations_by_level(args.os_version, scope_level=args.level)
+    recommendations = [recommendation for recommendation in recommendations if recommendation.audit_cmd]
+    hosts = read_hosts(args.hosts_file)
+
+    if args.transport == 'ssh':
+        transport = SSHCommandTransport(user=args.ssh_user, port=args.ssh_port, identity_file=args.ssh_identity)
+    else:
+        transport = LocalCommandTransport(batched=True)
+    result_sink = None if args.jsonl is None else JSONLinesResultSink.open(args.jsonl)
+    result_store = ColumnarResultStore(recommendations, initial_host_capacity=max(len(hosts), 1))
+    fleet_runner = FleetAuditRunner(transport=transport, max_hosts=args.max_hosts, max_commands=args.max_commands,
+                                    max_commands_per_host=args.per_host_workers, host_timeout=args.host_timeout,
+                                    result_store=result_store,
+                                    result_sink_factory=None if result_sink is None else result_sink.for_host)
+    started = time.perf_counter()
+    try:
+        for _ in fleet_runner.audit_hosts(hosts, recommendations):
+            pass
+    finally:
+        transport.close()
+        if result_sink is not None:
+            result_sink.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"Audited {result_store.host_count} hosts against {len(recommendations)} recommendations of "
+          f"{args.os_version} in {elapsed:.2f}s.")
+    for label, (compliant_total, audited_total) in result_store.get_group_counts(args.group_by).items():
+        if audited_total:
+            print(f"{label}: {compliant_total}/{audited_total} compliant ({compliant_total / audited_total:.1%})")
+    for host, pass_rate in result_store.get_host_pass_rates().items():
+        print(f"{host}: {pass_rate:.1%}")
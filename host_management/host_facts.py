@@ -0,0 +1,161 @@
+import contextlib
+import ctypes
+import dataclasses
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import List, Tuple
+from data_models.data_models import HostFacts
+from exceptions.custom_exceptions import HostFactsError
+from host_management.interfaces import IHostFactsProvider
+
+BOOT_TIME_TOLERANCE_SECONDS = 5
+
+
+class _KernBootTime(ctypes.Structure):
+    # struct timeval of kern.boottime; tv_usec is declared as a long, which keeps the 16 bytes of the padded macOS
+    # layout and matches the BSDs.
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_usec', ctypes.c_long)]
+
+
+def _load_libc():
+    # The symbols of the running process include the C library, so no library has to be looked up on disk.
+    try:
+        return ctypes.CDLL(None)
+    except (OSError, TypeError):
+        return None
+
+
+class SwVersHostFactsProvider(IHostFactsProvider):
+    _process_host_facts = None
+    _process_lock = threading.Lock()
+
+    def __init__(self, *, persist_path: str = None):
+        if persist_path is not None and (not isinstance(persist_path, str) or not persist_path):
+            raise TypeError(f'persist_path must be a non-empty string, got {type(persist_path).__name__}')
+        self._persist_path = persist_path
+        self._boot_time = None
+        self._boot_time_read = False
+
+    @staticmethod
+    def _read_kern_boottime(libc) -> float | None:
+        # kern.boottime is read in-process through sysctlbyname, so checking the persisted facts spawns no process.
+        sysctlbyname = getattr(libc, 'sysctlbyname', None)
+        if sysctlbyname is None:
+            return None
+        boot_time = _KernBootTime()
+        size = ctypes.c_size_t(ctypes.sizeof(boot_time))
+        if sysctlbyname(b'kern.boottime', ctypes.byref(boot_time), ctypes.byref(size), None, ctypes.c_size_t(0)) != 0:
+            return None
+        return float(boot_time.tv_sec) if boot_time.tv_sec > 0 else None
+
+    def _read_boot_time(self) -> float | None:
+        # The kernel's boot time is read because wall clock minus monotonic time drifts whenever the host sleeps.
+        boot_time = self._read_kern_boottime(_load_libc())
+        if boot_time is not None:
+            return boot_time
+        # Linux has no kern.boottime but reports the boot time in /proc/stat.
+        try:
+            with open('/proc/stat', 'r') as stat_file:
+                for line in stat_file:
+                    if line.startswith('btime '):
+                        return float(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    def _get_boot_time(self) -> float | None:
+        if not self._boot_time_read:
+            self._boot_time = self._read_boot_time()
+            self._boot_time_read = True
+        return self._boot_time
+
+    @staticmethod
+    def _run_sw_vers() -> Tuple[List[str], List[str], int]:
+        try:
+            sw_vers_cmd = subprocess.run(['sw_vers'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            raise HostFactsError(f'sw_vers cannot be executed: {e}')
+        stdout = sw_vers_cmd.stdout.decode('UTF-8').split('\n')
+        stderr = sw_vers_cmd.stderr.decode('UTF-8').split('\n')
+        return stdout, stderr, sw_vers_cmd.returncode
+
+    def _collect_host_facts(self) -> HostFacts:
+        stdout, stderr, return_code = self._run_sw_vers()
+        if return_code != 0:
+            raise HostFactsError(f'sw_vers failed with return code {return_code}: {stderr[0]}')
+        sw_vers_facts = {}
+        for line in stdout:
+            key, separator, value = line.partition(':')
+            if separator:
+                sw_vers_facts[key.strip()] = value.strip()
+        return HostFacts(hostname=socket.gethostname(),
+                         architecture=platform.machine(),
+                         product_name=sw_vers_facts.get('ProductName', ''),
+                         product_version=sw_vers_facts.get('ProductVersion', ''),
+                         build_version=sw_vers_facts.get('BuildVersion', ''),
+                         sw_vers_output='\n'.join(stdout))
+
+    def _load_persisted_host_facts(self) -> HostFacts | None:
+        if self._persist_path is None:
+            return None
+        try:
+            with open(self._persist_path, 'r') as persisted_file:
+                persisted = json.load(persisted_file)
+            boot_time = self._get_boot_time()
+            if boot_time is None or abs(persisted['boot_time'] - boot_time) > BOOT_TIME_TOLERANCE_SECONDS:
+                return None
+            return HostFacts(**persisted['host_facts'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _persist_host_facts(self, host_facts: HostFacts):
+        boot_time = self._get_boot_time()
+        if self._persist_path is None or boot_time is None:
+            return
+        persisted = {'boot_time': boot_time, 'host_facts': dataclasses.asdict(host_facts)}
+        persist_dir = os.path.dirname(os.path.abspath(self._persist_path))
+        try:
+            os.makedirs(persist_dir, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=persist_dir, suffix='.tmp')
+            try:
+                with os.fdopen(file_descriptor, 'w') as temp_file:
+                    json.dump(persisted, temp_file)
+                os.replace(temp_path, self._persist_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(temp_path)
+                raise
+        except OSError as error:
+            print(f"Error occurred while persisting host facts: '{error}'.", file=sys.stderr)
+
+    def get_host_facts(self) -> HostFacts:
+        with SwVersHostFactsProvider._process_lock:
+            if SwVersHostFactsProvider._process_host_facts is None:
+                host_facts = self._load_persisted_host_facts()
+                if host_facts is None:
+                    host_facts = self._collect_host_facts()
+                    self._persist_host_facts(host_facts)
+                SwVersHostFactsProvider._process_host_facts = host_facts
+            return SwVersHostFactsProvider._process_host_facts
+
+    def __repr__(self):
+        return f'SwVersHostFactsProvider(persist_path="{self._persist_path}")'
+
+
+class StaticHostFactsProvider(IHostFactsProvider):
+    def __init__(self, host_facts: HostFacts):
+        if not isinstance(host_facts, HostFacts):
+            raise TypeError(f'Expected object of type {HostFacts.__name__}, got {type(host_facts).__name__}.')
+        self._host_facts = host_facts
+
+    def get_host_facts(self) -> HostFacts:
+        return self._host_facts
+
+    def __repr__(self):
+        return f'StaticHostFactsProvider(host_facts={self._host_facts})'
@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+from data_models.data_models import HostFacts
+
+
+class IHostFactsProvider(ABC):
+    @abstractmethod
+    def get_host_facts(self) -> HostFacts:
+        pass
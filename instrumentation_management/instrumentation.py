@@ -0,0 +1,132 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+from instrumentation_management.interfaces import IInstrumentationHook
+
+_hooks: Tuple[IInstrumentationHook, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+def add_hook(hook: IInstrumentationHook):
+    """
+    Registers a hook that receives the wall time of every instrumented phase.
+
+    Parameters:
+        hook: The hook to register.
+
+    Raises:
+        TypeError: If the hook does not implement IInstrumentationHook.
+    """
+    global _hooks
+    if not isinstance(hook, IInstrumentationHook):
+        raise TypeError(f'Expected object of type {IInstrumentationHook.__name__}, got {type(hook).__name__}.')
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook: IInstrumentationHook):
+    """
+    Unregisters a previously registered hook; unknown hooks are ignored.
+
+    Parameters:
+        hook: The hook to unregister.
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(registered_hook for registered_hook in _hooks if registered_hook is not hook)
+
+
+def is_enabled() -> bool:
+    """
+    Returns whether any hook is registered.
+    """
+    return bool(_hooks)
+
+
+def _record(name: str, duration: float, label: str = None):
+    for hook in _hooks:
+        hook.record(name, duration, label)
+
+
+@contextmanager
+def timed(name: str, label: str = None) -> Iterator[None]:
+    """
+    Measures the wall time of the enclosed block and reports it to the registered hooks.
+
+    Parameters:
+        name: The name of the measured phase.
+        label: An optional detail distinguishing measurements of the same phase, e.g. the audited recommendations.
+    """
+    if not _hooks:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - started, label)
+
+
+def instrumented(name: str) -> Callable:
+    """
+    Decorates a function so that the wall time of every call is reported to the registered hooks.
+
+    Parameters:
+        name: The name of the measured phase.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+class PhaseTiming(NamedTuple):
+    name: str
+    label: str | None
+    calls: int
+    total: float
+    maximum: float
+
+
+class TimingCollector(IInstrumentationHook):
+    def __init__(self):
+        self._timings: Dict[Tuple[str, str | None], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration: float, label: str = None) -> None:
+        with self._lock:
+            timing = self._timings.setdefault((name, label), [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += duration
+            timing[2] = max(timing[2], duration)
+
+    def get_timings(self) -> List[PhaseTiming]:
+        with self._lock:
+            timings = [PhaseTiming(name, label, calls, total, maximum)
+                       for (name, label), (calls, total, maximum) in self._timings.items()]
+        return sorted(timings, key=lambda timing: timing.total, reverse=True)
+
+    def format_table(self, limit: int = None) -> str:
+        timings = self.get_timings()[:limit]
+        phases = [timing.name if timing.label is None else f'{timing.name} [{timing.label}]' for timing in timings]
+        phase_width = max([len('Phase')] + [len(phase) for phase in phases])
+        lines = [f"{'Phase':<{phase_width}}  {'Calls':>6}  {'Total (s)':>10}  {'Max (s)':>10}"]
+        for phase, timing in zip(phases, timings):
+            lines.append(f'{phase:<{phase_width}}  {timing.calls:>6}  {timing.total:>10.4f}  {timing.maximum:>10.4f}')
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f'TimingCollector(phases={len(self._timings)})'
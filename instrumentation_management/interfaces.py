@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+
+
+class IInstrumentationHook(ABC):
+    @abstractmethod
+    def record(self, name: str, duration: float, label: str = None) -> None:
+        pass
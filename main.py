@@ -1,13 +1,64 @@
+import argparse
+import cProfile
+import sys
 from cis_benchmarks_manager import CISBenchmarksLoadConfig, CISBenchmarksProcessWorkbook
 from cis_controls_manager import CISControlsLoadConfig, CISControlsProcessWorkbook
 from config_management.loaders import JSONConfigLoader
-from workbook_management.loaders import OpenPyXLWorkbookLoader
-from cis_audit_manager import CISAuditLoadCommands, CISAuditRunner, CISAuditLoadConfig
+from workbook_management.loaders import OpenPyXLReadOnlyWorkbookLoader
+from cache_management.compiled_cache import PickleCompiledCache
+from cache_management.result_store import JSONAuditResultStore
+from result_management.sinks import JSONLinesResultSink
+from instrumentation_management.instrumentation import TimingCollector, add_hook
+from host_management.host_facts import SwVersHostFactsProvider
+from command_management.command_executors import (BatchedShellCommandExecutor, SubprocessCommandExecutor,
+                                                  authenticate_sudo)
+from cis_audit_manager import CISAuditLoadCommands, CISAuditRunner, CISAuditLoadConfig, DEFAULT_COMMAND_TIMEOUT
 
 CONFIG_PATH = 'config/cis_workbooks_config.json'
+COMPILED_CACHE_DIR = '.cis_cache'
+HOST_FACTS_PATH = '.cis_cache/host_facts.json'
+AUDIT_RESULTS_DIR = '.cis_cache/audit_results'
+
+parser = argparse.ArgumentParser(description='Audit the current host against its CIS benchmark.')
+parser.add_argument('--workers', type=int, default=1,
+                    help='Number of audit commands to run concurrently (default: 1).')
+parser.add_argument('--completion-order', action='store_true',
+                    help='Print results as soon as each audit finishes instead of in benchmark order.')
+parser.add_argument('--command-timeout', type=float, default=DEFAULT_COMMAND_TIMEOUT,
+                    help='Seconds an audit command may run before it is killed, unless overridden in the audit '
+                         f'commands file (default: {DEFAULT_COMMAND_TIMEOUT}).')
+parser.add_argument('--deadline', type=float, default=None,
+                    help='Seconds the whole audit may run; commands still pending afterwards are reported as timed out.')
+parser.add_argument('--batched', action='store_true',
+                    help='Send the audit commands to long-lived shells, which fork a subshell per command instead of '
+                         'starting a new shell for it.')
+parser.add_argument('--jsonl', metavar='PATH',
+                    help='Append one JSON Lines record per audited recommendation to PATH as soon as it is evaluated '
+                         '("-" for standard output).')
+parser.add_argument('--no-cache', action='store_true',
+                    help='Parse the workbooks from scratch and rerun every audit instead of using the compiled '
+                         'benchmark cache and reusing audit results that are still within their TTL (only commands '
+                         'with a "ttl" in the audit commands file are reused).')
+parser.add_argument('--profile', action='store_true',
+                    help='Print the wall time of every load, mapping and audit command phase, slowest first.')
+parser.add_argument('--profile-output', metavar='PATH',
+                    help='Also run cProfile and dump its stats to PATH (read them with pstats); implies --profile.')
+args = parser.parse_args()
+args.profile = args.profile or bool(args.profile_output)
+
+timing_collector = None
+profiler = None
+if args.profile:
+    timing_collector = TimingCollector()
+    add_hook(timing_collector)
+    if args.profile_output:
+        profiler = cProfile.Profile()
+        profiler.enable()
 
 json_config_loader = JSONConfigLoader()
-openpyxl_workbook_loader = OpenPyXLWorkbookLoader()
+openpyxl_workbook_loader = OpenPyXLReadOnlyWorkbookLoader()
+compiled_cache = None if args.no_cache else PickleCompiledCache(COMPILED_CACHE_DIR)
+host_facts_provider = SwVersHostFactsProvider(persist_path=None if args.no_cache else HOST_FACTS_PATH)
 
 cis_audit_config = CISAuditLoadConfig(config_path=CONFIG_PATH, config_loader=json_config_loader)
 cis_controls_config = CISControlsLoadConfig(config_path=CONFIG_PATH, config_loader=json_config_loader)
@@ -18,7 +69,8 @@ CONTROLS_PATH = cis_controls_config.controls_path
 
 cis_controls_processor = CISControlsProcessWorkbook(workbook_loader=openpyxl_workbook_loader,
                                                     workbook_path=CONTROLS_PATH,
-                                                    controls_config=cis_controls_config)
+                                                    controls_config=cis_controls_config,
+                                                    compiled_cache=compiled_cache)
 all_cis_controls = cis_controls_processor.get_all_controls()
 
 audit_commands_loader = CISAuditLoadCommands(commands_path=COMMANDS_PATH, commands_loader=json_config_loader)
@@ -26,16 +78,66 @@ audit_commands_loader = CISAuditLoadCommands(commands_path=COMMANDS_PATH, comman
 workbook_processor = CISBenchmarksProcessWorkbook(workbook_loader=openpyxl_workbook_loader,
                                                   benchmarks_config=cis_benchmarks_config,
                                                   cis_controls=all_cis_controls,
-                                                  commands_loader=audit_commands_loader)
+                                                  commands_loader=audit_commands_loader,
+                                                  compiled_cache=compiled_cache,
+                                                  host_facts_provider=host_facts_provider)
 
 level_1_recommendations = workbook_processor.get_recommendations_by_level(scope_level=2)
 all_recommendations = workbook_processor.get_all_levels_recommendations()
 
-cis_audit_runner = CISAuditRunner()
-combined_audited_recommendations = cis_audit_runner.evaluate_recommendations_compliance(all_recommendations)
+try:
+    authenticate_sudo(recommendation.audit_cmd.command for recommendation in all_recommendations
+                      if recommendation.audit_cmd)
+except PermissionError as error:
+    sys.exit(str(error))
 
-for audited_recommendation in combined_audited_recommendations:
-    print(f"[{audited_recommendation.audit_cmd.level}] {audited_recommendation.audit_cmd.title} - {audited_recommendation.compliant}")
+command_executor = BatchedShellCommandExecutor() if args.batched else SubprocessCommandExecutor()
+result_store = None if args.no_cache else JSONAuditResultStore(store_dir=AUDIT_RESULTS_DIR,
+                                                               host=host_facts_provider.get_host_facts().hostname,
+                                                               os_version=workbook_processor.os_version)
+# JSON Lines on standard output moves the human-readable report to standard error.
+report_stream = sys.stderr if args.jsonl == '-' else sys.stdout
+if args.jsonl is None:
+    result_sink = None
+elif args.jsonl == '-':
+    result_sink = JSONLinesResultSink(sys.stdout, host=host_facts_provider.get_host_facts().hostname)
+else:
+    result_sink = JSONLinesResultSink.open(args.jsonl, host=host_facts_provider.get_host_facts().hostname)
+cis_audit_runner = CISAuditRunner(max_workers=args.workers, command_timeout=args.command_timeout,
+                                  run_timeout=args.deadline, command_executor=command_executor,
+                                  result_store=result_store, result_sink=result_sink)
+combined_audited_recommendations = cis_audit_runner.evaluate_recommendations_compliance(
+    all_recommendations, completion_order=args.completion_order)
 
+try:
+    for audited_recommendation in combined_audited_recommendations:
+        result_source = 'reused' if audited_recommendation.result_reused else 'fresh'
+        print(f"[{audited_recommendation.audit_cmd.level}] {audited_recommendation.audit_cmd.title} - {audited_recommendation.compliant} ({result_source})", file=report_stream)
+finally:
+    command_executor.close()
+    if result_sink is not None:
+        result_sink.close()
 
+audit_plan = cis_audit_runner.last_audit_plan
+executed_count = len(audit_plan.get_executed_commands())
+print(f"Executed {executed_count} unique audit commands for {len(audit_plan.recommendations)} "
+      f"recommendations ({len(audit_plan.recommendations) - executed_count} executions saved).", file=report_stream)
+reused_count = sum(recommendation.result_reused for recommendation in audit_plan.recommendations)
+if reused_count:
+    print(f"{reused_count} results were reused from the previous audit.", file=report_stream)
+timed_out_count = sum(recommendation.timed_out for recommendation in audit_plan.recommendations)
+if timed_out_count:
+    print(f"{timed_out_count} recommendations timed out.", file=report_stream)
+audit_command_coverage = workbook_processor.audit_command_coverage
+if audit_command_coverage.unmatched_command_ids:
+    print(f"Audit commands matching no recommendation: "
+          f"{', '.join(sorted(audit_command_coverage.unmatched_command_ids))}.", file=report_stream)
+if audit_command_coverage.uncovered_recommend_ids:
+    print(f"{len(audit_command_coverage.uncovered_recommend_ids)} recommendations have no audit command.",
+          file=report_stream)
 
+if profiler is not None:
+    profiler.disable()
+    profiler.dump_stats(args.profile_output)
+if timing_collector is not None:
+    print(timing_collector.format_table(), file=report_stream)
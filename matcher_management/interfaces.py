@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class IOutputMatcher(ABC):
+    @abstractmethod
+    def matches(self, stdout: List[str]) -> bool:
+        pass
@@ -0,0 +1,235 @@
+import json
+import operator
+import re
+from typing import Callable, Dict, List, Tuple
+from matcher_management.interfaces import IOutputMatcher
+
+JSON_PATH_TOKEN_PATTERN = re.compile(r'\.([^.\[\]]+)|\[(-?\d+)\]|\[\'([^\']*)\'\]|\["([^"]*)"\]')
+INT_COMPARISON_OPERATORS: Dict[str, Callable[[int, int], bool]] = {
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+DEFAULT_INT_PATTERN = r'-?\d+'
+
+
+def get_output_text(stdout: List[str]) -> str:
+    """
+    Joins the standard output lines of a command into one text without surrounding whitespace.
+
+    Parameters:
+        stdout: Lines the command wrote to standard output.
+
+    Returns:
+        The stripped output text.
+    """
+    return '\n'.join(stdout).strip()
+
+
+def _get_required(spec: Dict, key: str, expected_type: type | Tuple[type, ...]):
+    if key not in spec:
+        raise ValueError(f'"{spec.get("type")}" matcher requires "{key}".')
+    value = spec[key]
+    if not isinstance(value, expected_type) or (isinstance(value, bool) and expected_type is int):
+        raise TypeError(f'"{key}" of "{spec.get("type")}" matcher has the wrong type, got {type(value).__name__}')
+    return value
+
+
+class OutputMatcher(IOutputMatcher):
+    # Matchers compare by their specification, so recommendations holding equal audit commands stay equal and the
+    # specification identifies the matcher in stored audit results.
+    def __init__(self, spec: Dict):
+        self._spec = spec
+        self._spec_key = json.dumps(spec, sort_keys=True)
+
+    @property
+    def spec(self) -> Dict:
+        return self._spec
+
+    @property
+    def spec_key(self) -> str:
+        return self._spec_key
+
+    def __eq__(self, other):
+        return isinstance(other, OutputMatcher) and self._spec_key == other._spec_key
+
+    def __hash__(self):
+        return hash(self._spec_key)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self._spec_key})'
+
+
+class ContainsLineMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self._value = _get_required(spec, 'value', str)
+
+    def matches(self, stdout: List[str]) -> bool:
+        return any(line.strip() == self._value for line in stdout if line)
+
+
+class ExactMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self._ignore_case = bool(spec.get('ignore_case', False))
+        value = _get_required(spec, 'value', str)
+        self._value = value.casefold() if self._ignore_case else value
+
+    def matches(self, stdout: List[str]) -> bool:
+        text = get_output_text(stdout)
+        return (text.casefold() if self._ignore_case else text) == self._value
+
+
+class RegexMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        flags = re.MULTILINE | (re.IGNORECASE if spec.get('ignore_case', False) else 0)
+        try:
+            self._pattern = re.compile(_get_required(spec, 'pattern', str), flags)
+        except re.error as error:
+            raise ValueError(f'Invalid "regex" matcher pattern: {error}') from error
+
+    def matches(self, stdout: List[str]) -> bool:
+        return self._pattern.search(get_output_text(stdout)) is not None
+
+
+class IntComparisonMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        comparison = _get_required(spec, 'operator', str)
+        if comparison not in INT_COMPARISON_OPERATORS:
+            raise ValueError(f'Invalid "int" matcher operator "{comparison}", allowed values: '
+                             f'{tuple(INT_COMPARISON_OPERATORS)}.')
+        self._compare = INT_COMPARISON_OPERATORS[comparison]
+        self._value = _get_required(spec, 'value', int)
+        try:
+            self._pattern = re.compile(spec.get('pattern', DEFAULT_INT_PATTERN))
+        except re.error as error:
+            raise ValueError(f'Invalid "int" matcher pattern: {error}') from error
+
+    def matches(self, stdout: List[str]) -> bool:
+        # The first integer of the output is compared unless the pattern captures it in a group.
+        match = self._pattern.search(get_output_text(stdout))
+        if match is None:
+            return False
+        try:
+            number = int(match.group(1) if self._pattern.groups else match.group(0))
+        except (TypeError, ValueError):
+            return False
+        return self._compare(number, self._value)
+
+
+class SetMembershipMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        values = _get_required(spec, 'values', list)
+        if not values or not all(isinstance(value, str) for value in values):
+            raise ValueError('"values" of "in" matcher must be a non-empty list of strings.')
+        self._values = frozenset(values)
+
+    def matches(self, stdout: List[str]) -> bool:
+        return any(line.strip() in self._values for line in stdout if line)
+
+
+class JSONPathMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self._path = self._compile_path(_get_required(spec, 'path', str))
+        self._matcher = compile_matcher(_get_required(spec, 'matcher', dict))
+
+    @staticmethod
+    def _compile_path(path: str) -> Tuple[str | int, ...]:
+        if not path.startswith('$'):
+            raise ValueError(f'JSON path "{path}" must start with "$".')
+        keys = []
+        position = 1
+        while position < len(path):
+            match = JSON_PATH_TOKEN_PATTERN.match(path, position)
+            if match is None:
+                raise ValueError(f'Invalid JSON path "{path}" at position {position}.')
+            name, index, single_quoted, double_quoted = match.groups()
+            if index is not None:
+                keys.append(int(index))
+            else:
+                keys.append(next(key for key in (name, single_quoted, double_quoted) if key is not None))
+            position = match.end()
+        return tuple(keys)
+
+    @staticmethod
+    def _render_value(value) -> str:
+        if isinstance(value, str):
+            return value
+        return json.dumps(value, sort_keys=True)
+
+    def matches(self, stdout: List[str]) -> bool:
+        try:
+            value = json.loads(get_output_text(stdout))
+            for key in self._path:
+                value = value[key]
+        except (ValueError, KeyError, IndexError, TypeError):
+            return False
+        return self._matcher.matches([self._render_value(value)])
+
+
+class NotMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self._matcher = compile_matcher(_get_required(spec, 'matcher', dict))
+
+    def matches(self, stdout: List[str]) -> bool:
+        return not self._matcher.matches(stdout)
+
+
+class AllOfMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self._matchers = [compile_matcher(matcher_spec) for matcher_spec in _get_required(spec, 'matchers', list)]
+        if not self._matchers:
+            raise ValueError('"matchers" of "all" matcher must not be empty.')
+
+    def matches(self, stdout: List[str]) -> bool:
+        return all(matcher.matches(stdout) for matcher in self._matchers)
+
+
+class AnyOfMatcher(OutputMatcher):
+    def __init__(self, spec: Dict):
+        super().__init__(spec)
+        self._matchers = [compile_matcher(matcher_spec) for matcher_spec in _get_required(spec, 'matchers', list)]
+        if not self._matchers:
+            raise ValueError('"matchers" of "any" matcher must not be empty.')
+
+    def matches(self, stdout: List[str]) -> bool:
+        return any(matcher.matches(stdout) for matcher in self._matchers)
+
+
+MATCHER_TYPES: Dict[str, type] = {
+    'line': ContainsLineMatcher,
+    'exact': ExactMatcher,
+    'regex': RegexMatcher,
+    'int': IntComparisonMatcher,
+    'in': SetMembershipMatcher,
+    'json_path': JSONPathMatcher,
+    'not': NotMatcher,
+    'all': AllOfMatcher,
+    'any': AnyOfMatcher,
+}
+
+
+def compile_matcher(spec: Dict) -> IOutputMatcher:
+    """
+    Compiles a matcher specification of the audit commands file into a matcher object.
+
+    Parameters:
+        spec: An object with the matcher 'type', one of MATCHER_TYPES, and the arguments of that matcher.
+
+    Returns:
+        The compiled matcher.
+
+    Raises:
+        TypeError: If the specification or one of its arguments has the wrong type.
+        ValueError: If the matcher type is unknown or an argument is missing or invalid.
+    """
+    if not isinstance(spec, dict):
+        raise TypeError(f'Matcher specification must be an object, got {type(spec).__name__}')
+    matcher_type = spec.get('type')
+    if matcher_type not in MATCHER_TYPES:
+        raise ValueError(f'Unknown matcher type "{matcher_type}", allowed values: {tuple(MATCHER_TYPES)}.')
+    return MATCHER_TYPES[matcher_type](spec)
@@ -0,0 +1,54 @@
+import argparse
+import tarfile
+import time
+from cis_benchmarks_registry import create_benchmark_registry_factory
+from cis_offline_evaluator import CISOfflineEvaluator
+from cache_management.compiled_cache import PickleCompiledCache
+from collection_management.readers import JSONLinesCollectedOutputReader, TarCollectedOutputReader
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+COMPILED_CACHE_DIR = '.cis_cache'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Evaluate audit command outputs collected on many hosts against a CIS '
+                                                 'benchmark without running any command.')
+    parser.add_argument('collected_outputs',
+                        help='JSON Lines file of {host, recommend_id, stdout, stderr, return_code} records, or a tar '
+                             'archive of <host>.json files mapping recommend ids to outputs.')
+    parser.add_argument('--os-version', required=True, help='OS version of the benchmark, e.g. "MacOS Ventura".')
+    parser.add_argument('--level', type=int, default=None,
+                        help='Evaluate only the recommendations of this scope level (default: all levels).')
+    parser.add_argument('--group-by', default='domain',
+                        help='Grouping of the pass rates: level, domain, asset_type, control_family or safeguard '
+                             '(default: domain).')
+    parser.add_argument('--per-host', action='store_true', help='Also print the pass rate of every host.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse the workbooks from scratch instead of using the compiled benchmark cache.')
+    args = parser.parse_args()
+
+    compiled_cache = None if args.no_cache else PickleCompiledCache(COMPILED_CACHE_DIR)
+    benchmark_registry = create_benchmark_registry_factory(CONFIG_PATH, compiled_cache=compiled_cache)()
+    if args.level is None:
+        recommendations = benchmark_registry.get_all_levels_recommendations(args.os_version)
+    else:
+        recommendations = benchmark_registry.get_recommendations_by_level(args.os_version, scope_level=args.level)
+
+    if tarfile.is_tarfile(args.collected_outputs):
+        collected_output_reader = TarCollectedOutputReader(args.collected_outputs)
+    else:
+        collected_output_reader = JSONLinesCollectedOutputReader(args.collected_outputs)
+
+    offline_evaluator = CISOfflineEvaluator(recommendations)
+    started = time.perf_counter()
+    result_store = offline_evaluator.evaluate_into_store(collected_output_reader.read())
+    elapsed = time.perf_counter() - started
+
+    print(f"Evaluated {result_store.host_count} hosts against {len(offline_evaluator.recommendations)} audited "
+          f"recommendations of {args.os_version} in {elapsed:.2f}s.")
+    for label, (compliant_total, audited_total) in result_store.get_group_counts(args.group_by).items():
+        if audited_total:
+            print(f"{label}: {compliant_total}/{audited_total} compliant ({compliant_total / audited_total:.1%})")
+    if args.per_host:
+        for host, pass_rate in result_store.get_host_pass_rates().items():
+            print(f"{host}: {pass_rate:.1%}")
@@ -0,0 +1,95 @@
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Sequence, Tuple
+import numpy as np
+from data_models.data_models import Recommendation
+
+UNMAPPED_LABEL = 'Unmapped'
+
+
+def _get_control_family(recommendation: Recommendation) -> str:
+    safeguard_id = recommendation.cis_control.safeguard_id if recommendation.cis_control else None
+    return safeguard_id.split('.')[0] if safeguard_id else UNMAPPED_LABEL
+
+
+GROUP_LABEL_GETTERS: Dict[str, Callable[[Recommendation], Hashable]] = {
+    'level': lambda recommendation: recommendation.level,
+    'domain': lambda recommendation: (recommendation.cis_control.domain if recommendation.cis_control
+                                      else UNMAPPED_LABEL),
+    'asset_type': lambda recommendation: (recommendation.cis_control.asset_type if recommendation.cis_control
+                                          else UNMAPPED_LABEL),
+    'control_family': _get_control_family,
+    'safeguard': lambda recommendation: recommendation.safeguard_id or UNMAPPED_LABEL,
+}
+
+
+def encode_labels(values: Sequence[Hashable]) -> Tuple[np.ndarray, List]:
+    """
+    Encodes group labels into integer codes in order of first appearance.
+
+    Parameters:
+        values: The group label of every item.
+
+    Returns:
+        The int32 code of every item and the labels indexed by code.
+    """
+    codes_by_label = {}
+    codes = np.fromiter((codes_by_label.setdefault(value, len(codes_by_label)) for value in values),
+                        dtype=np.int32, count=len(values))
+    return codes, list(codes_by_label)
+
+
+def get_group_label_getter(group_by: str) -> Callable[[Recommendation], Hashable]:
+    """
+    Returns the function extracting the group label of a recommendation.
+
+    Parameters:
+        group_by: The name of the grouping, one of GROUP_LABEL_GETTERS.
+
+    Returns:
+        The group label getter.
+
+    Raises:
+        ValueError: If the grouping is not supported.
+    """
+    if group_by not in GROUP_LABEL_GETTERS:
+        raise ValueError(f'Cannot group by "{group_by}", allowed values: {tuple(GROUP_LABEL_GETTERS)}.')
+    return GROUP_LABEL_GETTERS[group_by]
+
+
+class GroupCompliance(NamedTuple):
+    total: int
+    compliant: int
+    ratio: float
+
+
+class ComplianceAggregator:
+    def __init__(self, recommendations: Iterable[Recommendation]):
+        self._recommendations = list(recommendations)
+        self._compliant = np.fromiter((recommendation.compliant is True for recommendation in self._recommendations),
+                                      dtype=bool, count=len(self._recommendations))
+        self._group_columns = {}
+
+    @property
+    def recommendation_count(self) -> int:
+        return len(self._recommendations)
+
+    def _get_group_column(self, group_by: str) -> Tuple[np.ndarray, List]:
+        if group_by not in self._group_columns:
+            label_getter = get_group_label_getter(group_by)
+            self._group_columns[group_by] = encode_labels([label_getter(recommendation)
+                                                           for recommendation in self._recommendations])
+        return self._group_columns[group_by]
+
+    def get_counts(self, group_by: str) -> Tuple[List, np.ndarray, np.ndarray]:
+        codes, labels = self._get_group_column(group_by)
+        totals = np.bincount(codes, minlength=len(labels))
+        compliant_counts = np.bincount(codes, weights=self._compliant, minlength=len(labels)).astype(np.int64)
+        return labels, totals, compliant_counts
+
+    def get_rollup(self, group_by: str) -> Dict[Hashable, GroupCompliance]:
+        labels, totals, compliant_counts = self.get_counts(group_by)
+        ratios = np.divide(compliant_counts, totals, out=np.zeros(len(labels)), where=totals > 0)
+        return {label: GroupCompliance(int(total), int(compliant_count), float(ratio))
+                for label, total, compliant_count, ratio in zip(labels, totals, compliant_counts, ratios)}
+
+    def __repr__(self):
+        return f'ComplianceAggregator(recommendations={self.recommendation_count})'
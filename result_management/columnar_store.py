@@ -0,0 +1,157 @@
+from enum import IntEnum
+from typing import Dict, Hashable, Iterable, List, Tuple
+import numpy as np
+from data_models.data_models import Recommendation
+from result_management.aggregation import GROUP_LABEL_GETTERS, encode_labels
+
+
+class ResultStatus(IntEnum):
+    NOT_AUDITED = 0
+    COMPLIANT = 1
+    NON_COMPLIANT = 2
+    ERROR = 3
+    TIMED_OUT = 4
+
+
+class ColumnarResultStore:
+    def __init__(self, recommendations: Iterable[Recommendation], *, initial_host_capacity: int = 16):
+        if not isinstance(initial_host_capacity, int) or initial_host_capacity < 1:
+            raise ValueError(f'initial_host_capacity must be a positive integer, got {initial_host_capacity}.')
+        self._recommendation_keys = []
+        self._recommendation_ordinals = {}
+        group_values = {group_by: [] for group_by in GROUP_LABEL_GETTERS}
+        for recommendation in recommendations:
+            if not isinstance(recommendation, Recommendation):
+                raise TypeError(f'Expected object of type {Recommendation.__name__}, '
+                                f'got {type(recommendation).__name__}.')
+            key = self._get_recommendation_key(recommendation)
+            if key in self._recommendation_ordinals:
+                continue
+            self._recommendation_ordinals[key] = len(self._recommendation_keys)
+            self._recommendation_keys.append(key)
+            for group_by, values in group_values.items():
+                values.append(GROUP_LABEL_GETTERS[group_by](recommendation))
+        self._group_columns = {group_by: encode_labels(values) for group_by, values in group_values.items()}
+        self._hosts = []
+        self._host_ordinals = {}
+        self._statuses = np.zeros((initial_host_capacity, len(self._recommendation_keys)), dtype=np.int8)
+
+    @staticmethod
+    def _get_recommendation_key(recommendation: Recommendation) -> Tuple[int, str]:
+        return recommendation.level, recommendation.recommend_id
+
+    @staticmethod
+    def get_result_status(compliant: str | bool | None, timed_out: bool) -> ResultStatus:
+        if timed_out:
+            return ResultStatus.TIMED_OUT
+        if compliant is True:
+            return ResultStatus.COMPLIANT
+        if compliant is False:
+            return ResultStatus.NON_COMPLIANT
+        if compliant is None:
+            return ResultStatus.NOT_AUDITED
+        return ResultStatus.ERROR
+
+    @property
+    def recommendation_count(self) -> int:
+        return len(self._recommendation_keys)
+
+    @property
+    def host_count(self) -> int:
+        return len(self._hosts)
+
+    @property
+    def hosts(self) -> List[str]:
+        return list(self._hosts)
+
+    def get_group_labels(self, group_by: str) -> List:
+        return list(self._get_group_column(group_by)[1])
+
+    def _get_group_column(self, group_by: str) -> Tuple[np.ndarray, List]:
+        if group_by not in self._group_columns:
+            raise ValueError(f'Cannot group by "{group_by}", allowed values: {tuple(self._group_columns)}.')
+        return self._group_columns[group_by]
+
+    def get_recommendation_ordinal(self, recommendation: Recommendation) -> int:
+        key = self._get_recommendation_key(recommendation)
+        if key not in self._recommendation_ordinals:
+            raise KeyError(f'Recommendation "{recommendation.recommend_id}" of level {recommendation.level} '
+                           f'is not part of the result store.')
+        return self._recommendation_ordinals[key]
+
+    def add_host(self, host: str) -> int:
+        if not isinstance(host, str) or not host:
+            raise TypeError(f'host must be a non-empty string, got {type(host).__name__}')
+        if host in self._host_ordinals:
+            return self._host_ordinals[host]
+        host_ordinal = len(self._hosts)
+        if host_ordinal == self._statuses.shape[0]:
+            grown_statuses = np.zeros((host_ordinal * 2, self._statuses.shape[1]), dtype=np.int8)
+            grown_statuses[:host_ordinal] = self._statuses
+            self._statuses = grown_statuses
+        self._hosts.append(host)
+        self._host_ordinals[host] = host_ordinal
+        return host_ordinal
+
+    def _get_host_ordinal(self, host: str) -> int:
+        if host not in self._host_ordinals:
+            raise KeyError(f'Host "{host}" is not part of the result store.')
+        return self._host_ordinals[host]
+
+    def record_result(self, host: str, recommendation: Recommendation, compliant: str | bool | None,
+                      timed_out: bool = False):
+        host_ordinal = self.add_host(host)
+        self._statuses[host_ordinal, self.get_recommendation_ordinal(recommendation)] = \
+            self.get_result_status(compliant, timed_out)
+
+    def record_recommendations(self, host: str, recommendations: Iterable[Recommendation]):
+        host_ordinal = self.add_host(host)
+        for recommendation in recommendations:
+            self._statuses[host_ordinal, self.get_recommendation_ordinal(recommendation)] = \
+                self.get_result_status(recommendation.compliant, recommendation.timed_out)
+
+    def record_host_statuses(self, host: str, statuses: np.ndarray):
+        if statuses.shape != (self.recommendation_count,):
+            raise ValueError(f'Expected {self.recommendation_count} statuses, got an array of shape {statuses.shape}.')
+        host_ordinal = self.add_host(host)
+        self._statuses[host_ordinal] = statuses
+
+    def get_status(self, host: str, recommendation: Recommendation) -> ResultStatus:
+        host_ordinal = self._get_host_ordinal(host)
+        return ResultStatus(int(self._statuses[host_ordinal, self.get_recommendation_ordinal(recommendation)]))
+
+    def get_host_statuses(self, host: str) -> np.ndarray:
+        host_statuses = self._statuses[self._get_host_ordinal(host)]
+        host_statuses.flags.writeable = False
+        return host_statuses
+
+    def _get_statuses(self, hosts: Iterable[str] = None) -> np.ndarray:
+        if hosts is None:
+            return self._statuses[:len(self._hosts)]
+        return self._statuses[[self._get_host_ordinal(host) for host in hosts]]
+
+    def get_group_counts(self, group_by: str, *, hosts: Iterable[str] = None) -> Dict[Hashable, Tuple[int, int]]:
+        codes, labels = self._get_group_column(group_by)
+        statuses = self._get_statuses(hosts)
+        compliant_counts = np.count_nonzero(statuses == ResultStatus.COMPLIANT, axis=0)
+        audited_counts = np.count_nonzero(statuses != ResultStatus.NOT_AUDITED, axis=0)
+        compliant_totals = np.bincount(codes, weights=compliant_counts, minlength=len(labels))
+        audited_totals = np.bincount(codes, weights=audited_counts, minlength=len(labels))
+        return {label: (int(compliant_total), int(audited_total))
+                for label, compliant_total, audited_total in zip(labels, compliant_totals, audited_totals)}
+
+    def get_pass_rates(self, group_by: str, *, hosts: Iterable[str] = None) -> Dict[Hashable, float]:
+        return {label: compliant_total / audited_total
+                for label, (compliant_total, audited_total) in self.get_group_counts(group_by, hosts=hosts).items()
+                if audited_total}
+
+    def get_host_pass_rates(self) -> Dict[str, float]:
+        statuses = self._get_statuses()
+        compliant_counts = np.count_nonzero(statuses == ResultStatus.COMPLIANT, axis=1)
+        audited_counts = np.count_nonzero(statuses != ResultStatus.NOT_AUDITED, axis=1)
+        return {host: int(compliant_count) / int(audited_count)
+                for host, compliant_count, audited_count in zip(self._hosts, compliant_counts, audited_counts)
+                if audited_count}
+
+    def __repr__(self):
+        return f'ColumnarResultStore(recommendations={self.recommendation_count}, hosts={self.host_count})'
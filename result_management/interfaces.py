@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from data_models.data_models import CommandOutput, Recommendation
+
+
+class IResultSink(ABC):
+    @abstractmethod
+    def write(self, recommendation: Recommendation, command_output: CommandOutput | None) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
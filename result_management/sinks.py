@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+from typing import Dict, TextIO
+from data_models.data_models import CommandOutput, Recommendation
+from result_management.interfaces import IResultSink
+
+
+class JSONLinesResultSink(IResultSink):
+    def __init__(self, stream: TextIO, *, host: str = None, close_stream: bool = False):
+        if not hasattr(stream, 'write'):
+            raise TypeError(f'stream must be a writable text stream, got {type(stream).__name__}')
+        self._stream = stream
+        self._host = host
+        self._close_stream = close_stream
+        self._lock = threading.Lock()
+        self._written_records = 0
+
+    @classmethod
+    def open(cls, path: str, *, host: str = None) -> 'JSONLinesResultSink':
+        # Line buffering hands every record to the OS as soon as it is written.
+        return cls(open(path, 'a', buffering=1, encoding='UTF-8'), host=host, close_stream=True)
+
+    def for_host(self, host: str) -> 'JSONLinesResultSink':
+        # Host sinks share the stream and its lock, so records of concurrently audited hosts never interleave. Only
+        # the parent sink closes the stream.
+        host_sink = JSONLinesResultSink(self._stream, host=host)
+        host_sink._lock = self._lock
+        return host_sink
+
+    @property
+    def written_records(self) -> int:
+        return self._written_records
+
+    def _create_record(self, recommendation: Recommendation, command_output: CommandOutput | None) -> Dict:
+        record = {'recommend_id': recommendation.recommend_id,
+                  'level': recommendation.level,
+                  'title': recommendation.title,
+                  'compliant': recommendation.compliant,
+                  'timed_out': recommendation.timed_out,
+                  'result_reused': recommendation.result_reused,
+                  'return_code': command_output.return_code if command_output else None,
+                  'duration': round(command_output.duration, 6) if command_output else None,
+                  'recorded_at': time.time()}
+        if self._host is not None:
+            record['host'] = self._host
+        return record
+
+    def write(self, recommendation: Recommendation, command_output: CommandOutput | None) -> None:
+        line = json.dumps(self._create_record(recommendation, command_output), default=str) + '\n'
+        with self._lock:
+            self._stream.write(line)
+            self._stream.flush()
+            self._written_records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._close_stream:
+                self._stream.close()
+            else:
+                self._stream.flush()
+
+    def __repr__(self):
+        return f'JSONLinesResultSink(host="{self._host}", written_records={self._written_records})'
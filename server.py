@@ -0,0 +1,33 @@
+import argparse
+from cis_benchmarks_registry import create_benchmark_registry_factory
+from cache_management.compiled_cache import PickleCompiledCache
+from service_management.audit_service import AuditEvaluationService, AuditHTTPServer
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+COMPILED_CACHE_DIR = '.cis_cache'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve CIS benchmark evaluations of collected audit outputs over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1).')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080).')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of processes parsing the benchmark workbooks on (re)load (default: CPU count).')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse the workbooks from scratch on every (re)load instead of using the compiled cache.')
+    parser.add_argument('--verbose', action='store_true', help='Log every request to standard error.')
+    args = parser.parse_args()
+
+    compiled_cache = None if args.no_cache else PickleCompiledCache(COMPILED_CACHE_DIR)
+
+    audit_service = AuditEvaluationService(create_benchmark_registry_factory(
+        CONFIG_PATH, compiled_cache=compiled_cache, max_workers=args.workers))
+    audit_server = AuditHTTPServer((args.host, args.port), audit_service, verbose=args.verbose)
+    print(f'Serving {", ".join(audit_service.registry.os_versions)} benchmarks on http://{args.host}:{args.port} '
+          f'(GET /health, POST /evaluate, POST /reload).')
+    try:
+        audit_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        audit_server.server_close()
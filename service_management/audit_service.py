@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Mapping
+from cis_benchmarks_registry import BenchmarkRegistry
+from cis_offline_evaluator import CISOfflineEvaluator
+from collection_management.readers import parse_command_outputs
+from data_models.data_models import CommandOutput, Recommendation
+from service_management.interfaces import IAuditService
+
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+class AuditEvaluationService(IAuditService):
+    def __init__(self, registry_factory: Callable[[], BenchmarkRegistry]):
+        if not callable(registry_factory):
+            raise TypeError(f'registry_factory must be callable, got {type(registry_factory).__name__}')
+        self._registry_factory = registry_factory
+        self._reload_lock = threading.Lock()
+        self._registry = self._create_registry()
+        self._loaded_at = time.time()
+        self._reload_count = 0
+
+    def _create_registry(self) -> BenchmarkRegistry:
+        registry = self._registry_factory()
+        if not isinstance(registry, BenchmarkRegistry):
+            raise TypeError(f'Expected object of type {BenchmarkRegistry.__name__}, got {type(registry).__name__}.')
+        return registry
+
+    @property
+    def registry(self) -> BenchmarkRegistry:
+        return self._registry
+
+    def reload(self) -> None:
+        # The new registry is built before it replaces the old one, so requests keep being answered from the
+        # previous benchmarks while the workbooks are reparsed and a failed reload leaves them in place.
+        with self._reload_lock:
+            registry = self._create_registry()
+            self._registry = registry
+            self._loaded_at = time.time()
+            self._reload_count += 1
+
+    def get_status(self) -> Dict:
+        registry = self._registry
+        return {'os_versions': registry.os_versions,
+                'recommendations': {os_version: len(registry.get_all_levels_recommendations(os_version))
+                                    for os_version in registry.os_versions},
+                'loaded_at': self._loaded_at,
+                'reload_count': self._reload_count}
+
+    def evaluate(self, os_version: str, scope_level: int,
+                 command_outputs: Mapping[str, CommandOutput]) -> List[Recommendation]:
+        # Every recommendation is judged by the output posted for its own recommend id, even where recommendations
+        # share a command, and the evaluator works on copies, as the cached recommendations are shared by all requests.
+        recommendations = [recommendation for recommendation
+                           in self._registry.get_recommendations_by_level(os_version, scope_level=scope_level)
+                           if recommendation.audit_cmd and recommendation.recommend_id in command_outputs]
+        return CISOfflineEvaluator(recommendations).evaluate_host(command_outputs)
+
+    def __repr__(self):
+        return f'AuditEvaluationService(registry={self._registry}, reload_count={self._reload_count})'
+
+
+class AuditRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'CISAuditService/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status: HTTPStatus, body: Dict):
+        payload = json.dumps(body, default=str).encode('UTF-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error_json(self, status: HTTPStatus, message: str):
+        self._send_json(status, {'error': message})
+
+    def _read_json(self) -> Dict:
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            raise ValueError('Content-Length must be an integer.')
+        if content_length > MAX_REQUEST_BYTES:
+            raise OverflowError(f'Request body exceeds {MAX_REQUEST_BYTES} bytes.')
+        body = self.rfile.read(content_length) if content_length > 0 else b'{}'
+        request = json.loads(body)
+        if not isinstance(request, dict):
+            raise ValueError('Request body must be a JSON object.')
+        return request
+
+    @staticmethod
+    def _create_result(recommendation: Recommendation) -> Dict:
+        return {'recommend_id': recommendation.recommend_id,
+                'level': recommendation.level,
+                'title': recommendation.title,
+                'compliant': recommendation.compliant,
+                'timed_out': recommendation.timed_out}
+
+    def _handle_evaluate(self):
+        request = self._read_json()
+        os_version = request.get('os_version')
+        scope_level = request.get('level', 1)
+        if not isinstance(os_version, str) or not os_version:
+            raise ValueError('"os_version" must be a non-empty string.')
+        command_outputs = parse_command_outputs(request.get('outputs', {}))
+        evaluated_recommendations = self.server.service.evaluate(os_version, scope_level, command_outputs)
+        results = [self._create_result(recommendation) for recommendation in evaluated_recommendations]
+        evaluated_ids = {recommendation.recommend_id for recommendation in evaluated_recommendations}
+        compliant_count = sum(recommendation.compliant is True for recommendation in evaluated_recommendations)
+        non_compliant_count = sum(recommendation.compliant is False for recommendation in evaluated_recommendations)
+        self._send_json(HTTPStatus.OK, {
+            'os_version': os_version,
+            'level': scope_level,
+            'results': results,
+            'summary': {'evaluated': len(results),
+                        'compliant': compliant_count,
+                        'non_compliant': non_compliant_count,
+                        'errors': len(results) - compliant_count - non_compliant_count,
+                        'unmatched': sorted(set(command_outputs) - evaluated_ids)}})
+
+    def _handle_reload(self):
+        self._read_json()
+        self.server.service.reload()
+        self._send_json(HTTPStatus.OK, self.server.service.get_status())
+
+    def _dispatch(self, routes: Dict[str, Callable[[], None]]):
+        route = routes.get(self.path.split('?', 1)[0])
+        if route is None:
+            self._send_error_json(HTTPStatus.NOT_FOUND, f'Unknown endpoint "{self.path}".')
+            return
+        try:
+            route()
+        except OverflowError as error:
+            self._send_error_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, str(error))
+        except KeyError as error:
+            self._send_error_json(HTTPStatus.NOT_FOUND, str(error.args[0] if error.args else error))
+        except (TypeError, ValueError) as error:
+            self._send_error_json(HTTPStatus.BAD_REQUEST, str(error))
+        except Exception as error:
+            self._send_error_json(HTTPStatus.INTERNAL_SERVER_ERROR, f'{type(error).__name__}: {error}')
+
+    def do_GET(self):
+        self._dispatch({'/health': lambda: self._send_json(HTTPStatus.OK, self.server.service.get_status())})
+
+    def do_POST(self):
+        self._dispatch({'/evaluate': self._handle_evaluate, '/reload': self._handle_reload})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AuditHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, service: IAuditService, *, verbose: bool = False):
+        if not isinstance(service, IAuditService):
+            raise TypeError(f'Expected object of type {IAuditService.__name__}, got {type(service).__name__}.')
+        self.service = service
+        self.verbose = verbose
+        super().__init__(server_address, AuditRequestHandler)
+
+    def __repr__(self):
+        host, port = self.server_address[:2]
+        return f'AuditHTTPServer(host="{host}", port={port}, service={self.service})'
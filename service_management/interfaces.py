@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Mapping
+from data_models.data_models import CommandOutput, Recommendation
+
+
+class IAuditService(ABC):
+    @abstractmethod
+    def evaluate(self, os_version: str, scope_level: int,
+                 command_outputs: Mapping[str, CommandOutput]) -> List[Recommendation]:
+        pass
+
+    @abstractmethod
+    def reload(self) -> None:
+        pass
+
+    @abstractmethod
+    def get_status(self) -> Dict:
+        pass
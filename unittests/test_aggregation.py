@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from cis_report_manager import ReportManager, render_reports_batch
+from result_management.aggregation import ComplianceAggregator, GroupCompliance, UNMAPPED_LABEL
+from unittests.test_columnar_store import create_mapped_recommendation
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestComplianceAggregator(unittest.TestCase):
+    def setUp(self):
+        self.recommendations = [create_mapped_recommendation('1.1', 'Protect'),
+                                create_mapped_recommendation('1.2', 'Protect'),
+                                create_mapped_recommendation('1.3', 'Detect'),
+                                create_mapped_recommendation('1.4', None)]
+        for recommendation, compliant in zip(self.recommendations, [True, 'sudo: error', False, True]):
+            recommendation.compliant = compliant
+        self.recommendations[2].level = 2
+
+    def test_domain_rollup(self):
+        rollup = ComplianceAggregator(self.recommendations).get_rollup('domain')
+        self.assertEqual({'Protect': GroupCompliance(2, 1, 0.5), 'Detect': GroupCompliance(1, 0, 0.0),
+                          UNMAPPED_LABEL: GroupCompliance(1, 1, 1.0)}, rollup)
+
+    def test_other_rollups(self):
+        aggregator = ComplianceAggregator(self.recommendations)
+        self.assertEqual({1: GroupCompliance(3, 2, 2 / 3), 2: GroupCompliance(1, 0, 0.0)},
+                         aggregator.get_rollup('level'))
+        self.assertEqual({'Devices': (3, 1), UNMAPPED_LABEL: (1, 1)},
+                         {label: group[:2] for label, group in aggregator.get_rollup('asset_type').items()})
+        self.assertEqual({'4': (3, 1), UNMAPPED_LABEL: (1, 1)},
+                         {label: group[:2] for label, group in aggregator.get_rollup('control_family').items()})
+
+    def test_empty_and_invalid_groupings(self):
+        self.assertEqual({}, ComplianceAggregator([]).get_rollup('domain'))
+        with self.assertRaises(ValueError):
+            ComplianceAggregator(self.recommendations).get_rollup('title')
+
+    def test_report_manager_handles_unmapped_controls(self):
+        report_manager = ReportManager(iter(self.recommendations), {})
+        audited_counts, compliant_counts = report_manager._get_audited_recommendations_details()
+        self.assertEqual({'Protect': 2, 'Detect': 1, UNMAPPED_LABEL: 1}, audited_counts)
+        self.assertEqual({'Protect': 1, 'Detect': 0, UNMAPPED_LABEL: 1}, compliant_counts)
+
+
+class TestReportCharts(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.recommendations = [create_mapped_recommendation('1.1', 'Protect'),
+                                create_mapped_recommendation('1.2', 'Detect')]
+        self.recommendations[0].compliant = True
+        self.domains_weight = {'Protect': 60.0, 'Detect': 40.0}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_report_module_imports_plotting_lazily(self):
+        check_imports = ('import sys, cis_report_manager; '
+                         'print("matplotlib" in sys.modules or "numpy" in sys.modules)')
+        output = subprocess.run([sys.executable, '-c', check_imports], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual('False', output.stdout.strip())
+
+    def test_create_charts(self):
+        output_dir = os.path.join(self.temp_dir.name, 'report')
+        chart_paths = ReportManager(self.recommendations, self.domains_weight, output_dir=output_dir).create_charts()
+        self.assertEqual(2, len(chart_paths))
+        self.assertTrue(all(os.path.getsize(chart_path) > 0 for chart_path in chart_paths))
+
+    def test_render_reports_batch(self):
+        # The report managers share one output directory, as they do with the default one.
+        report_managers = {host: ReportManager(self.recommendations[:index], self.domains_weight,
+                                               output_dir=self.temp_dir.name)
+                           for index, host in enumerate(('host-1', 'host-2', 'host-3'), 1)}
+        rendered_charts = render_reports_batch(report_managers, max_workers=2)
+        self.assertEqual(set(report_managers), set(rendered_charts))
+        for host, chart_paths in rendered_charts.items():
+            self.assertEqual(2, len(chart_paths))
+            self.assertTrue(all(os.path.dirname(chart_path) == os.path.join(self.temp_dir.name, host)
+                                and os.path.exists(chart_path) for chart_path in chart_paths))
+        self.assertEqual(6, len({chart_path for chart_paths in rendered_charts.values() for chart_path in chart_paths}))
+
+    def test_render_reports_batch_rejects_path_hosts(self):
+        for host in ('', '..', os.path.join('host-1', 'charts')):
+            with self.subTest(host=host), self.assertRaises(ValueError):
+                render_reports_batch({host: ReportManager(self.recommendations, self.domains_weight,
+                                                          output_dir=self.temp_dir.name)})
+
+
+if __name__ == '__main__':
+    run_tests(TestComplianceAggregator)
+    run_tests(TestReportCharts)
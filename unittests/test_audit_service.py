@@ -0,0 +1,139 @@
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from command_management.command_executors import create_command_output
+from cis_benchmarks_registry import create_benchmark_registry_factory
+from service_management.audit_service import AuditEvaluationService, AuditHTTPServer
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+OS_VERSION = 'MacOS Ventura'
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestAuditEvaluationService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = AuditEvaluationService(create_benchmark_registry_factory(CONFIG_PATH, max_workers=1))
+        cls.audited_recommendations = [recommendation for recommendation
+                                       in cls.service.registry.get_recommendations_by_level(OS_VERSION, scope_level=1)
+                                       if recommendation.audit_cmd]
+
+    def test_evaluate_recorded_outputs(self):
+        compliant_recommendation, non_compliant_recommendation = self.audited_recommendations[:2]
+        command_outputs = {
+            compliant_recommendation.recommend_id:
+                create_command_output(stdout=compliant_recommendation.audit_cmd.expected_output),
+            non_compliant_recommendation.recommend_id: create_command_output(stdout='unexpected')}
+        evaluated_recommendations = self.service.evaluate(OS_VERSION, 1, command_outputs)
+        self.assertEqual([True, False], [recommendation.compliant for recommendation in evaluated_recommendations])
+
+    def test_cached_recommendations_are_not_modified(self):
+        recommendation = self.audited_recommendations[0]
+        self.service.evaluate(OS_VERSION, 1, {recommendation.recommend_id: create_command_output(stdout='unexpected')})
+        self.assertIsNone(recommendation.compliant)
+
+    def test_failed_command_reports_stderr(self):
+        recommendation = self.audited_recommendations[0]
+        command_output = create_command_output(stderr='permission denied', return_code=1)
+        evaluated_recommendations = self.service.evaluate(OS_VERSION, 1, {recommendation.recommend_id: command_output})
+        self.assertEqual('permission denied', evaluated_recommendations[0].compliant)
+
+    def test_recommendations_sharing_a_command_use_their_own_outputs(self):
+        file_sharing, http_server = (next(recommendation for recommendation in self.audited_recommendations
+                                          if recommendation.recommend_id == recommend_id)
+                                     for recommend_id in ('2.3.3.3', '4.2'))
+        self.assertEqual(file_sharing.audit_cmd.command, http_server.audit_cmd.command)
+        command_outputs = {'2.3.3.3': create_command_output(stdout='-\t0\tcom.apple.Finder'),
+                           '4.2': create_command_output(stdout='-\t0\tcom.apple.Finder\n123\t0\torg.apache.httpd')}
+        evaluated_recommendations = self.service.evaluate(OS_VERSION, 1, command_outputs)
+        self.assertEqual({'2.3.3.3': True, '4.2': False},
+                         {recommendation.recommend_id: recommendation.compliant
+                          for recommendation in evaluated_recommendations})
+
+    def test_reload_replaces_registry(self):
+        service = AuditEvaluationService(create_benchmark_registry_factory(CONFIG_PATH, max_workers=1))
+        registry = service.registry
+        service.reload()
+        self.assertIsNot(registry, service.registry)
+        self.assertEqual(1, service.get_status()['reload_count'])
+
+    def test_invalid_registry_factory(self):
+        with self.assertRaises(TypeError):
+            AuditEvaluationService(lambda: 'registry')
+
+
+class TestAuditHTTPServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = AuditEvaluationService(create_benchmark_registry_factory(CONFIG_PATH, max_workers=1))
+        cls.server = AuditHTTPServer(('127.0.0.1', 0), cls.service)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.recommendation = next(recommendation for recommendation
+                                  in cls.service.registry.get_recommendations_by_level(OS_VERSION, scope_level=1)
+                                  if recommendation.audit_cmd)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def request(self, path: str, body=None):
+        data = None if body is None else json.dumps(body).encode('UTF-8')
+        request = urllib.request.Request(self.base_url + path, data=data, method='GET' if body is None else 'POST')
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as error:
+            return error.code, json.load(error)
+
+    def test_health(self):
+        status, body = self.request('/health')
+        self.assertEqual(200, status)
+        self.assertIn(OS_VERSION, body['os_versions'])
+
+    def test_evaluate(self):
+        expected_output = self.recommendation.audit_cmd.expected_output
+        status, body = self.request('/evaluate', {
+            'os_version': OS_VERSION, 'level': 1,
+            'outputs': {self.recommendation.recommend_id: {'stdout': f'{expected_output}\n', 'return_code': 0},
+                        'unknown': 'output'}})
+        self.assertEqual(200, status)
+        self.assertEqual([self.recommendation.recommend_id], [result['recommend_id'] for result in body['results']])
+        self.assertTrue(body['results'][0]['compliant'])
+        self.assertEqual({'evaluated': 1, 'compliant': 1, 'non_compliant': 0, 'errors': 0, 'unmatched': ['unknown']},
+                         body['summary'])
+
+    def test_concurrent_evaluations(self):
+        bodies = [{'os_version': OS_VERSION, 'level': 1,
+                   'outputs': {self.recommendation.recommend_id: 'unexpected' if index % 2 else
+                               self.recommendation.audit_cmd.expected_output}} for index in range(16)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda body: self.request('/evaluate', body), bodies))
+        self.assertEqual([index % 2 == 0 for index in range(16)],
+                         [body['results'][0]['compliant'] for _, body in responses])
+
+    def test_reload(self):
+        status, body = self.request('/reload', {})
+        self.assertEqual(200, status)
+        self.assertGreaterEqual(body['reload_count'], 1)
+
+    def test_invalid_requests(self):
+        self.assertEqual(404, self.request('/evaluate', {'os_version': 'MacOS Unknown'})[0])
+        self.assertEqual(400, self.request('/evaluate', {'os_version': OS_VERSION, 'level': 7})[0])
+        self.assertEqual(400, self.request('/evaluate', {'os_version': OS_VERSION, 'outputs': []})[0])
+        self.assertEqual(404, self.request('/unknown')[0])
+
+
+if __name__ == '__main__':
+    run_tests(TestAuditEvaluationService)
+    run_tests(TestAuditHTTPServer)
@@ -0,0 +1,47 @@
+import unittest
+from benchmarks.run_benchmarks import BenchmarkInputs, compare_results, create_benchmarks, run_benchmarks
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.inputs = BenchmarkInputs()
+
+    def test_inputs_are_audited(self):
+        self.assertTrue(self.inputs.audited_recommendations)
+        self.assertTrue(all(recommendation.compliant is True for recommendation in self.inputs.audited_recommendations))
+
+    def test_every_benchmark_runs(self):
+        for benchmark in create_benchmarks(self.inputs):
+            with self.subTest(benchmark=benchmark.name):
+                benchmark.function()
+
+    def test_results_document(self):
+        results = run_benchmarks(self.inputs, repeat=2, number=1, selected=['benchmarks.lookup', 'report'])
+        self.assertEqual(['benchmarks.lookup_recommendations_by_id', 'benchmarks.lookup_headers_by_id',
+                          'benchmarks.lookup_recommendations_by_level', 'report.aggregation'],
+                         [benchmark['name'] for benchmark in results['benchmarks']])
+        self.assertEqual(self.inputs.os_version, results['os_version'])
+        self.assertTrue(all(0 < benchmark['min'] <= benchmark['median'] for benchmark in results['benchmarks']))
+
+    def test_compare_results(self):
+        baseline = {'benchmarks': [{'name': 'a', 'min': 1.0}, {'name': 'b', 'min': 2.0}]}
+        results = {'benchmarks': [{'name': 'a', 'min': 1.5}, {'name': 'b', 'min': 2.0}, {'name': 'c', 'min': 1.0}]}
+        comparisons = compare_results(results, baseline, threshold=1.2)
+        self.assertEqual([('a', True), ('b', False)],
+                         [(comparison['name'], comparison['regressed']) for comparison in comparisons])
+        self.assertAlmostEqual(1.5, comparisons[0]['ratio'])
+
+    def test_unknown_os_version(self):
+        with self.assertRaises(KeyError):
+            BenchmarkInputs('MacOS Unknown')
+
+
+if __name__ == '__main__':
+    run_tests(TestBenchmarkSuite)
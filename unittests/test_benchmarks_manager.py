@@ -0,0 +1,115 @@
+import unittest
+from unittest import mock
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from cis_audit_manager import CISAuditLoadCommands
+from cis_benchmarks_manager import CISBenchmarksLoadConfig, CISBenchmarksProcessWorkbook
+from config_management.loaders import JSONConfigLoader
+from unittests.test_cis_audit_manager import create_recommendation
+from workbook_management.loaders import OpenPyXLReadOnlyWorkbookLoader
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+COMMANDS_PATH = 'config/audit_commands.json'
+OS_VERSION = 'MacOS Ventura'
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestBenchmarkLookups(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        config_loader = JSONConfigLoader()
+        benchmarks_config = CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=config_loader)
+        cls.benchmark = CISBenchmarksProcessWorkbook(
+            workbook_loader=OpenPyXLReadOnlyWorkbookLoader(),
+            workbook_path=benchmarks_config.workbooks_os_mapping[OS_VERSION], benchmarks_config=benchmarks_config,
+            cis_controls=[], commands_loader=CISAuditLoadCommands(commands_path=COMMANDS_PATH,
+                                                                  commands_loader=config_loader))
+        cls.level_1_recommendations = cls.benchmark.get_recommendations_by_level(scope_level=1)
+        cls.level_2_recommendations = cls.benchmark.get_recommendations_by_level(scope_level=2)
+
+    def test_lookup_by_level_and_id(self):
+        for scope_level, recommendations in ((1, self.level_1_recommendations), (2, self.level_2_recommendations)):
+            for recommendation in recommendations:
+                with self.subTest(scope_level=scope_level, recommend_id=recommendation.recommend_id):
+                    self.assertIs(recommendation, self.benchmark.get_recommendation_by_id(
+                        scope_level=scope_level, recommendation_id=recommendation.recommend_id))
+        header = self.benchmark.get_recommendation_headers_by_level(scope_level=1)[0]
+        self.assertIs(header, self.benchmark.get_recommendation_header_by_id(scope_level=1,
+                                                                             header_id=header.recommend_id))
+
+    def test_lookup_is_scoped_to_the_level(self):
+        level_1_ids = {recommendation.recommend_id for recommendation in self.level_1_recommendations}
+        level_2_only = next(recommendation for recommendation in self.level_2_recommendations
+                            if recommendation.recommend_id not in level_1_ids)
+        with self.assertRaisesRegex(KeyError, level_2_only.recommend_id):
+            self.benchmark.get_recommendation_by_id(scope_level=1, recommendation_id=level_2_only.recommend_id)
+
+    def test_unknown_ids_raise_key_error(self):
+        with self.assertRaisesRegex(KeyError, '99.99'):
+            self.benchmark.get_recommendation_by_id(scope_level=1, recommendation_id='99.99')
+        with self.assertRaisesRegex(KeyError, '99.99'):
+            self.benchmark.get_recommendations_by_ids(scope_level=1, recommendation_ids=['1.1', '99.99'])
+        with self.assertRaisesRegex(KeyError, '99'):
+            self.benchmark.get_recommendation_header_by_id(scope_level=1, header_id='99')
+
+    def test_ids_keep_the_requested_order(self):
+        recommendation_ids = [recommendation.recommend_id for recommendation in self.level_1_recommendations[:5]]
+        recommendation_ids.reverse()
+        recommendations = self.benchmark.get_recommendations_by_ids(scope_level=1,
+                                                                    recommendation_ids=iter(recommendation_ids))
+        self.assertEqual(recommendation_ids, [recommendation.recommend_id for recommendation in recommendations])
+
+    def test_duplicate_ids(self):
+        recommendation_id = self.level_1_recommendations[0].recommend_id
+        recommendations = self.benchmark.get_recommendations_by_ids(
+            scope_level=1, recommendation_ids=[recommendation_id, recommendation_id])
+        self.assertEqual(2, len(recommendations))
+        self.assertIs(recommendations[0], recommendations[1])
+
+    def test_index_keeps_first_duplicate_row(self):
+        first, duplicate = create_recommendation('1.1'), create_recommendation('1.1')
+        other = create_recommendation('1.2')
+        items_index = CISBenchmarksProcessWorkbook._build_items_index({'Level 1': [first, duplicate, other],
+                                                                       'Level 2': [duplicate]})
+        self.assertEqual({('Level 1', '1.1'), ('Level 1', '1.2'), ('Level 2', '1.1')}, set(items_index))
+        self.assertIs(first, items_index[('Level 1', '1.1')])
+        self.assertIs(duplicate, items_index[('Level 2', '1.1')])
+
+
+class TestOverviewScan(unittest.TestCase):
+    def test_scan_stops_once_every_level_has_a_profile(self):
+        config_loader = JSONConfigLoader()
+        benchmarks_config = CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=config_loader)
+        overview_rows = []
+        iter_rows = ReadOnlyWorksheet.iter_rows
+
+        def recording_iter_rows(worksheet, *args, **kwargs):
+            for row in iter_rows(worksheet, *args, **kwargs):
+                if worksheet.title == benchmarks_config.overview_sheet:
+                    overview_rows.append(row)
+                yield row
+
+        with mock.patch.object(ReadOnlyWorksheet, 'iter_rows', recording_iter_rows):
+            benchmark = CISBenchmarksProcessWorkbook(
+                workbook_loader=OpenPyXLReadOnlyWorkbookLoader(),
+                workbook_path=benchmarks_config.workbooks_os_mapping[OS_VERSION], benchmarks_config=benchmarks_config,
+                cis_controls=[], commands_loader=CISAuditLoadCommands(commands_path=COMMANDS_PATH,
+                                                                      commands_loader=config_loader))
+        self.assertEqual({1: 'Level 1 - macOS 13.0 Ventura', 2: 'Level 2 - macOS 13.0 Ventura'},
+                         benchmark._scope_levels_os_mapping)
+        # The profiles are on the rows at indices 14 and 19 of the 34 overview rows, and no row after the second one
+        # is read.
+        matched_rows = [index for index, row in enumerate(overview_rows)
+                        if any(cell is not None and benchmarks_config.benchmark_profiles_pattern.search(str(cell))
+                               for cell in row)]
+        self.assertEqual([14, 19], matched_rows)
+        self.assertEqual(20, len(overview_rows))
+
+
+if __name__ == '__main__':
+    run_tests(TestBenchmarkLookups)
+    run_tests(TestOverviewScan)
@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import unittest
+from cis_audit_manager import CISAuditLoadCommands
+from cis_benchmarks_manager import CISBenchmarksLoadConfig, CISBenchmarksProcessWorkbook
+from cis_benchmarks_registry import BenchmarkRegistry
+from cis_controls_manager import CISControlsLoadConfig, CISControlsProcessWorkbook
+from cache_management.compiled_cache import InMemoryCompiledCache, PickleCompiledCache
+from config_management.loaders import JSONConfigLoader
+from workbook_management.interfaces import IWorkbookLoader
+from workbook_management.loaders import OpenPyXLReadOnlyWorkbookLoader
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+COMMANDS_PATH = 'config/audit_commands.json'
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class FailingWorkbookLoader(IWorkbookLoader):
+    def load(self, path: str):
+        raise AssertionError(f'Workbook "{path}" should have been served from the compiled cache.')
+
+
+class TestBenchmarkRegistry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        config_loader = JSONConfigLoader()
+        cls.workbook_loader = OpenPyXLReadOnlyWorkbookLoader()
+        cls.benchmarks_config = CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=config_loader)
+        cls.commands_loader = CISAuditLoadCommands(commands_path=COMMANDS_PATH, commands_loader=config_loader)
+        controls_config = CISControlsLoadConfig(config_path=CONFIG_PATH, config_loader=config_loader)
+        cls.cis_controls = CISControlsProcessWorkbook(workbook_loader=cls.workbook_loader,
+                                                      workbook_path=controls_config.controls_path,
+                                                      controls_config=controls_config).get_all_controls()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_registry(self, *, workbook_loader: IWorkbookLoader = None, compiled_cache=None, max_workers=None):
+        return BenchmarkRegistry(workbook_loader=workbook_loader or self.workbook_loader,
+                                 benchmarks_config=self.benchmarks_config, cis_controls=self.cis_controls,
+                                 commands_loader=self.commands_loader, compiled_cache=compiled_cache,
+                                 max_workers=max_workers)
+
+    def test_all_os_versions_are_loaded(self):
+        registry = self.create_registry(max_workers=2)
+        self.assertEqual(list(self.benchmarks_config.workbooks_os_mapping), registry.os_versions)
+        for os_version in registry.os_versions:
+            self.assertEqual(os_version, registry.get_benchmark(os_version).os_version)
+            self.assertTrue(registry.get_all_levels_recommendations(os_version))
+
+    def test_parallel_and_in_process_parsing_match(self):
+        parallel_registry = self.create_registry(max_workers=2)
+        in_process_registry = self.create_registry(max_workers=1)
+        for os_version in parallel_registry.os_versions:
+            self.assertEqual(in_process_registry.get_all_levels_recommendations(os_version),
+                             parallel_registry.get_all_levels_recommendations(os_version))
+
+    def test_cis_controls_are_shared(self):
+        registry = self.create_registry(max_workers=1)
+        controls_by_safeguard = {control.safeguard_id: control for control in self.cis_controls}
+        for os_version in registry.os_versions:
+            for recommendation in registry.get_all_levels_recommendations(os_version):
+                if recommendation.cis_control is not None:
+                    self.assertIs(controls_by_safeguard[recommendation.safeguard_id], recommendation.cis_control)
+
+    def test_audit_commands_are_shared(self):
+        registry = self.create_registry(max_workers=1)
+        benchmark = registry.get_benchmark('MacOS Ventura')
+        audit_commands = self.commands_loader.get_os_audit_commands('MacOS Ventura')
+        for recommendation in benchmark.get_all_levels_recommendations():
+            if recommendation.audit_cmd is not None:
+                self.assertIs(audit_commands[recommendation.recommend_id], recommendation.audit_cmd)
+        self.assertEqual(frozenset(), benchmark.audit_command_coverage.unmatched_command_ids)
+
+    def test_warm_compiled_cache_skips_parsing(self):
+        compiled_cache = PickleCompiledCache(self.temp_dir.name)
+        self.create_registry(compiled_cache=compiled_cache, max_workers=1)
+        registry = self.create_registry(workbook_loader=FailingWorkbookLoader(), compiled_cache=compiled_cache)
+        self.assertEqual(list(self.benchmarks_config.workbooks_os_mapping), registry.os_versions)
+
+    def test_compiled_cache_does_not_keep_audit_commands(self):
+        with open(COMMANDS_PATH) as commands_file:
+            commands = json.load(commands_file)
+        commands['MacOS Ventura'] = [command for command in commands['MacOS Ventura']
+                                     if command['recommend_id'] != '1.1']
+        commands_path = os.path.join(self.temp_dir.name, 'audit_commands.json')
+        with open(commands_path, 'w') as commands_file:
+            json.dump(commands, commands_file)
+        commands_loader = CISAuditLoadCommands(commands_path=commands_path, commands_loader=JSONConfigLoader())
+        for max_workers in (1, 2):
+            with self.subTest(max_workers=max_workers), tempfile.TemporaryDirectory() as cache_dir:
+                compiled_cache = PickleCompiledCache(cache_dir)
+                self.create_registry(compiled_cache=compiled_cache, max_workers=max_workers)
+                registry = BenchmarkRegistry(workbook_loader=FailingWorkbookLoader(),
+                                             benchmarks_config=self.benchmarks_config, cis_controls=[],
+                                             commands_loader=commands_loader, compiled_cache=compiled_cache)
+                recommendation = registry.get_recommendation_by_id('MacOS Ventura', recommendation_id='1.1')
+                self.assertIsNone(recommendation.audit_cmd)
+                self.assertIsNone(recommendation.cis_control)
+
+    def test_processors_from_memory_do_not_share_recommendations(self):
+        compiled_cache = InMemoryCompiledCache()
+        workbook_path = self.benchmarks_config.workbooks_os_mapping['MacOS Ventura']
+        processors = [CISBenchmarksProcessWorkbook(workbook_loader=workbook_loader, workbook_path=workbook_path,
+                                                   benchmarks_config=self.benchmarks_config,
+                                                   cis_controls=self.cis_controls,
+                                                   commands_loader=self.commands_loader, compiled_cache=compiled_cache)
+                      for workbook_loader in (self.workbook_loader, FailingWorkbookLoader(), FailingWorkbookLoader())]
+        first, second, third = (processor.get_recommendation_by_id(recommendation_id='1.1')
+                                for processor in processors)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertIsNot(second, third)
+        second.compliant = True
+        self.assertIsNone(third.compliant)
+        self.assertIsNone(first.compliant)
+
+    def test_delegating_lookups(self):
+        registry = self.create_registry(max_workers=1)
+        os_version = registry.os_versions[0]
+        recommendations = registry.get_recommendations_by_level(os_version, scope_level=1)
+        recommendation = recommendations[0]
+        self.assertIs(recommendation, registry.get_recommendation_by_id(
+            os_version, scope_level=1, recommendation_id=recommendation.recommend_id))
+        self.assertEqual(registry.get_benchmark(os_version).get_recommendation_headers_by_level(scope_level=1),
+                         registry.get_recommendation_headers_by_level(os_version))
+
+    def test_unknown_os_version(self):
+        registry = self.create_registry(max_workers=1)
+        with self.assertRaises(KeyError):
+            registry.get_benchmark('MacOS Unknown')
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            self.create_registry(max_workers=0)
+
+
+if __name__ == '__main__':
+    run_tests(TestBenchmarkRegistry)
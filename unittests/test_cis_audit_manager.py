@@ -0,0 +1,197 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from cis_audit_manager import CISAuditLoadCommands, CISAuditRunner, CISAuditPlan
+from config_management.loaders import JSONConfigLoader
+from command_management.command_executors import SubprocessCommandExecutor
+from data_models.data_models import AuditCmd, Recommendation
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+def create_recommendation(recommend_id, command=None, expected_output='ok', timeout=None, ttl=None):
+    recommendation = Recommendation(recommend_id=recommend_id, level=1, title=f'Title {recommend_id}',
+                                    rationale='Rationale Statement', impact='Impact Statement', safeguard_id='4.1',
+                                    assessment_method='Automated')
+    if command:
+        recommendation.audit_cmd = AuditCmd(recommend_id=recommend_id, level='Level 1', title=f'Title {recommend_id}',
+                                            command=command, expected_output=expected_output, timeout=timeout,
+                                            ttl=ttl)
+    return recommendation
+
+
+class TestCISAuditRunner(unittest.TestCase):
+    def setUp(self):
+        self.recommendations = [
+            create_recommendation('1.1', 'sleep 0.2; echo ok'),
+            create_recommendation('1.2', 'echo ok'),
+            create_recommendation('1.3'),
+            create_recommendation('1.4', 'echo nok'),
+        ]
+
+    def test_sequential_evaluation(self):
+        runner = CISAuditRunner()
+        audited = list(runner.evaluate_recommendations_compliance(self.recommendations))
+        self.assertEqual(['1.1', '1.2', '1.4'], [recommendation.recommend_id for recommendation in audited])
+        self.assertEqual([True, True, False], [recommendation.compliant for recommendation in audited])
+
+    def test_concurrent_evaluation_keeps_order(self):
+        runner = CISAuditRunner(max_workers=3)
+        audited = list(runner.evaluate_recommendations_compliance(self.recommendations))
+        self.assertEqual(['1.1', '1.2', '1.4'], [recommendation.recommend_id for recommendation in audited])
+        self.assertEqual([True, True, False], [recommendation.compliant for recommendation in audited])
+
+    def test_concurrent_evaluation_completion_order(self):
+        runner = CISAuditRunner(max_workers=3)
+        audited = list(runner.evaluate_recommendations_compliance(self.recommendations, completion_order=True))
+        self.assertEqual({'1.1', '1.2', '1.4'}, {recommendation.recommend_id for recommendation in audited})
+        self.assertEqual('1.1', audited[-1].recommend_id)
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            CISAuditRunner(max_workers=0)
+        with self.assertRaises(TypeError):
+            CISAuditRunner(max_workers='2')
+
+
+class TestCISAuditRunnerTimeouts(unittest.TestCase):
+    def test_command_timeout(self):
+        recommendations = [create_recommendation('1.1', 'sleep 5; echo ok'), create_recommendation('1.2', 'echo ok')]
+        runner = CISAuditRunner(command_timeout=0.2)
+        started = time.monotonic()
+        audited = list(runner.evaluate_recommendations_compliance(recommendations))
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual([True, False], [recommendation.timed_out for recommendation in audited])
+        self.assertEqual([False, True], [recommendation.compliant is True for recommendation in audited])
+
+    def test_command_timeout_override(self):
+        recommendations = [create_recommendation('1.1', 'sleep 0.5; echo ok', timeout=2)]
+        audited = list(CISAuditRunner(command_timeout=0.2).evaluate_recommendations_compliance(recommendations))
+        self.assertFalse(audited[0].timed_out)
+        self.assertTrue(audited[0].compliant)
+
+    def test_run_timeout(self):
+        recommendations = [create_recommendation('1.1', 'sleep 5; echo ok'), create_recommendation('1.2', 'echo ok'),
+                           create_recommendation('1.3', 'sleep 5; echo nok')]
+        for max_workers in (1, 2):
+            runner = CISAuditRunner(max_workers=max_workers, run_timeout=0.3)
+            started = time.monotonic()
+            audited = list(runner.evaluate_recommendations_compliance(recommendations))
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertTrue(audited[0].timed_out)
+            self.assertTrue(audited[2].timed_out)
+
+    def test_invalid_timeouts(self):
+        with self.assertRaises(ValueError):
+            CISAuditRunner(command_timeout=0)
+        with self.assertRaises(TypeError):
+            CISAuditRunner(run_timeout='10')
+        with self.assertRaises(ValueError):
+            CISAuditPlan([create_recommendation('1.1', 'echo ok', timeout=-1)]).get_command_timeout('echo ok')
+
+
+class TestCISAuditPlan(unittest.TestCase):
+    def setUp(self):
+        self.recommendations = [
+            create_recommendation('1.1', 'echo ok'),
+            create_recommendation('1.2', 'echo nok'),
+            create_recommendation('1.1', ' echo ok'),
+            create_recommendation('1.3', 'echo ok', expected_output='nok'),
+            create_recommendation('1.4'),
+        ]
+
+    def test_groups_recommendations_by_command(self):
+        audit_plan = CISAuditPlan(self.recommendations)
+        self.assertEqual(['echo ok', 'echo nok'], audit_plan.commands)
+        self.assertEqual(4, len(audit_plan.recommendations))
+        self.assertEqual(3, len(audit_plan.get_recommendations_by_command('echo ok')))
+        self.assertEqual(2, audit_plan.saved_executions)
+
+    def test_executed_commands_exclude_reused_results(self):
+        audit_plan = CISAuditPlan(self.recommendations)
+        self.assertEqual(['echo ok', 'echo nok'], audit_plan.get_executed_commands())
+        self.recommendations[1].result_reused = True
+        self.recommendations[0].result_reused = True
+        self.assertEqual(['echo ok'], audit_plan.get_executed_commands())
+        for recommendation in audit_plan.get_recommendations_by_command('echo ok'):
+            recommendation.result_reused = True
+        self.assertEqual([], audit_plan.get_executed_commands())
+
+    def test_unknown_command(self):
+        with self.assertRaises(KeyError):
+            CISAuditPlan(self.recommendations).get_recommendations_by_command('echo missing')
+
+    def test_runner_executes_each_command_once(self):
+        executed_commands = []
+
+        class RecordingCommandExecutor(SubprocessCommandExecutor):
+            def execute(self, command, timeout=None):
+                executed_commands.append(command)
+                return super().execute(command, timeout)
+
+        for max_workers in (1, 2):
+            executed_commands.clear()
+            runner = CISAuditRunner(max_workers=max_workers, command_executor=RecordingCommandExecutor())
+            audited = list(runner.evaluate_recommendations_compliance(self.recommendations))
+            self.assertEqual(['echo nok', 'echo ok'], sorted(executed_commands))
+            self.assertEqual(['1.1', '1.2', '1.1', '1.3'], [recommendation.recommend_id for recommendation in audited])
+            self.assertEqual([True, False, True, False], [recommendation.compliant for recommendation in audited])
+            self.assertEqual(2, runner.last_audit_plan.saved_executions)
+
+
+class TestCISAuditLoadCommands(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.commands = [{'recommend_id': '1.1', 'level': 'Level 1', 'title': 'Title 1.1', 'command': 'echo ok',
+                          'expected_output': 'ok', 'ttl': 60},
+                         {'recommend_id': '1.2', 'level': 'Level 1', 'title': 'Title 1.2', 'command': 'echo ok',
+                          'expected_output': 'ok'}]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def load_commands(self, commands) -> CISAuditLoadCommands:
+        path = os.path.join(self.temp_dir.name, 'audit_commands.json')
+        with open(path, 'w') as commands_file:
+            json.dump({'MacOS Ventura': commands, 'MacOS Sonoma': []}, commands_file)
+        return CISAuditLoadCommands(commands_path=path, commands_loader=JSONConfigLoader())
+
+    def test_audit_commands_are_indexed_once(self):
+        commands_loader = self.load_commands(self.commands)
+        audit_commands = commands_loader.get_os_audit_commands('MacOS Ventura')
+        self.assertEqual(AuditCmd(**self.commands[0]), audit_commands['1.1'])
+        self.assertIs(audit_commands, commands_loader.get_os_audit_commands('MacOS Ventura'))
+        self.assertEqual({}, dict(commands_loader.get_os_audit_commands('MacOS Sonoma')))
+        with self.assertRaises(TypeError):
+            audit_commands['1.3'] = audit_commands['1.1']
+        with self.assertRaises(ValueError):
+            commands_loader.get_os_audit_commands('MacOS Unknown')
+
+    def test_invalid_audit_commands(self):
+        invalid_commands = [dict(self.commands[0], expected_output=''),
+                            dict(self.commands[0], unknown='value'),
+                            dict(self.commands[0], timeout='60'),
+                            {key: value for key, value in self.commands[0].items() if key != 'command'}]
+        for command in invalid_commands:
+            with self.subTest(command=command), self.assertRaisesRegex(ValueError, 'MacOS Ventura'):
+                self.load_commands([command])
+        with self.assertRaisesRegex(ValueError, 'Duplicate'):
+            self.load_commands([self.commands[0], self.commands[0]])
+
+    def test_audit_command_coverage(self):
+        coverage = self.load_commands(self.commands).get_audit_command_coverage('MacOS Ventura', ['1.2', '1.3'])
+        self.assertEqual(frozenset({'1.1'}), coverage.unmatched_command_ids)
+        self.assertEqual(frozenset({'1.3'}), coverage.uncovered_recommend_ids)
+
+
+if __name__ == '__main__':
+    run_tests(TestCISAuditRunner)
+    run_tests(TestCISAuditRunnerTimeouts)
+    run_tests(TestCISAuditPlan)
+    run_tests(TestCISAuditLoadCommands)
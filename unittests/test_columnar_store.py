@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+from data_models.data_models import CISControl
+from result_management.aggregation import UNMAPPED_LABEL
+from result_management.columnar_store import ColumnarResultStore, ResultStatus
+from unittests.test_cis_audit_manager import create_recommendation
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+def create_mapped_recommendation(recommend_id, domain):
+    recommendation = create_recommendation(recommend_id, 'echo ok')
+    if domain:
+        recommendation.cis_control = CISControl(safeguard_id='4.1', asset_type='Devices', domain=domain,
+                                                title='Title', description='Description')
+    return recommendation
+
+
+class TestColumnarResultStore(unittest.TestCase):
+    def setUp(self):
+        self.recommendations = [create_mapped_recommendation('1.1', 'Protect'),
+                                create_mapped_recommendation('1.2', 'Protect'),
+                                create_mapped_recommendation('1.3', 'Detect'),
+                                create_mapped_recommendation('1.4', None)]
+        self.store = ColumnarResultStore(self.recommendations, initial_host_capacity=1)
+
+    def record(self, host, compliant_values):
+        for recommendation, compliant in zip(self.recommendations, compliant_values):
+            self.store.record_result(host, recommendation, compliant)
+
+    def test_results_are_kept_per_host(self):
+        self.record('host-1', [True, False, 'error', None])
+        self.record('host-2', [False, True, True, True])
+        self.assertEqual(['host-1', 'host-2'], self.store.hosts)
+        self.assertEqual(ResultStatus.ERROR, self.store.get_status('host-1', self.recommendations[2]))
+        self.assertEqual(ResultStatus.COMPLIANT, self.store.get_status('host-2', self.recommendations[2]))
+        self.assertIsNone(self.recommendations[0].compliant)
+        np.testing.assert_array_equal([1, 2, 3, 0], self.store.get_host_statuses('host-1'))
+
+    def test_pass_rates_by_group(self):
+        self.record('host-1', [True, False, 'error', None])
+        self.record('host-2', [True, True, True, True])
+        self.assertEqual({'Protect': (3, 4), 'Detect': (1, 2), UNMAPPED_LABEL: (1, 1)},
+                         self.store.get_group_counts('domain'))
+        self.assertEqual({'Protect': 0.75, 'Detect': 0.5, UNMAPPED_LABEL: 1.0}, self.store.get_pass_rates('domain'))
+        self.assertEqual({'Protect': 0.5, 'Detect': 0.0}, self.store.get_pass_rates('domain', hosts=['host-1']))
+        self.assertEqual({1: 5 / 7}, self.store.get_pass_rates('level'))
+        self.assertEqual({'host-1': 1 / 3, 'host-2': 1.0}, self.store.get_host_pass_rates())
+
+    def test_record_audited_recommendations(self):
+        for recommendation, compliant in zip(self.recommendations, [True, False, True, 'error']):
+            recommendation.compliant = compliant
+        self.recommendations[2].timed_out = True
+        self.store.record_recommendations('host-1', self.recommendations)
+        np.testing.assert_array_equal([1, 2, 4, 3], self.store.get_host_statuses('host-1'))
+
+    def test_unknown_keys(self):
+        with self.assertRaises(KeyError):
+            self.store.get_status('host-1', self.recommendations[0])
+        with self.assertRaises(KeyError):
+            self.store.record_result('host-1', create_recommendation('9.9'), True)
+        with self.assertRaises(ValueError):
+            self.store.get_pass_rates('title')
+
+
+if __name__ == '__main__':
+    run_tests(TestColumnarResultStore)
@@ -0,0 +1,124 @@
+import os
+import pty
+import sys
+import time
+import unittest
+from cis_audit_manager import CISAuditRunner
+from command_management.command_executors import (BatchedShellCommandExecutor, MISSING_OUTPUT_MESSAGE,
+                                                  RecordedOutputCommandExecutor, SubprocessCommandExecutor,
+                                                  create_command_output, uses_sudo)
+from unittests.test_cis_audit_manager import create_recommendation
+
+HEREDOC_COMMAND = "cat << EOS\nok\nEOS"
+# Opening /dev/tty fails without a controlling terminal, as a sudo password prompt does.
+TTY_COMMAND = '(: </dev/tty) && echo tty-ok'
+TTY_SCRIPT = f'''
+from command_management.command_executors import BatchedShellCommandExecutor, SubprocessCommandExecutor
+for executor in (SubprocessCommandExecutor(), BatchedShellCommandExecutor()):
+    print(executor.execute({TTY_COMMAND!r}, timeout=5).stdout[0])
+    executor.close()
+'''
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestBatchedShellCommandExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = BatchedShellCommandExecutor()
+
+    def tearDown(self):
+        self.executor.close()
+
+    def test_outputs_match_subprocess_executor(self):
+        commands = ['echo ok', 'printf "a\\nb\\n"', 'echo error >&2; exit 3', HEREDOC_COMMAND, 'cd /; exit 1', 'pwd',
+                    'read line; echo "stdin: $line"']
+        subprocess_executor = SubprocessCommandExecutor()
+        for command in commands:
+            expected = subprocess_executor.execute(command)
+            actual = self.executor.execute(command)
+            self.assertEqual(expected.return_code, actual.return_code, command)
+            self.assertEqual(expected.stderr, actual.stderr, command)
+            self.assertEqual([line for line in expected.stdout if line], [line for line in actual.stdout if line],
+                             command)
+        self.assertEqual(1, self.executor.started_sessions)
+        self.assertEqual(len(commands), self.executor.executed_commands)
+
+    def test_timeout_restarts_session(self):
+        started = time.monotonic()
+        output = self.executor.execute('echo partial; sleep 5', timeout=0.3)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertTrue(output.timed_out)
+        self.assertIsNone(output.return_code)
+        self.assertEqual(['ok', ''], self.executor.execute('echo ok').stdout)
+        self.assertEqual(2, self.executor.started_sessions)
+
+    def test_concurrent_audit(self):
+        recommendations = [create_recommendation(f'1.{index}', f'sleep 0.1; echo {index}', expected_output=str(index))
+                           for index in range(6)]
+        runner = CISAuditRunner(max_workers=3, command_executor=self.executor)
+        audited = list(runner.evaluate_recommendations_compliance(recommendations))
+        self.assertTrue(all(recommendation.compliant is True for recommendation in audited))
+        self.assertLessEqual(self.executor.started_sessions, 3)
+
+
+class TestRecordedOutputCommandExecutor(unittest.TestCase):
+    def test_create_command_output(self):
+        command_output = create_command_output(stdout='ok\n', stderr='', return_code=0)
+        self.assertEqual((['ok', ''], [''], 0, False), command_output[:4])
+        with self.assertRaises(TypeError):
+            create_command_output(stdout=b'ok')
+        with self.assertRaises(TypeError):
+            create_command_output(return_code='0')
+
+    def test_recorded_outputs_are_evaluated(self):
+        executor = RecordedOutputCommandExecutor({' echo ok ': create_command_output(stdout='ok')})
+        recommendations = [create_recommendation('1.1', 'echo ok'), create_recommendation('1.2', 'echo missing')]
+        audit_runner = CISAuditRunner(command_executor=executor)
+        evaluated = list(audit_runner.evaluate_recommendations_compliance(recommendations))
+        self.assertEqual([True, MISSING_OUTPUT_MESSAGE], [recommendation.compliant for recommendation in evaluated])
+
+
+class TestControllingTerminal(unittest.TestCase):
+    def run_with_terminal(self, script: str) -> str:
+        pid, master_fd = pty.fork()
+        if pid == 0:
+            os.execv(sys.executable, [sys.executable, '-c', script])
+        output = b''
+        try:
+            while True:
+                try:
+                    chunk = os.read(master_fd, 1024)
+                except OSError:
+                    break
+                if not chunk:
+                    break
+                output += chunk
+        finally:
+            os.close(master_fd)
+            os.waitpid(pid, 0)
+        return output.decode('UTF-8', errors='replace')
+
+    def test_commands_keep_the_controlling_terminal(self):
+        output = self.run_with_terminal(f'import sys; sys.path.insert(0, {os.getcwd()!r})\n{TTY_SCRIPT}')
+        self.assertEqual(['tty-ok', 'tty-ok'], output.split(), output)
+
+    def test_timeout_kills_the_process_group(self):
+        started = time.monotonic()
+        output = SubprocessCommandExecutor().execute('sleep 5 & sleep 5; wait', timeout=0.2)
+        self.assertTrue(output.timed_out)
+        self.assertLess(time.monotonic() - started, 3)
+
+    def test_uses_sudo(self):
+        self.assertTrue(uses_sudo('/usr/bin/sudo /usr/bin/fdesetup status'))
+        self.assertTrue(uses_sudo('launchctl list | sudo grep x'))
+        self.assertFalse(uses_sudo('/usr/bin/defaults read com.apple.sudoers'))
+
+
+if __name__ == '__main__':
+    run_tests(TestBatchedShellCommandExecutor)
+    run_tests(TestRecordedOutputCommandExecutor)
+    run_tests(TestControllingTerminal)
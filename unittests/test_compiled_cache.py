@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+from cache_management.compiled_cache import InMemoryCompiledCache, PickleCompiledCache
+from data_models.data_models import CISControl
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestPickleCompiledCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.temp_dir.name, 'source.xlsx')
+        with open(self.source_path, 'wb') as source_file:
+            source_file.write(b'workbook contents')
+        self.cache = PickleCompiledCache(os.path.join(self.temp_dir.name, 'cache'))
+        self.payload = [CISControl(safeguard_id='1.1', asset_type='Devices', domain='Identify',
+                                   title='CISControl Title', description='CISControl Description')]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_load_without_store(self):
+        self.assertIsNone(self.cache.load(self.source_path, 'config-digest'))
+
+    def test_store_and_load(self):
+        self.cache.store(self.source_path, 'config-digest', self.payload)
+        self.assertEqual(self.payload, self.cache.load(self.source_path, 'config-digest'))
+
+    def test_config_change_invalidates_cache(self):
+        self.cache.store(self.source_path, 'config-digest', self.payload)
+        self.assertIsNone(self.cache.load(self.source_path, 'other-config-digest'))
+
+    def test_source_change_invalidates_cache(self):
+        self.cache.store(self.source_path, 'config-digest', self.payload)
+        with open(self.source_path, 'ab') as source_file:
+            source_file.write(b' changed')
+        self.assertIsNone(self.cache.load(self.source_path, 'config-digest'))
+
+    def test_corrupted_cache_file_is_ignored(self):
+        self.cache.store(self.source_path, 'config-digest', self.payload)
+        cache_file_path = self.cache._get_cache_file_path(self.source_path)
+        with open(cache_file_path, 'wb') as cache_file:
+            cache_file.write(b'not a pickle')
+        self.assertIsNone(self.cache.load(self.source_path, 'config-digest'))
+
+    def test_invalid_cache_dir(self):
+        with self.assertRaises(TypeError):
+            PickleCompiledCache('')
+
+
+class TestInMemoryCompiledCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.temp_dir.name, 'source.xlsx')
+        with open(self.source_path, 'wb') as source_file:
+            source_file.write(b'workbook contents')
+        self.fallback = PickleCompiledCache(os.path.join(self.temp_dir.name, 'cache'))
+        self.payload = ['compiled payload']
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_store_and_load_without_fallback(self):
+        cache = InMemoryCompiledCache()
+        self.assertIsNone(cache.load(self.source_path, 'config-digest'))
+        cache.store(self.source_path, 'config-digest', self.payload)
+        self.assertEqual(self.payload, cache.load(self.source_path, 'config-digest'))
+        self.assertIsNone(cache.load(self.source_path, 'other-config-digest'))
+
+    def test_loads_return_copies_of_the_stored_payload(self):
+        cache = InMemoryCompiledCache()
+        cache.store(self.source_path, 'config-digest', self.payload)
+        self.payload.append('changed after store')
+        first_payload = cache.load(self.source_path, 'config-digest')
+        first_payload.append('changed after load')
+        self.assertEqual(['compiled payload'], cache.load(self.source_path, 'config-digest'))
+        self.assertIsNot(first_payload, cache.load(self.source_path, 'config-digest'))
+
+    def test_store_writes_through_to_fallback(self):
+        InMemoryCompiledCache(fallback=self.fallback).store(self.source_path, 'config-digest', self.payload)
+        self.assertEqual(self.payload, self.fallback.load(self.source_path, 'config-digest'))
+
+    def test_fallback_hit_is_memoized(self):
+        self.fallback.store(self.source_path, 'config-digest', self.payload)
+        cache = InMemoryCompiledCache(fallback=self.fallback)
+        first_payload = cache.load(self.source_path, 'config-digest')
+        self.assertEqual(self.payload, first_payload)
+        shutil.rmtree(os.path.join(self.temp_dir.name, 'cache'))
+        self.assertEqual(first_payload, cache.load(self.source_path, 'config-digest'))
+
+    def test_invalid_fallback(self):
+        with self.assertRaises(TypeError):
+            InMemoryCompiledCache(fallback='cache')
+
+
+if __name__ == '__main__':
+    run_tests(TestPickleCompiledCache)
+    run_tests(TestInMemoryCompiledCache)
@@ -0,0 +1,122 @@
+import dataclasses
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from config_management.loaders import JSONConfigLoader
+from cis_benchmarks_manager import CISBenchmarksLoadConfig
+from cis_controls_manager import CISControlsLoadConfig
+from cis_audit_manager import CISAuditLoadConfig
+from exceptions.custom_exceptions import MissingAttributeError
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestJSONConfigLoader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, 'config.json')
+        self.write_config({'key': 'value'})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_config(self, config):
+        with open(self.config_path, 'w') as config_file:
+            json.dump(config, config_file)
+
+    def test_load_is_cached_per_file(self):
+        loader = JSONConfigLoader()
+        self.assertIs(loader.load(self.config_path), loader.load(self.config_path))
+
+    def test_changed_file_is_reloaded(self):
+        loader = JSONConfigLoader()
+        self.assertEqual({'key': 'value'}, loader.load(self.config_path))
+        self.write_config({'key': 'new value', 'other_key': 'other value'})
+        self.assertEqual({'key': 'new value', 'other_key': 'other value'}, loader.load(self.config_path))
+
+    def test_invalid_json(self):
+        with open(self.config_path, 'w') as config_file:
+            config_file.write('{invalid')
+        with self.assertRaises(ValueError):
+            JSONConfigLoader().load(self.config_path)
+
+
+class TestConfigSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_config_file_is_parsed_once_for_all_configs(self):
+        loader = JSONConfigLoader()
+        with mock.patch('config_management.loaders.json.load', wraps=json.load) as json_load:
+            CISAuditLoadConfig(config_path=CONFIG_PATH, config_loader=loader)
+            CISControlsLoadConfig(config_path=CONFIG_PATH, config_loader=loader)
+            CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=loader)
+        self.assertEqual(1, json_load.call_count)
+
+    def test_snapshot_collections_are_read_only(self):
+        loader = JSONConfigLoader()
+        benchmarks_config = CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=loader)
+        for mapping in (benchmarks_config.workbooks_os_mapping, benchmarks_config.os_versions_mapping,
+                        benchmarks_config.allowed_scope_levels):
+            with self.assertRaises(TypeError):
+                mapping['MacOS Unknown'] = 'unknown.xlsx'
+        self.assertIsInstance(benchmarks_config.allowed_assessment_methods, tuple)
+        loader.load(CONFIG_PATH)['CISBenchmarksConfig']['WORKBOOKS_OS_MAPPING']['MacOS Unknown'] = 'unknown.xlsx'
+        self.assertNotIn('MacOS Unknown', benchmarks_config.workbooks_os_mapping)
+
+    def test_derived_values_are_precomputed(self):
+        benchmarks_config = CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=JSONConfigLoader())
+        self.assertEqual({1: 'Level 1', 2: 'Level 2'}, benchmarks_config.allowed_scope_levels)
+        self.assertIs(benchmarks_config.required_columns, benchmarks_config.required_columns)
+        self.assertIsInstance(benchmarks_config.required_columns, frozenset)
+        self.assertIn('MacOS Ventura', benchmarks_config.allowed_os_versions)
+
+    def test_snapshot_is_immutable(self):
+        controls_config = CISControlsLoadConfig(config_path=CONFIG_PATH, config_loader=JSONConfigLoader())
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            controls_config._config.title = 'New Title'
+
+    def write_benchmarks_config(self, **overrides):
+        with open(CONFIG_PATH) as config_file:
+            config = json.load(config_file)
+        for key, value in overrides.items():
+            if value is None:
+                del config['CISBenchmarksConfig'][key]
+            else:
+                config['CISBenchmarksConfig'][key] = value
+        config_path = os.path.join(self.temp_dir.name, 'config.json')
+        with open(config_path, 'w') as config_file:
+            json.dump(config, config_file)
+        return config_path
+
+    def test_missing_property_is_reported_on_load(self):
+        config_path = self.write_benchmarks_config(SECTION=None)
+        with self.assertRaises(MissingAttributeError):
+            CISBenchmarksLoadConfig(config_path=config_path, config_loader=JSONConfigLoader())
+
+    def test_patterns_are_compiled_on_load(self):
+        benchmarks_config = CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=JSONConfigLoader())
+        self.assertEqual(['14'], benchmarks_config.os_version_pattern.findall('ProductVersion:  14.2.1'))
+        self.assertEqual('13', benchmarks_config.custom_os_version_pattern.search('CIS_Apple_macOS_13.0').group(1))
+        self.assertEqual(benchmarks_config.benchmark_profiles_rex, benchmarks_config.benchmark_profiles_pattern.pattern)
+
+    def test_invalid_pattern_is_reported_on_load(self):
+        config_path = self.write_benchmarks_config(OS_VERSION_REX='ProductVersion:(\\d+')
+        with self.assertRaises(ValueError):
+            CISBenchmarksLoadConfig(config_path=config_path, config_loader=JSONConfigLoader())
+
+
+if __name__ == '__main__':
+    run_tests(TestJSONConfigLoader)
+    run_tests(TestConfigSnapshots)
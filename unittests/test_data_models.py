@@ -1,4 +1,5 @@
 import dataclasses
+import pickle
 import unittest
 from data_models.data_models import Recommendation, RecommendHeader, CISControl, CISControlFamily
 
@@ -279,8 +280,58 @@ class TestCISControlFamily(unittest.TestCase):
         self.assertEqual(len(cis_control_family_set), 1)
 
 
+class TestTrustedConstruction(unittest.TestCase):
+    def setUp(self):
+        self.attributes = {'recommend_id': '1.1', 'level': 1, 'title': 'Title', 'rationale': 'Rationale Statement',
+                           'impact': 'Impact Statement', 'safeguard_id': '7.3', 'assessment_method': 'Automated'}
+
+    def test_trusted_instance_equals_validated_instance(self):
+        self.assertEqual(Recommendation(**self.attributes), Recommendation.from_trusted(**self.attributes))
+        header = RecommendHeader(recommend_id='1', level=1, title='Title', description='Description')
+        self.assertEqual(header, RecommendHeader.from_trusted(recommend_id='1', level=1, title='Title',
+                                                              description='Description'))
+
+    def test_trusted_construction_skips_validation(self):
+        self.attributes['level'] = '1'
+        self.assertEqual('1', Recommendation.from_trusted(**self.attributes).level)
+
+    def test_trusted_construction_checks_attribute_names(self):
+        with self.assertRaises(TypeError):
+            Recommendation.from_trusted(recommend_id='1.1')
+        with self.assertRaises(TypeError):
+            Recommendation.from_trusted(unknown='value', **self.attributes)
+
+    def test_trusted_frozen_instance_is_immutable(self):
+        cis_control_family = CISControlFamily.from_trusted(title='Title', description='Description')
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            cis_control_family.title = 'New Title'
+
+    def test_subclass_gets_its_own_instances(self):
+        @dataclasses.dataclass(kw_only=True, slots=True)
+        class HostRecommendation(Recommendation):
+            host: str = 'host-a'
+
+        recommendation = Recommendation.from_trusted(**self.attributes)
+        host_recommendation = HostRecommendation.from_trusted(host='host-b', **self.attributes)
+        self.assertIs(Recommendation, type(recommendation))
+        self.assertIs(HostRecommendation, type(host_recommendation))
+        self.assertEqual('host-b', host_recommendation.host)
+        self.assertIs(Recommendation, type(Recommendation.from_trusted(**self.attributes)))
+
+    def test_instances_are_slotted_and_picklable(self):
+        recommendation = Recommendation(**self.attributes)
+        cis_control = CISControl(safeguard_id='7.3', asset_type='Applications', domain='Protect', title='Title',
+                                 description='Description')
+        for instance in (recommendation, cis_control):
+            self.assertFalse(hasattr(instance, '__dict__'))
+            self.assertEqual(instance, pickle.loads(pickle.dumps(instance)))
+        with self.assertRaises(AttributeError):
+            recommendation.unknown = 'value'
+
+
 if __name__ == '__main__':
     run_tests(TestRecommendation)
     run_tests(TestRecommendHeader)
     run_tests(TestCISControl)
     run_tests(TestCISControlFamily)
+    run_tests(TestTrustedConstruction)
@@ -0,0 +1,52 @@
+import dataclasses
+import timeit
+import tracemalloc
+import unittest
+from data_models.data_models import Recommendation
+
+INSTANCE_COUNT = 10000
+
+RECOMMENDATION_ATTRIBUTES = {'recommend_id': '1.1', 'level': 1, 'title': 'Title', 'rationale': 'Rationale Statement',
+                             'impact': 'Impact Statement', 'safeguard_id': '7.3', 'assessment_method': 'Automated'}
+
+# The unslotted layout the data models had before, used as the baseline of the benchmark.
+UnslottedRecommendation = dataclasses.make_dataclass(
+    'UnslottedRecommendation', [(field.name, field.type, field) for field in dataclasses.fields(Recommendation)],
+    kw_only=True)
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+def measure_memory(factory) -> int:
+    tracemalloc.start()
+    instances = [factory(**RECOMMENDATION_ATTRIBUTES) for _ in range(INSTANCE_COUNT)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return allocated
+
+
+def measure_construction(factory) -> float:
+    return min(timeit.repeat(lambda: factory(**RECOMMENDATION_ATTRIBUTES), number=INSTANCE_COUNT, repeat=3))
+
+
+class TestDataModelsBenchmark(unittest.TestCase):
+    def test_memory(self):
+        unslotted_memory = measure_memory(UnslottedRecommendation)
+        slotted_memory = measure_memory(Recommendation)
+        self.assertLess(slotted_memory, unslotted_memory)
+
+    def test_construction(self):
+        validated_time = measure_construction(Recommendation)
+        trusted_time = measure_construction(Recommendation.from_trusted)
+        self.assertEqual(Recommendation(**RECOMMENDATION_ATTRIBUTES),
+                         Recommendation.from_trusted(**RECOMMENDATION_ATTRIBUTES))
+        self.assertLess(trusted_time, validated_time)
+
+
+if __name__ == '__main__':
+    run_tests(TestDataModelsBenchmark)
@@ -0,0 +1,209 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from cis_fleet_manager import CONNECTION_FAILED_MESSAGE, FleetAuditRunner
+from command_management.command_executors import create_command_output
+from command_management.interfaces import ICommandExecutor, ICommandTransport
+from command_management.transports import LocalCommandTransport, SSHCommandExecutor, SSHCommandTransport
+from result_management.columnar_store import ColumnarResultStore, ResultStatus
+from result_management.sinks import JSONLinesResultSink
+from unittests.test_cis_audit_manager import create_recommendation
+
+FAKE_SSH_SCRIPT = """#!/bin/sh
+while [ "$1" != "--" ]; do shift; done
+shift
+if [ "$1" = "host-down" ]; then
+    echo "ssh: connect to host host-down port 2222: Connection refused" >&2
+    exit 255
+fi
+shift
+[ $# -eq 0 ] && exit 0
+exec /bin/sh -c "$1"
+"""
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class CountingTransport(ICommandTransport):
+    def __init__(self, *, delay: float = 0.0, unreachable_hosts=()):
+        self.delay = delay
+        self.unreachable_hosts = set(unreachable_hosts)
+        self.lock = threading.Lock()
+        self.connections = {}
+        self.closed_connections = {}
+        self.running_commands = 0
+        self.max_running_commands = 0
+        self.running_hosts = set()
+        self.max_running_hosts = 0
+
+    def connect(self, host: str) -> ICommandExecutor:
+        if host in self.unreachable_hosts:
+            raise OSError(f'{host} is unreachable')
+        with self.lock:
+            self.connections[host] = self.connections.get(host, 0) + 1
+            self.running_hosts.add(host)
+            self.max_running_hosts = max(self.max_running_hosts, len(self.running_hosts))
+        return CountingCommandExecutor(self, host)
+
+    def close(self) -> None:
+        pass
+
+
+class CountingCommandExecutor(ICommandExecutor):
+    def __init__(self, transport: CountingTransport, host: str):
+        self.transport = transport
+        self.host = host
+
+    def execute(self, command: str, timeout: float = None):
+        with self.transport.lock:
+            self.transport.running_commands += 1
+            self.transport.max_running_commands = max(self.transport.max_running_commands,
+                                                      self.transport.running_commands)
+        time.sleep(self.transport.delay)
+        with self.transport.lock:
+            self.transport.running_commands -= 1
+        return create_command_output(stdout='ok' if self.host != 'host-nok' else 'nok')
+
+    def close(self) -> None:
+        with self.transport.lock:
+            self.transport.closed_connections[self.host] = self.transport.closed_connections.get(self.host, 0) + 1
+            self.transport.running_hosts.discard(self.host)
+
+
+class TestFleetAuditRunner(unittest.TestCase):
+    def setUp(self):
+        self.recommendations = [create_recommendation('1.1', 'echo 1.1'),
+                                create_recommendation('1.2', 'echo 1.2'),
+                                create_recommendation('1.3'),
+                                create_recommendation('1.4', 'echo 1.4')]
+        self.audited_recommendations = [recommendation for recommendation in self.recommendations
+                                        if recommendation.audit_cmd]
+
+    def test_results_are_aggregated_per_host(self):
+        result_store = ColumnarResultStore(self.audited_recommendations)
+        fleet_runner = FleetAuditRunner(transport=CountingTransport(), max_hosts=3, result_store=result_store)
+        host_results = list(fleet_runner.audit_hosts(['host-a', 'host-nok', 'host-b'], self.recommendations))
+        self.assertEqual(9, len(host_results))
+        self.assertEqual(['host-a', 'host-nok', 'host-b'], result_store.hosts)
+        self.assertEqual({'host-a': 1.0, 'host-nok': 0.0, 'host-b': 1.0}, result_store.get_host_pass_rates())
+        self.assertIsNone(self.recommendations[0].compliant)
+
+    def test_one_connection_per_host_is_reused_and_closed(self):
+        transport = CountingTransport()
+        fleet_runner = FleetAuditRunner(transport=transport, max_commands_per_host=2)
+        hosts = [f'host-{index}' for index in range(5)]
+        list(fleet_runner.audit_hosts(hosts + hosts[:2], self.recommendations))
+        self.assertEqual({host: 1 for host in hosts}, transport.connections)
+        self.assertEqual(transport.connections, transport.closed_connections)
+
+    def test_concurrency_is_bounded(self):
+        transport = CountingTransport(delay=0.05)
+        fleet_runner = FleetAuditRunner(transport=transport, max_hosts=4, max_commands=3, max_commands_per_host=2)
+        started = time.monotonic()
+        list(fleet_runner.audit_hosts([f'host-{index}' for index in range(8)], self.recommendations))
+        self.assertLessEqual(transport.max_running_hosts, 4)
+        self.assertEqual(3, transport.max_running_commands)
+        # 24 commands of 0.05s with 3 running at once take at least eight rounds, far fewer than 24.
+        self.assertLess(time.monotonic() - started, 24 * 0.05)
+
+    def test_unreachable_host_reports_error(self):
+        result_store = ColumnarResultStore(self.audited_recommendations)
+        fleet_runner = FleetAuditRunner(transport=CountingTransport(unreachable_hosts=['host-down']),
+                                        result_store=result_store)
+        host_results = [host_result for host_result in fleet_runner.audit_hosts(['host-a', 'host-down'],
+                                                                                 self.recommendations)
+                        if host_result.host == 'host-down']
+        self.assertEqual(3, len(host_results))
+        self.assertTrue(host_results[0].recommendation.compliant.startswith(CONNECTION_FAILED_MESSAGE))
+        self.assertEqual([ResultStatus.ERROR] * 3, list(result_store.get_host_statuses('host-down')))
+
+    def test_closing_the_results_stops_the_hosts(self):
+        transport = CountingTransport(delay=0.02)
+        fleet_runner = FleetAuditRunner(transport=transport, max_hosts=2)
+        host_results = fleet_runner.audit_hosts([f'host-{index}' for index in range(20)], self.recommendations)
+        next(host_results)
+        host_results.close()
+        self.assertLess(len(transport.connections), 20)
+        self.assertEqual(transport.connections, transport.closed_connections)
+
+    def test_local_transport_with_host_sinks(self):
+        stream = io.StringIO()
+        result_sink = JSONLinesResultSink(stream)
+        fleet_runner = FleetAuditRunner(transport=LocalCommandTransport(batched=True), max_hosts=2,
+                                        max_commands_per_host=2, result_sink_factory=result_sink.for_host)
+        recommendations = [create_recommendation('1.1', 'echo ok'), create_recommendation('1.2', 'echo nok')]
+        result_store = fleet_runner.audit_into_store(['host-a', 'host-b'], recommendations)
+        self.assertEqual({'host-a': 0.5, 'host-b': 0.5}, result_store.get_host_pass_rates())
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual({('host-a', '1.1'), ('host-a', '1.2'), ('host-b', '1.1'), ('host-b', '1.2')},
+                         {(record['host'], record['recommend_id']) for record in records})
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            FleetAuditRunner(transport=LocalCommandTransport(), result_store={})
+        with self.assertRaises(TypeError):
+            FleetAuditRunner(transport=None)
+        with self.assertRaises(ValueError):
+            FleetAuditRunner(transport=LocalCommandTransport(), max_commands=0)
+        with self.assertRaises(ValueError):
+            FleetAuditRunner(transport=LocalCommandTransport(), host_timeout=-1)
+
+
+class TestSSHCommandTransport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        # Stands in for ssh: the host 'host-down' refuses connections and other hosts run the remote command locally.
+        self.ssh_path = os.path.join(self.temp_dir.name, 'ssh')
+        with open(self.ssh_path, 'w') as ssh_file:
+            ssh_file.write(FAKE_SSH_SCRIPT)
+        os.chmod(self.ssh_path, 0o755)
+        self.transport = SSHCommandTransport(ssh_path=self.ssh_path, user='auditor', port=2222,
+                                             ssh_options=['StrictHostKeyChecking=yes'])
+
+    def tearDown(self):
+        self.transport.close()
+        self.temp_dir.cleanup()
+
+    def test_connections_are_multiplexed(self):
+        ssh_args = self.transport.ssh_args
+        self.assertIn('ControlMaster=auto', ssh_args)
+        self.assertIn('BatchMode=yes', ssh_args)
+        self.assertTrue(any(arg.startswith('ControlPath=') for arg in ssh_args))
+        self.assertEqual(['-l', 'auditor', '-p', '2222'], ssh_args[ssh_args.index('-l'):ssh_args.index('-p') + 2])
+
+    def test_remote_command_is_quoted(self):
+        executor = self.transport.connect('host-a')
+        self.assertIsInstance(executor, SSHCommandExecutor)
+        self.assertEqual("/bin/sh -c 'echo \"$HOME\" | grep '\"'\"'x'\"'\"''",
+                         executor._get_remote_command('echo "$HOME" | grep \'x\''))
+        self.assertEqual(['x y'], executor.execute("echo 'x y'").stdout[:1])
+        executor.close()
+
+    def test_unreachable_host_fails_on_connect(self):
+        with self.assertRaisesRegex(OSError, 'Connection refused'):
+            self.transport.connect('host-down')
+
+    def test_unreachable_host_reports_error_once(self):
+        recommendations = [create_recommendation('1.1', 'echo ok'), create_recommendation('1.2', 'echo ok')]
+        fleet_runner = FleetAuditRunner(transport=self.transport)
+        host_results = {(host_result.host, host_result.recommendation.recommend_id): host_result.recommendation
+                        for host_result in fleet_runner.audit_hosts(['host-a', 'host-down'], recommendations)}
+        self.assertTrue(host_results[('host-a', '1.1')].compliant)
+        self.assertTrue(host_results[('host-down', '1.2')].compliant.startswith(CONNECTION_FAILED_MESSAGE))
+
+    def test_invalid_hosts(self):
+        for host in ('', '-oProxyCommand=x', None):
+            with self.subTest(host=host), self.assertRaises(ValueError):
+                self.transport.connect(host)
+
+if __name__ == '__main__':
+    run_tests(TestFleetAuditRunner)
+    run_tests(TestSSHCommandTransport)
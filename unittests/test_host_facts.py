@@ -0,0 +1,140 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from data_models.data_models import HostFacts
+from exceptions.custom_exceptions import HostFactsError
+from host_management.host_facts import SwVersHostFactsProvider, StaticHostFactsProvider
+
+BOOT_TIME = 1697040000.0
+SW_VERS_OUTPUT = ['ProductName:\t\tmacOS', 'ProductVersion:\t\t13.4.1', 'BuildVersion:\t\t22F82', '']
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class StubSwVersHostFactsProvider(SwVersHostFactsProvider):
+    def __init__(self, *, persist_path: str = None, return_code: int = 0):
+        super().__init__(persist_path=persist_path)
+        self.return_code = return_code
+        self.sw_vers_calls = 0
+        self.boot_time_reads = 0
+
+    def _read_boot_time(self):
+        self.boot_time_reads += 1
+        return BOOT_TIME
+
+    def _run_sw_vers(self):
+        self.sw_vers_calls += 1
+        return SW_VERS_OUTPUT, ['sw_vers: error', ''], self.return_code
+
+
+class TestSwVersHostFactsProvider(unittest.TestCase):
+    def setUp(self):
+        SwVersHostFactsProvider._process_host_facts = None
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.persist_path = os.path.join(self.temp_dir.name, 'host_facts.json')
+
+    def tearDown(self):
+        SwVersHostFactsProvider._process_host_facts = None
+        self.temp_dir.cleanup()
+
+    def test_parses_sw_vers_output(self):
+        host_facts = StubSwVersHostFactsProvider().get_host_facts()
+        self.assertEqual('macOS', host_facts.product_name)
+        self.assertEqual('13.4.1', host_facts.product_version)
+        self.assertEqual('22F82', host_facts.build_version)
+
+    def test_sw_vers_runs_once_per_process(self):
+        provider = StubSwVersHostFactsProvider()
+        other_provider = StubSwVersHostFactsProvider()
+        self.assertIs(provider.get_host_facts(), other_provider.get_host_facts())
+        self.assertEqual(1, provider.sw_vers_calls)
+        self.assertEqual(0, other_provider.sw_vers_calls)
+
+    def test_failed_sw_vers(self):
+        with self.assertRaises(HostFactsError):
+            StubSwVersHostFactsProvider(return_code=1).get_host_facts()
+
+    def test_persisted_facts_are_reused_within_boot(self):
+        host_facts = StubSwVersHostFactsProvider(persist_path=self.persist_path).get_host_facts()
+        SwVersHostFactsProvider._process_host_facts = None
+        provider = StubSwVersHostFactsProvider(persist_path=self.persist_path)
+        self.assertEqual(host_facts, provider.get_host_facts())
+        self.assertEqual(0, provider.sw_vers_calls)
+
+    def test_persisted_facts_from_previous_boot_are_ignored(self):
+        StubSwVersHostFactsProvider(persist_path=self.persist_path).get_host_facts()
+        with open(self.persist_path) as persisted_file:
+            persisted = json.load(persisted_file)
+        persisted['boot_time'] -= 3600
+        with open(self.persist_path, 'w') as persisted_file:
+            json.dump(persisted, persisted_file)
+        SwVersHostFactsProvider._process_host_facts = None
+        provider = StubSwVersHostFactsProvider(persist_path=self.persist_path)
+        provider.get_host_facts()
+        self.assertEqual(1, provider.sw_vers_calls)
+
+    def test_boot_time_is_read_once_per_provider(self):
+        provider = StubSwVersHostFactsProvider(persist_path=self.persist_path)
+        provider.get_host_facts()
+        self.assertEqual(1, provider.boot_time_reads)
+        SwVersHostFactsProvider._process_host_facts = None
+        provider = StubSwVersHostFactsProvider(persist_path=self.persist_path)
+        provider.get_host_facts()
+        self.assertEqual((0, 1), (provider.sw_vers_calls, provider.boot_time_reads))
+
+    def test_reads_kern_boottime_in_process(self):
+        class FakeLibc:
+            def __init__(self, result):
+                self.result = result
+                self.names = []
+
+            def sysctlbyname(self, name, boot_time, size, new_value, new_size):
+                self.names.append(name)
+                boot_time._obj.tv_sec = int(BOOT_TIME)
+                return self.result
+
+        libc = FakeLibc(0)
+        self.assertEqual(BOOT_TIME, SwVersHostFactsProvider._read_kern_boottime(libc))
+        self.assertEqual([b'kern.boottime'], libc.names)
+        self.assertIsNone(SwVersHostFactsProvider._read_kern_boottime(FakeLibc(-1)))
+        self.assertIsNone(SwVersHostFactsProvider._read_kern_boottime(object()))
+
+    def test_boot_time_spawns_no_process(self):
+        with mock.patch('host_management.host_facts.subprocess.run') as run:
+            provider = SwVersHostFactsProvider()
+            self.assertEqual(provider._read_boot_time(), provider._read_boot_time())
+        run.assert_not_called()
+
+    def test_failed_persist_removes_temp_file(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch('host_management.host_facts.json.dump', side_effect=OSError('No space left on device')), \
+                contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            host_facts = StubSwVersHostFactsProvider(persist_path=self.persist_path).get_host_facts()
+        self.assertEqual('13.4.1', host_facts.product_version)
+        self.assertEqual('', stdout.getvalue())
+        self.assertIn('No space left on device', stderr.getvalue())
+        self.assertEqual([], os.listdir(self.temp_dir.name))
+
+
+class TestStaticHostFactsProvider(unittest.TestCase):
+    def test_returns_supplied_facts(self):
+        host_facts = HostFacts(hostname='host', architecture='arm64', product_name='macOS', product_version='14.1',
+                               build_version='23B74', sw_vers_output='ProductVersion:  14.1')
+        self.assertIs(host_facts, StaticHostFactsProvider(host_facts).get_host_facts())
+
+    def test_invalid_host_facts(self):
+        with self.assertRaises(TypeError):
+            StaticHostFactsProvider({'product_version': '14.1'})
+
+
+if __name__ == '__main__':
+    run_tests(TestSwVersHostFactsProvider)
+    run_tests(TestStaticHostFactsProvider)
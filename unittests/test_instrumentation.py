@@ -0,0 +1,57 @@
+import time
+import unittest
+from cis_audit_manager import CISAuditRunner
+from config_management.loaders import JSONConfigLoader
+from instrumentation_management.instrumentation import TimingCollector, add_hook, instrumented, remove_hook, timed
+from unittests.test_cis_audit_manager import create_recommendation
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.collector = TimingCollector()
+        add_hook(self.collector)
+
+    def tearDown(self):
+        remove_hook(self.collector)
+
+    def test_timed_and_instrumented(self):
+        @instrumented('phase.slow')
+        def slow_phase():
+            time.sleep(0.05)
+            return 'done'
+
+        self.assertEqual('done', slow_phase())
+        with timed('phase.fast', 'label'):
+            pass
+        timings = self.collector.get_timings()
+        self.assertEqual([('phase.slow', None, 1), ('phase.fast', 'label', 1)],
+                         [(timing.name, timing.label, timing.calls) for timing in timings])
+        self.assertGreaterEqual(timings[0].total, 0.05)
+        table_lines = self.collector.format_table().splitlines()
+        self.assertTrue(table_lines[1].startswith('phase.slow'))
+        self.assertTrue(table_lines[2].startswith('phase.fast [label]'))
+
+    def test_removed_hook_receives_nothing(self):
+        remove_hook(self.collector)
+        with timed('phase'):
+            pass
+        self.assertEqual([], self.collector.get_timings())
+
+    def test_repo_phases_are_instrumented(self):
+        JSONConfigLoader().load(CONFIG_PATH)
+        recommendations = [create_recommendation('1.1', 'echo ok'), create_recommendation('1.2', 'echo ok')]
+        list(CISAuditRunner().evaluate_recommendations_compliance(recommendations))
+        timings = {(timing.name, timing.label): timing.calls for timing in self.collector.get_timings()}
+        self.assertEqual({('config.load', None): 1, ('audit.command', '1.1,1.2'): 1}, timings)
+
+
+if __name__ == '__main__':
+    run_tests(TestInstrumentation)
@@ -0,0 +1,166 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from cis_audit_manager import CISAuditLoadCommands, CISAuditRunner
+from cis_offline_evaluator import CISOfflineEvaluator
+from command_management.command_executors import create_command_output
+from config_management.loaders import JSONConfigLoader
+from data_models.data_models import AuditCmd
+from matcher_management.matchers import compile_matcher
+from unittests.test_cis_audit_manager import create_recommendation
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+def matches(spec, stdout: str) -> bool:
+    return compile_matcher(spec).matches(stdout.split('\n'))
+
+
+class TestMatchers(unittest.TestCase):
+    def test_line(self):
+        self.assertTrue(matches({'type': 'line', 'value': 'enabled'}, 'status\n  enabled  \n'))
+        self.assertFalse(matches({'type': 'line', 'value': 'enabled'}, 'not enabled'))
+
+    def test_exact(self):
+        self.assertTrue(matches({'type': 'exact', 'value': 'a\nb'}, '\na\nb\n'))
+        self.assertFalse(matches({'type': 'exact', 'value': 'a'}, 'a\nb'))
+        self.assertTrue(matches({'type': 'exact', 'value': 'TRUE', 'ignore_case': True}, 'true'))
+
+    def test_regex(self):
+        self.assertTrue(matches({'type': 'regex', 'pattern': r'^flags:.*\blo\b'}, 'dir:/var\nflags:lo,aa'))
+        self.assertFalse(matches({'type': 'regex', 'pattern': 'Enabled'}, 'enabled'))
+        self.assertTrue(matches({'type': 'regex', 'pattern': 'Enabled', 'ignore_case': True}, 'enabled'))
+
+    def test_int(self):
+        self.assertTrue(matches({'type': 'int', 'operator': '>=', 'value': 15}, '15'))
+        self.assertFalse(matches({'type': 'int', 'operator': '>=', 'value': 15}, '14'))
+        self.assertTrue(matches({'type': 'int', 'operator': '<=', 'value': 270}, 'offset -12 +/- 0.1'))
+        self.assertTrue(matches({'type': 'int', 'operator': '==', 'value': 5, 'pattern': r'maxFailed=(\d+)'},
+                                'minLength=15 maxFailed=5'))
+        self.assertFalse(matches({'type': 'int', 'operator': '==', 'value': 0}, 'no number'))
+
+    def test_set_membership(self):
+        self.assertTrue(matches({'type': 'in', 'values': ['0', 'false']}, 'false'))
+        self.assertFalse(matches({'type': 'in', 'values': ['0', 'false']}, 'true'))
+
+    def test_json_path(self):
+        output = json.dumps({'policies': [{'name': 'minLength', 'value': 15, 'enabled': True}]})
+        self.assertTrue(matches({'type': 'json_path', 'path': '$.policies[0].value',
+                                 'matcher': {'type': 'int', 'operator': '>=', 'value': 15}}, output))
+        self.assertTrue(matches({'type': 'json_path', 'path': "$.policies[0]['enabled']",
+                                 'matcher': {'type': 'exact', 'value': 'true'}}, output))
+        self.assertFalse(matches({'type': 'json_path', 'path': '$.policies[1].value',
+                                  'matcher': {'type': 'exact', 'value': '15'}}, output))
+        self.assertFalse(matches({'type': 'json_path', 'path': '$.value',
+                                  'matcher': {'type': 'exact', 'value': '15'}}, 'not json'))
+
+    def test_composition(self):
+        self.assertTrue(matches({'type': 'not', 'matcher': {'type': 'regex', 'pattern': 'com.apple.smbd'}},
+                                '123\t0\tcom.apple.other'))
+        self.assertTrue(matches({'type': 'all', 'matchers': [{'type': 'regex', 'pattern': 'a'},
+                                                             {'type': 'regex', 'pattern': 'b'}]}, 'ab'))
+        self.assertFalse(matches({'type': 'any', 'matchers': [{'type': 'exact', 'value': 'x'},
+                                                              {'type': 'exact', 'value': 'y'}]}, 'z'))
+
+    def test_invalid_specs(self):
+        invalid_specs = ['regex', {'type': 'unknown'}, {'type': 'regex'}, {'type': 'regex', 'pattern': '('},
+                         {'type': 'int', 'operator': '=~', 'value': 1}, {'type': 'int', 'operator': '==', 'value': '1'},
+                         {'type': 'in', 'values': []}, {'type': 'json_path', 'path': 'policies', 'matcher': {}},
+                         {'type': 'any', 'matchers': []}]
+        for spec in invalid_specs:
+            with self.subTest(spec=spec), self.assertRaises((TypeError, ValueError)):
+                compile_matcher(spec)
+
+    def test_matchers_compare_by_spec_and_pickle(self):
+        spec = {'type': 'not', 'matcher': {'type': 'regex', 'pattern': 'smbd'}}
+        matcher = compile_matcher(spec)
+        self.assertEqual(compile_matcher(dict(reversed(list(spec.items())))), matcher)
+        self.assertEqual(matcher, pickle.loads(pickle.dumps(matcher)))
+
+
+class TestMatcherEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_commands(self, commands) -> str:
+        path = os.path.join(self.temp_dir.name, 'audit_commands.json')
+        with open(path, 'w') as commands_file:
+            json.dump({'MacOS Ventura': commands}, commands_file)
+        return path
+
+    def test_matchers_are_compiled_on_load(self):
+        path = self.write_commands([{'recommend_id': '1.1', 'level': 'Level 1', 'title': 'Title', 'command': 'echo 1',
+                                     'expected_output': '1', 'matcher': {'type': 'in', 'values': ['1']}},
+                                    {'recommend_id': '1.2', 'level': 'Level 1', 'title': 'Title', 'command': 'echo 1',
+                                     'expected_output': '1'}])
+        commands = CISAuditLoadCommands(commands_path=path, commands_loader=JSONConfigLoader())
+        os_commands = commands.get_os_specific_commands('MacOS Ventura')
+        self.assertEqual(compile_matcher({'type': 'in', 'values': ['1']}), os_commands[0]['matcher'])
+        self.assertNotIn('matcher', os_commands[1])
+
+    def test_invalid_matcher_fails_load(self):
+        path = self.write_commands([{'recommend_id': '1.1', 'level': 'Level 1', 'title': 'Title', 'command': 'echo 1',
+                                     'expected_output': '1', 'matcher': {'type': 'int', 'operator': '>'}}])
+        with self.assertRaisesRegex(ValueError, "recommend id '1.1'"):
+            CISAuditLoadCommands(commands_path=path, commands_loader=JSONConfigLoader())
+
+    def test_runner_uses_matcher(self):
+        recommendation = create_recommendation('1.1')
+        recommendation.audit_cmd = AuditCmd(recommend_id='1.1', level='Level 1', title='Title', command='echo 20',
+                                            expected_output='at least 15',
+                                            matcher=compile_matcher({'type': 'int', 'operator': '>=', 'value': 15}))
+        self.assertTrue(CISAuditRunner().run_command(recommendation.audit_cmd))
+        evaluated = CISOfflineEvaluator([recommendation]).evaluate_host({'1.1': create_command_output(stdout='9')})
+        self.assertFalse(evaluated[0].compliant)
+
+    def test_failed_command_is_reported_before_matching(self):
+        matcher = compile_matcher({'type': 'not', 'matcher': {'type': 'regex', 'pattern': 'smbd'}})
+        command_output = create_command_output(stderr='permission denied', return_code=1)
+        self.assertEqual('permission denied', CISAuditRunner.evaluate_command_output('0', command_output, matcher))
+
+    def test_failed_or_empty_output_is_not_compliant(self):
+        matcher = compile_matcher({'type': 'not', 'matcher': {'type': 'regex', 'pattern': 'smbd'}})
+        for command_output in (create_command_output(), create_command_output(stdout='\n \n'),
+                               create_command_output(stdout='123\t0\tcom.apple.other', return_code=1)):
+            with self.subTest(command_output=command_output):
+                self.assertIs(False, CISAuditRunner.evaluate_command_output(None, command_output, matcher))
+        self.assertIs(True, CISAuditRunner.evaluate_command_output(
+            None, create_command_output(stdout='123\t0\tcom.apple.other'), matcher))
+
+    def test_expected_output_is_optional_with_matcher(self):
+        path = self.write_commands([{'recommend_id': '1.1', 'level': 'Level 1', 'title': 'Title', 'command': 'echo 1',
+                                     'matcher': {'type': 'in', 'values': ['1']}}])
+        commands = CISAuditLoadCommands(commands_path=path, commands_loader=JSONConfigLoader())
+        audit_cmd = commands.get_os_audit_commands('MacOS Ventura')['1.1']
+        self.assertIsNone(audit_cmd.expected_output)
+        self.assertTrue(CISAuditRunner().run_command(audit_cmd))
+        for command in ({'recommend_id': '1.1', 'level': 'Level 1', 'title': 'Title', 'command': 'echo 1'},
+                        {'recommend_id': '1.1', 'level': 'Level 1', 'title': 'Title', 'command': 'echo 1',
+                         'expected_output': '', 'matcher': {'type': 'in', 'values': ['1']}}):
+            with self.subTest(command=command), self.assertRaisesRegex(ValueError, 'expected_output'):
+                CISAuditLoadCommands(commands_path=self.write_commands([command]), commands_loader=JSONConfigLoader())
+
+    def test_launchctl_patterns_match_literal_dots(self):
+        commands = CISAuditLoadCommands(commands_path='config/audit_commands.json', commands_loader=JSONConfigLoader())
+        audit_commands = commands.get_os_audit_commands('MacOS Ventura')
+        for recommend_id, label in (('2.3.3.1', 'com.apple.ODSAgent'), ('2.3.3.2', 'com.apple.screensharing'),
+                                    ('2.3.3.3', 'com.apple.smbd'), ('4.2', 'org.apache.httpd')):
+            with self.subTest(recommend_id=recommend_id):
+                audit_cmd = audit_commands[recommend_id]
+                self.assertIsNone(audit_cmd.expected_output)
+                self.assertFalse(audit_cmd.matcher.matches([f'123\t0\t{label}']))
+                self.assertTrue(audit_cmd.matcher.matches([f'123\t0\t{label.replace(".", "x")}']))
+
+
+if __name__ == '__main__':
+    run_tests(TestMatchers)
+    run_tests(TestMatcherEvaluation)
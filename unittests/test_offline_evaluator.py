@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import tarfile
+import tempfile
+import unittest
+from cis_offline_evaluator import CISOfflineEvaluator
+from collection_management.readers import (JSONLinesCollectedOutputReader, TarCollectedOutputReader,
+                                           parse_command_outputs)
+from command_management.command_executors import create_command_output
+from data_models.data_models import HostOutputs
+from result_management.columnar_store import ResultStatus
+from unittests.test_cis_audit_manager import create_recommendation
+from unittests.test_columnar_store import create_mapped_recommendation
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestCollectedOutputReaders(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name: str, content: str) -> str:
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w') as collected_file:
+            collected_file.write(content)
+        return path
+
+    def test_jsonl_records_are_grouped_by_host(self):
+        records = [{'host': 'host-a', 'recommend_id': '1.1', 'stdout': 'ok\n'},
+                   {'host': 'host-b', 'recommend_id': '1.1', 'stdout': 'no'},
+                   {'host': 'host-a', 'recommend_id': '1.2', 'stderr': 'denied', 'return_code': 1}]
+        path = self.write_file('collected.jsonl', '\n'.join(json.dumps(record) for record in records) + '\n\n')
+        hosts_outputs = list(JSONLinesCollectedOutputReader(path).read())
+        self.assertEqual(['host-a', 'host-b'], [host_outputs.host for host_outputs in hosts_outputs])
+        self.assertEqual(['1.1', '1.2'], list(hosts_outputs[0].command_outputs))
+        self.assertEqual(create_command_output(stdout='ok\n'), hosts_outputs[0].command_outputs['1.1'])
+        self.assertEqual(1, hosts_outputs[0].command_outputs['1.2'].return_code)
+
+    def test_invalid_jsonl_record(self):
+        path = self.write_file('collected.jsonl', '{"host": "host-a", "recommend_id": "1.1"}\n{"host": "host-a"}\n')
+        with self.assertRaisesRegex(ValueError, 'line 2'):
+            list(JSONLinesCollectedOutputReader(path).read())
+
+    def test_tar_members_are_read_per_host(self):
+        path = os.path.join(self.temp_dir.name, 'collected.tar.gz')
+        with tarfile.open(path, 'w:gz') as archive:
+            for name, outputs in (('hosts/host-a.json', {'1.1': 'ok'}), ('hosts/host-b.json', {'1.1': {'stdout': 'no'}}),
+                                  ('hosts/README', 'ignored')):
+                data = json.dumps(outputs).encode('UTF-8')
+                member = tarfile.TarInfo(name)
+                member.size = len(data)
+                archive.addfile(member, io.BytesIO(data))
+        hosts_outputs = list(TarCollectedOutputReader(path).read())
+        self.assertEqual([HostOutputs('host-a', {'1.1': create_command_output(stdout='ok')}),
+                          HostOutputs('host-b', {'1.1': create_command_output(stdout='no')})], hosts_outputs)
+
+    def test_invalid_outputs(self):
+        with self.assertRaises(ValueError):
+            parse_command_outputs(['ok'])
+        with self.assertRaises(ValueError):
+            parse_command_outputs({'1.1': 1})
+        with self.assertRaises(ValueError):
+            parse_command_outputs({'1.1': {'return_code': 'failed'}})
+
+
+class TestCISOfflineEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.recommendations = [create_mapped_recommendation('1.1', 'Protect'),
+                                create_mapped_recommendation('1.2', 'Protect'),
+                                create_mapped_recommendation('1.3', 'Detect'),
+                                create_recommendation('1.4')]
+        self.evaluator = CISOfflineEvaluator(self.recommendations)
+        self.command_outputs = {'1.1': create_command_output(stdout='ok'),
+                                '1.2': create_command_output(stdout='no'),
+                                '1.3': create_command_output(stderr='denied', return_code=1),
+                                '9.9': create_command_output(stdout='ok')}
+
+    def test_recommendations_without_audit_command_are_skipped(self):
+        self.assertEqual(['1.1', '1.2', '1.3'],
+                         [recommendation.recommend_id for recommendation in self.evaluator.recommendations])
+
+    def test_evaluate_host(self):
+        evaluated_recommendations = self.evaluator.evaluate_host(self.command_outputs)
+        self.assertEqual([True, False, 'denied'],
+                         [recommendation.compliant for recommendation in evaluated_recommendations])
+        self.assertIsNone(self.recommendations[0].compliant)
+
+    def test_evaluate_into_store(self):
+        hosts_outputs = [HostOutputs(f'host-{index}', self.command_outputs) for index in range(40)]
+        hosts_outputs.append(HostOutputs('host-partial', {'1.1': create_command_output(stdout='ok')}))
+        result_store = self.evaluator.evaluate_into_store(hosts_outputs)
+        self.assertEqual(41, result_store.host_count)
+        self.assertEqual([ResultStatus.COMPLIANT, ResultStatus.NON_COMPLIANT, ResultStatus.ERROR],
+                         list(result_store.get_host_statuses('host-39')))
+        self.assertEqual(ResultStatus.NOT_AUDITED, result_store.get_status('host-partial', self.recommendations[2]))
+        self.assertEqual({'Protect': (41, 81), 'Detect': (0, 40)}, result_store.get_group_counts('domain'))
+
+    def test_evaluate_into_existing_store(self):
+        result_store = CISOfflineEvaluator(self.recommendations[::-1]).create_result_store()
+        self.evaluator.evaluate_into_store([HostOutputs('host-a', self.command_outputs)], result_store)
+        self.assertEqual(ResultStatus.COMPLIANT, result_store.get_status('host-a', self.recommendations[0]))
+        self.assertEqual(ResultStatus.ERROR, result_store.get_status('host-a', self.recommendations[2]))
+
+    def test_unmatched_recommend_ids(self):
+        self.assertEqual(['9.9'], self.evaluator.get_unmatched_recommend_ids(self.command_outputs))
+
+
+if __name__ == '__main__':
+    run_tests(TestCollectedOutputReaders)
+    run_tests(TestCISOfflineEvaluator)
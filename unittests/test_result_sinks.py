@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from cis_audit_manager import CISAuditRunner
+from result_management.sinks import JSONLinesResultSink
+from unittests.test_cis_audit_manager import create_recommendation
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestJSONLinesResultSink(unittest.TestCase):
+    def setUp(self):
+        self.recommendations = [create_recommendation('1.1', 'echo ok'),
+                                create_recommendation('1.2', 'echo error >&2; exit 2')]
+
+    def test_records_are_written_while_auditing(self):
+        stream = io.StringIO()
+        sink = JSONLinesResultSink(stream, host='host.local')
+        audited = CISAuditRunner(result_sink=sink).evaluate_recommendations_compliance(self.recommendations)
+        next(audited)
+        self.assertEqual(1, len(stream.getvalue().splitlines()))
+        list(audited)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(['1.1', '1.2'], [record['recommend_id'] for record in records])
+        self.assertEqual([True, 'error'], [record['compliant'] for record in records])
+        self.assertEqual([0, 2], [record['return_code'] for record in records])
+        self.assertTrue(all(record['duration'] >= 0 and record['host'] == 'host.local' for record in records))
+        self.assertEqual(2, sink.written_records)
+
+    def test_open_appends_to_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'results.jsonl')
+            for _ in range(2):
+                sink = JSONLinesResultSink.open(path)
+                list(CISAuditRunner(result_sink=sink).evaluate_recommendations_compliance(self.recommendations))
+                sink.close()
+            with open(path) as results_file:
+                self.assertEqual(4, len(results_file.readlines()))
+
+
+if __name__ == '__main__':
+    run_tests(TestJSONLinesResultSink)
@@ -0,0 +1,123 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from cache_management.result_store import JSONAuditResultStore
+from cis_audit_manager import CISAuditRunner
+from command_management.command_executors import SubprocessCommandExecutor
+from data_models.data_models import AuditResult
+from unittests.test_cis_audit_manager import create_recommendation
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class CountingCommandExecutor(SubprocessCommandExecutor):
+    def __init__(self):
+        self.executed_commands = []
+
+    def execute(self, command, timeout=None):
+        self.executed_commands.append(command)
+        return super().execute(command, timeout)
+
+
+class TestJSONAuditResultStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_store(self, host='host.local', os_version='MacOS Sonoma'):
+        return JSONAuditResultStore(store_dir=self.temp_dir.name, host=host, os_version=os_version)
+
+    def test_results_persist_across_stores(self):
+        store = self.create_store()
+        store.store('1.1', 'echo ok', AuditResult(compliant=True, audited_at=100.0))
+        store.flush()
+        self.assertEqual(AuditResult(compliant=True, audited_at=100.0), self.create_store().load('1.1', ' echo ok'))
+
+    def test_results_are_keyed_by_command_os_version_and_host(self):
+        store = self.create_store()
+        store.store('1.1', 'echo ok', AuditResult(compliant=True, audited_at=100.0))
+        store.flush()
+        self.assertIsNone(self.create_store().load('1.1', 'echo changed'))
+        self.assertIsNone(self.create_store(os_version='MacOS Ventura').load('1.1', 'echo ok'))
+        self.assertIsNone(self.create_store(host='other.local').load('1.1', 'echo ok'))
+
+    def test_corrupt_store_is_empty(self):
+        store = self.create_store()
+        with open(store.store_path, 'w') as store_file:
+            store_file.write('{corrupt')
+        self.assertIsNone(self.create_store().load('1.1', 'echo ok'))
+
+    def test_flush_errors_are_written_to_stderr(self):
+        store_dir = os.path.join(self.temp_dir.name, 'store')
+        with open(store_dir, 'w'):
+            pass
+        store = JSONAuditResultStore(store_dir=store_dir, host='host.local', os_version='MacOS Sonoma')
+        store.store('1.1', 'echo ok', AuditResult(compliant=True, audited_at=100.0))
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            store.flush()
+        self.assertEqual('', stdout.getvalue())
+        self.assertIn('Error occurred while writing the audit result store', stderr.getvalue())
+
+
+class TestIncrementalAudit(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def audit(self, recommendations, max_workers=1):
+        command_executor = CountingCommandExecutor()
+        result_store = JSONAuditResultStore(store_dir=self.temp_dir.name, host='host.local', os_version='MacOS Sonoma')
+        runner = CISAuditRunner(max_workers=max_workers, command_executor=command_executor, result_store=result_store)
+        return list(runner.evaluate_recommendations_compliance(recommendations)), command_executor.executed_commands
+
+    def test_only_checks_without_valid_results_rerun(self):
+        for max_workers in (1, 2):
+            self.audit([create_recommendation('1.1', 'echo ok', ttl=3600), create_recommendation('1.2', 'echo nok')])
+            audited, executed_commands = self.audit([create_recommendation('1.1', 'echo ok', ttl=3600),
+                                                     create_recommendation('1.2', 'echo nok')], max_workers)
+            self.assertEqual(['echo nok'], executed_commands)
+            self.assertEqual([True, False], [recommendation.result_reused for recommendation in audited])
+            self.assertEqual([True, False], [recommendation.compliant for recommendation in audited])
+
+    def test_changed_command_reruns(self):
+        self.audit([create_recommendation('1.1', 'echo ok', ttl=3600)])
+        audited, executed_commands = self.audit([create_recommendation('1.1', 'echo  ok', ttl=3600)])
+        self.assertEqual(['echo  ok'], executed_commands)
+        self.assertFalse(audited[0].result_reused)
+
+    def test_changed_expected_output_reruns(self):
+        self.audit([create_recommendation('1.1', 'echo ok', ttl=3600)])
+        audited, executed_commands = self.audit([create_recommendation('1.1', 'echo ok', expected_output='nok',
+                                                                       ttl=3600)])
+        self.assertEqual(['echo ok'], executed_commands)
+        self.assertFalse(audited[0].compliant)
+
+    def test_failed_command_is_not_stored(self):
+        command = 'echo denied >&2; exit 1'
+        self.audit([create_recommendation('1.1', command, ttl=3600)])
+        audited, executed_commands = self.audit([create_recommendation('1.1', command, ttl=3600)])
+        self.assertEqual([command], executed_commands)
+        self.assertEqual('denied', audited[0].compliant)
+        self.assertFalse(audited[0].result_reused)
+
+    def test_expired_result_reruns(self):
+        self.audit([create_recommendation('1.1', 'echo ok', ttl=3600)])
+        audited, executed_commands = self.audit([create_recommendation('1.1', 'echo ok', ttl=0.000001)])
+        self.assertEqual(['echo ok'], executed_commands)
+        self.assertFalse(audited[0].result_reused)
+
+
+if __name__ == '__main__':
+    run_tests(TestJSONAuditResultStore)
+    run_tests(TestIncrementalAudit)
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from cis_audit_manager import CISAuditLoadCommands
+from cis_benchmarks_manager import CISBenchmarksLoadConfig, CISBenchmarksProcessWorkbook
+from config_management.loaders import JSONConfigLoader
+from exceptions.custom_exceptions import WorkbookLoadingError
+from workbook_management.interfaces import IWorkbookLoader
+from workbook_management.loaders import OpenPyXLReadOnlyWorkbookLoader
+from workbook_management.workbook_manager import ExcelOpenWorkbook, WorksheetRowExtractor
+
+CONFIG_PATH = 'config/cis_workbooks_config.json'
+COMMANDS_PATH = 'config/audit_commands.json'
+WORKBOOK_PATH = 'cis_benchmarks/CIS_Apple_macOS_13.0_Ventura_Benchmark_v2.0.0.1.xlsx'
+COLUMN_INDICES = {'Section #': 0, 'Recommendation #': 1, 'Title': 2, 'Profile': 3}
+ROW = ('1', '1.1', 'Ensure All Apple-provided Software Is Current', 'Level 1')
+
+
+def run_tests(test_class):
+    test_suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    test_runner = unittest.TextTestRunner(verbosity=2)
+    test_runner.run(test_suite)
+
+
+class TestWorksheetRowExtractor(unittest.TestCase):
+    def test_extracts_columns_in_field_order(self):
+        row_extractor = WorksheetRowExtractor(COLUMN_INDICES, {'title': 'Title', 'recommend_id': 'Recommendation #',
+                                                               'level': 'Profile'})
+        self.assertEqual(('title', 'recommend_id', 'level'), row_extractor.fields)
+        self.assertEqual(('Ensure All Apple-provided Software Is Current', '1.1', 'Level 1'),
+                         row_extractor.extract(ROW))
+
+    def test_single_column_is_extracted_as_tuple(self):
+        row_extractor = WorksheetRowExtractor(COLUMN_INDICES, {'recommend_id': 'Recommendation #'})
+        self.assertEqual(('recommend_id',), row_extractor.fields)
+        self.assertEqual(('1.1',), row_extractor.extract(ROW))
+        recommend_id, = row_extractor.extract(ROW)
+        self.assertEqual('1.1', recommend_id)
+
+    def test_missing_columns(self):
+        with self.assertRaisesRegex(AttributeError, 'Impact'):
+            WorksheetRowExtractor(COLUMN_INDICES, {'recommend_id': 'Recommendation #', 'impact': 'Impact'})
+
+    def test_no_columns(self):
+        with self.assertRaises(ValueError):
+            WorksheetRowExtractor(COLUMN_INDICES, {})
+
+
+class ClosableWorkbook:
+    def __init__(self):
+        self.close_count = 0
+
+    def close(self):
+        self.close_count += 1
+
+
+class RecordingWorkbookLoader(IWorkbookLoader):
+    def __init__(self, workbook_loader: IWorkbookLoader = None):
+        self.workbook_loader = workbook_loader
+        self.workbooks = []
+
+    def load(self, path: str):
+        workbook = ClosableWorkbook() if self.workbook_loader is None else self.workbook_loader.load(path)
+        self.workbooks.append(workbook)
+        return workbook
+
+
+class LazyWorkbook(ExcelOpenWorkbook):
+    def _load_workbook(self):
+        return self._workbook_loader.load('workbook.xlsx')
+
+
+class TestOpenPyXLReadOnlyWorkbookLoader(unittest.TestCase):
+    def test_loads_read_only_workbook(self):
+        workbook = OpenPyXLReadOnlyWorkbookLoader().load(WORKBOOK_PATH)
+        try:
+            self.assertTrue(workbook.read_only)
+            self.assertIn('Level 1', workbook.sheetnames)
+            header_row = next(workbook['Level 1'].iter_rows(values_only=True))
+            self.assertIn('Recommendation #', header_row)
+        finally:
+            workbook.close()
+        self.assertIsNone(workbook._archive.fp)
+
+    def test_loading_errors(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            invalid_path = os.path.join(temp_dir, 'workbook.txt')
+            with open(invalid_path, 'w') as invalid_file:
+                invalid_file.write('not a workbook')
+            for path in (os.path.join(temp_dir, 'missing.xlsx'), invalid_path):
+                with self.subTest(path=path), self.assertRaises(WorkbookLoadingError):
+                    OpenPyXLReadOnlyWorkbookLoader().load(path)
+
+
+class TestReleaseWorkbook(unittest.TestCase):
+    def test_workbook_is_loaded_lazily_and_released(self):
+        workbook_loader = RecordingWorkbookLoader()
+        lazy_workbook = LazyWorkbook(workbook_loader)
+        self.assertEqual([], workbook_loader.workbooks)
+        self.assertIs(lazy_workbook._workbook, lazy_workbook._workbook)
+        self.assertEqual(1, len(workbook_loader.workbooks))
+        lazy_workbook._release_workbook()
+        lazy_workbook._release_workbook()
+        self.assertEqual(1, workbook_loader.workbooks[0].close_count)
+        self.assertIsNot(workbook_loader.workbooks[0], lazy_workbook._workbook)
+        self.assertEqual(2, len(workbook_loader.workbooks))
+
+    def test_workbook_without_close_is_released(self):
+        lazy_workbook = LazyWorkbook(RecordingWorkbookLoader())
+        lazy_workbook._loaded_workbook = object()
+        lazy_workbook._release_workbook()
+        self.assertIsNone(lazy_workbook._loaded_workbook)
+
+    def test_benchmark_workbook_is_closed_after_parsing(self):
+        config_loader = JSONConfigLoader()
+        workbook_loader = RecordingWorkbookLoader(OpenPyXLReadOnlyWorkbookLoader())
+        benchmark = CISBenchmarksProcessWorkbook(
+            workbook_loader=workbook_loader, workbook_path=WORKBOOK_PATH,
+            benchmarks_config=CISBenchmarksLoadConfig(config_path=CONFIG_PATH, config_loader=config_loader),
+            cis_controls=[], commands_loader=CISAuditLoadCommands(commands_path=COMMANDS_PATH,
+                                                                  commands_loader=config_loader))
+        self.assertTrue(benchmark.get_recommendations_by_level(scope_level=1))
+        self.assertEqual(1, len(workbook_loader.workbooks))
+        self.assertIsNone(workbook_loader.workbooks[0]._archive.fp)
+        self.assertIsNone(benchmark._loaded_workbook)
+
+
+if __name__ == '__main__':
+    run_tests(TestWorksheetRowExtractor)
+    run_tests(TestOpenPyXLReadOnlyWorkbookLoader)
+    run_tests(TestReleaseWorkbook)
@@ -15,4 +15,11 @@ class OpenPyXLWorkbookLoader(IWorkbookLoader):
             raise WorkbookLoadingError(f'Invalid workbook format: {e}')
 
 
-
+class OpenPyXLReadOnlyWorkbookLoader(IWorkbookLoader):
+    def load(self, path: str) -> Workbook:
+        try:
+            return openpyxl.load_workbook(path, read_only=True, data_only=True)
+        except FileNotFoundError as e:
+            raise WorkbookLoadingError(f'Workbook not found {e}')
+        except InvalidFileException as e:
+            raise WorkbookLoadingError(f'Invalid workbook format: {e}')
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Set, Tuple
+from operator import itemgetter
+from typing import Dict, Set, Tuple
 from workbook_management.interfaces import IWorkbookLoader
 
 
@@ -8,13 +9,49 @@ class ExcelOpenWorkbook(ABC):
         if not isinstance(workbook_loader, IWorkbookLoader):
             raise TypeError(f'Expected object of type {IWorkbookLoader.__name__}, got {type(workbook_loader).__name__}.')
         self._workbook_loader = workbook_loader
-        self._workbook = self._load_workbook()
+        self._loaded_workbook = None
+
+    @property
+    def _workbook(self):
+        if self._loaded_workbook is None:
+            self._loaded_workbook = self._load_workbook()
+        return self._loaded_workbook
+
+    def _release_workbook(self):
+        if self._loaded_workbook is not None and hasattr(self._loaded_workbook, 'close'):
+            self._loaded_workbook.close()
+        self._loaded_workbook = None
 
     @abstractmethod
     def _load_workbook(self):
         pass
 
 
+class WorksheetRowExtractor:
+    def __init__(self, column_indices: Dict[str, int], columns: Dict[str, str]):
+        missing_columns = [title for title in columns.values() if title not in column_indices]
+        if missing_columns:
+            raise AttributeError(
+                f"The following columns do not exist in the worksheet: '{', '.join(missing_columns)}'.")
+        if not columns:
+            raise ValueError('At least one column is required to build a row extractor.')
+        self._fields = tuple(columns)
+        indices = [column_indices[title] for title in columns.values()]
+        if len(indices) == 1:
+            # itemgetter returns a bare value for a single index, so that value is wrapped to keep rows as tuples.
+            get_value = itemgetter(indices[0])
+            self._get_row_values = lambda row: (get_value(row),)
+        else:
+            self._get_row_values = itemgetter(*indices)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def extract(self, row: Tuple) -> Tuple:
+        return self._get_row_values(row)
+
+
 class ExcelValidator(ABC):
     def __init__(self, workbook):
         self._workbook = workbook